@@ -18,18 +18,24 @@ Date: 2025-10-31
 
 import sys
 import json
+import os
 import pickle
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import networkx as nx
-from tqdm import tqdm
 import logging
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from GraphRicciCurvature.OllivierRicci import OllivierRicci
+
+sys.path.insert(0, str(Path(__file__).parent))
+from curvature_cache import CurvatureCache, default_cache, graphricci_edge_kappa, graphricci_version
+from graph_loader import LOADER_VERSION, load_edge_table
+from null_ensemble import run_ensemble
+from null_models import NULL_MODEL_VERSION, configuration_edges, triangle_preserving_swap
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -42,155 +48,98 @@ def load_real_network(lang: str, data_dir: Path) -> nx.DiGraph:
     if not edge_file.exists():
         raise FileNotFoundError(f"Edge file not found: {edge_file}")
     
-    G = nx.DiGraph()
-    
-    # Read edges (assuming CSV format: source,target,weight)
-    import pandas as pd
-    df = pd.read_csv(edge_file)
-    
-    for _, row in df.iterrows():
-        G.add_edge(row['source'], row['target'], weight=row.get('weight', 1.0))
+    # Read edges (assuming CSV format: source,target[,weight]); repeated arcs keep the last weight
+    G = load_edge_table(edge_file, directed=True, combine="last", self_loops=True).to_networkx()
     
     logger.info(f"{lang}: Loaded {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
     return G
 
 
-def generate_configuration_null(G: nx.DiGraph, preserve_weights: bool = True) -> nx.DiGraph:
+def _edge_arrays(G: nx.DiGraph) -> Tuple[list, np.ndarray, np.ndarray]:
+    """(nodes, int32 arc array over node positions, float64 weights)."""
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    arcs = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int32).reshape(-1, 2)
+    weights = np.array([d.get('weight', 1.0) for _, _, d in G.edges(data=True)], dtype=np.float64)
+    return nodes, arcs, weights
+
+
+def _from_edge_arrays(nodes: list, arcs: np.ndarray, weights: np.ndarray) -> nx.DiGraph:
+    G_null = nx.DiGraph()
+    G_null.add_nodes_from(nodes)
+    G_null.add_weighted_edges_from(
+        (nodes[u], nodes[v], w) for (u, v), w in zip(arcs.tolist(), weights.tolist())
+    )
+    return G_null
+
+
+def generate_configuration_null(G: nx.DiGraph, preserve_weights: bool = True,
+                                rng: Optional[np.random.Generator] = None) -> nx.DiGraph:
     """
     Generate one configuration model null.
     
     Preserves:
-    - In-degree and out-degree sequences
-    - Weight marginals (if preserve_weights=True)
+    - In-degree and out-degree sequences (up to dropped self-loops/multi-arcs)
+    - Weight marginals (if preserve_weights=True; otherwise weight 1.0)
+    
+    Stub matching runs on int32 arrays (null_models.configuration_edges).
     """
+    rng = np.random.default_rng(rng)
+    nodes, arcs, weights = _edge_arrays(G)
+    n = len(nodes)
+    out_deg = np.bincount(arcs[:, 0], minlength=n)
+    in_deg = np.bincount(arcs[:, 1], minlength=n)
+    null_arcs, pair = configuration_edges(out_deg, in_deg, rng, directed=True)
     if preserve_weights:
-        # Weighted configuration model
-        # 1. Get degree sequences
-        in_deg = dict(G.in_degree())
-        out_deg = dict(G.out_degree())
-        
-        # 2. Get weight distribution
-        weights = [d['weight'] for u, v, d in G.edges(data=True)]
-        
-        # 3. Generate random directed graph with same degree sequence
-        # Using stub-matching (Chung-Lu for directed graphs)
-        nodes = list(G.nodes())
-        G_null = nx.DiGraph()
-        G_null.add_nodes_from(nodes)
-        
-        # Create stubs
-        out_stubs = []
-        for node in nodes:
-            out_stubs.extend([node] * out_deg[node])
-        
-        in_stubs = []
-        for node in nodes:
-            in_stubs.extend([node] * in_deg[node])
-        
-        # Shuffle and match
-        np.random.shuffle(out_stubs)
-        np.random.shuffle(in_stubs)
-        
-        # Sample weights from original distribution
-        sampled_weights = np.random.choice(weights, size=len(out_stubs), replace=True)
-        
-        # Create edges
-        for i, (u, v, w) in enumerate(zip(out_stubs, in_stubs, sampled_weights)):
-            if u != v:  # No self-loops
-                G_null.add_edge(u, v, weight=w)
-        
-        return G_null
+        # Sample weights from original distribution, one per stub pair
+        sampled_weights = rng.choice(weights, size=len(arcs), replace=True)[pair]
     else:
-        # Binary configuration model (simpler)
-        return nx.directed_configuration_model(
-            [G.in_degree(n) for n in G.nodes()],
-            [G.out_degree(n) for n in G.nodes()],
-            create_using=nx.DiGraph()
-        )
+        sampled_weights = np.ones(len(null_arcs))
+    return _from_edge_arrays(nodes, null_arcs, sampled_weights)
 
 
-def generate_triadic_rewire_null(G: nx.DiGraph, n_swaps: int = None) -> nx.DiGraph:
+def generate_triadic_rewire_null(G: nx.DiGraph, n_swaps: int = None,
+                                 rng: Optional[np.random.Generator] = None) -> nx.DiGraph:
     """
     Generate triadic-rewire null.
     
     Preserves:
-    - Triangle count (approximately)
-    - Clustering coefficient
+    - In-degree and out-degree sequences
+    - Triangle count of the undirected projection (exactly)
+    - Weights (each weight travels with its arc)
     
-    Method: Edge-rewiring with triangle preservation constraint.
+    Method: directed double-edge swaps (u1->v1, u2->v2) -> (u1->v2, u2->v1)
+    accepted only if they leave the triangle count unchanged
+    (null_models.triangle_preserving_swap); at most 100 x n_swaps attempts.
     """
+    rng = np.random.default_rng(rng)
     if n_swaps is None:
         n_swaps = G.number_of_edges() * 10  # Default: 10x edges
     
-    G_null = G.copy()
-    
-    # Get all triangles
-    triangles = set()
-    for node in G.nodes():
-        neighbors = set(G.successors(node))
-        for n1 in neighbors:
-            for n2 in neighbors:
-                if n2 != n1 and G.has_edge(n1, n2):
-                    triangle = tuple(sorted([node, n1, n2]))
-                    triangles.add(triangle)
-    
-    edges = list(G_null.edges())
-    successful_swaps = 0
-    attempts = 0
-    max_attempts = n_swaps * 100
-    
-    while successful_swaps < n_swaps and attempts < max_attempts:
-        attempts += 1
-        
-        # Select two random edges
-        if len(edges) < 2:
-            break
-            
-        e1, e2 = np.random.choice(len(edges), size=2, replace=False)
-        u1, v1 = edges[e1]
-        u2, v2 = edges[e2]
-        
-        # Propose swap: (u1→v1, u2→v2) → (u1→v2, u2→v1)
-        if u1 != u2 and v1 != v2 and u1 != v2 and u2 != v1:
-            # Check if new edges don't exist
-            if not G_null.has_edge(u1, v2) and not G_null.has_edge(u2, v1):
-                # Check if swap preserves triangles (approximately)
-                # This is a simplified check; full preservation is NP-hard
-                
-                # Get weights
-                w1 = G_null[u1][v1].get('weight', 1.0)
-                w2 = G_null[u2][v2].get('weight', 1.0)
-                
-                # Do swap
-                G_null.remove_edge(u1, v1)
-                G_null.remove_edge(u2, v2)
-                G_null.add_edge(u1, v2, weight=w1)
-                G_null.add_edge(u2, v1, weight=w2)
-                
-                # Update edges list
-                edges[e1] = (u1, v2)
-                edges[e2] = (u2, v1)
-                
-                successful_swaps += 1
+    nodes, arcs, weights = _edge_arrays(G)
+    null_arcs, successful_swaps = triangle_preserving_swap(
+        arcs, len(nodes), n_swaps, rng, directed=True
+    )
     
     logger.debug(f"Triadic-rewire: {successful_swaps}/{n_swaps} successful swaps")
-    return G_null
+    return _from_edge_arrays(nodes, null_arcs, weights)
 
 
-def compute_or_curvature_mean(G: nx.DiGraph, alpha: float = 0.5) -> float:
-    """Compute mean Ollivier-Ricci curvature."""
+def compute_or_curvature_mean(G: nx.DiGraph, alpha: float = 0.5,
+                              proc: Optional[int] = None,
+                              cache: Optional[CurvatureCache] = None) -> float:
+    """Compute mean Ollivier-Ricci curvature (`proc` GraphRicciCurvature workers),
+    looking the per-edge values up in `cache` first."""
     try:
         # Largest weakly connected component
         if not nx.is_weakly_connected(G):
             G = G.subgraph(max(nx.weakly_connected_components(G), key=len)).copy()
         
         # Compute OR curvature
-        orc = OllivierRicci(G, alpha=alpha, verbose="ERROR")
-        orc.compute_ricci_curvature()
+        kwargs = {} if proc is None else {"proc": proc}
+        curvatures = graphricci_edge_kappa(G, alpha=alpha, cache=cache, **kwargs)
         
         # Get mean curvature
-        curvatures = [d['ricciCurvature'] for u, v, d in orc.G.edges(data=True)]
-        
         if len(curvatures) == 0:
             return np.nan
         
@@ -235,12 +184,27 @@ def monte_carlo_test(kappa_real: float, kappa_nulls: List[float]) -> float:
     return (1 + n_extreme) / (M + 1)
 
 
+def null_replicate(G_real: nx.DiGraph, null_type: str, alpha: float,
+                   proc: Optional[int], rng: np.random.Generator) -> float:
+    """Mean curvature of one null replicate drawn from `rng`."""
+    if null_type == 'configuration':
+        G_null = generate_configuration_null(G_real, preserve_weights=True, rng=rng)
+    elif null_type == 'triadic':
+        G_null = generate_triadic_rewire_null(G_real, rng=rng)
+    else:
+        raise ValueError(f"Unknown null_type: {null_type}")
+    return compute_or_curvature_mean(G_null, alpha=alpha, proc=proc)
+
+
 def run_null_analysis(
     lang: str,
     G_real: nx.DiGraph,
     null_type: str,
     M: int = 1000,
-    alpha: float = 0.5
+    alpha: float = 0.5,
+    seed: int = 123,
+    workers: int = 1,
+    log_dir: Optional[Path] = None
 ) -> Dict:
     """
     Run complete null model analysis for one language.
@@ -251,6 +215,10 @@ def run_null_analysis(
         null_type: 'configuration' or 'triadic'
         M: Number of null replicates
         alpha: Idleness parameter for OR curvature
+        seed: Root seed; replicate i uses SeedSequence(seed, spawn_key=(i,))
+        workers: Replicate-level processes (curvature runs single-process
+            inside each replicate when workers > 1)
+        log_dir: Append-only replicate log; an interrupted run resumes from it
     
     Returns:
         Dict with results
@@ -258,28 +226,20 @@ def run_null_analysis(
     logger.info(f"{lang} - {null_type}: Starting null generation (M={M})...")
     
     # Compute real curvature
-    kappa_real = compute_or_curvature_mean(G_real, alpha=alpha)
+    # Same real network for every null type: cached after the first one
+    kappa_real = compute_or_curvature_mean(G_real, alpha=alpha, cache=default_cache())
     logger.info(f"{lang} - Real κ = {kappa_real:.4f}")
     
-    # Generate nulls and compute curvatures
-    kappa_nulls = []
-    
-    for i in tqdm(range(M), desc=f"{lang}-{null_type}"):
-        try:
-            if null_type == 'configuration':
-                G_null = generate_configuration_null(G_real, preserve_weights=True)
-            elif null_type == 'triadic':
-                G_null = generate_triadic_rewire_null(G_real)
-            else:
-                raise ValueError(f"Unknown null_type: {null_type}")
-            
-            kappa_null = compute_or_curvature_mean(G_null, alpha=alpha)
-            
-            if not np.isnan(kappa_null):
-                kappa_nulls.append(kappa_null)
-        except Exception as e:
-            logger.warning(f"{lang} - Replicate {i} failed: {e}")
-            continue
+    # Generate nulls and compute curvatures (failed replicates come back NaN)
+    replicate = partial(null_replicate, G_real, null_type, alpha,
+                        1 if workers > 1 else None)
+    kappas = run_ensemble(
+        replicate, M, root_seed=seed, log_dir=log_dir, workers=workers,
+        meta={'language': lang, 'null_type': null_type, 'alpha': alpha,
+              'null_model_version': NULL_MODEL_VERSION, 'loader_version': LOADER_VERSION,
+              'solver_version': graphricci_version()}
+    )
+    kappa_nulls = [float(k) for k in kappas if not np.isnan(k)]
     
     logger.info(f"{lang} - {null_type}: Generated {len(kappa_nulls)}/{M} valid nulls")
     
@@ -297,6 +257,7 @@ def run_null_analysis(
         'M': M,
         'M_valid': len(kappa_nulls),
         'alpha': alpha,
+        'seed': seed,
         'kappa_real': float(kappa_real),
         'kappa_null_mean': float(mu_null),
         'kappa_null_std': float(sigma_null),
@@ -327,9 +288,9 @@ def main():
     NULL_TYPES = ['configuration', 'triadic']
     M = 1000  # Number of replicates
     ALPHA = 0.5  # Idleness parameter
-    SEED = 123  # For reproducibility
-    
-    np.random.seed(SEED)
+    SEED = 123  # Root seed of the first job; job k uses SEED + k
+    WORKERS = os.cpu_count() or 1
+    LOG_DIR = OUTPUT_DIR / "replicate_logs"
     
     logger.info("="*60)
     logger.info("STRUCTURAL NULL MODEL ANALYSIS")
@@ -339,12 +300,13 @@ def main():
     logger.info(f"Replicates: M={M}")
     logger.info(f"Idleness: α={ALPHA}")
     logger.info(f"Seed: {SEED}")
+    logger.info(f"Workers: {WORKERS} (logs: {LOG_DIR})")
     logger.info("="*60)
     
     all_results = {}
     
     # Process each language
-    for lang in LANGUAGES:
+    for i, lang in enumerate(LANGUAGES):
         logger.info(f"\n{'='*60}")
         logger.info(f"Processing {lang.upper()}")
         logger.info(f"{'='*60}")
@@ -359,8 +321,12 @@ def main():
         lang_results = {}
         
         # Run both null types
-        for null_type in NULL_TYPES:
-            results = run_null_analysis(lang, G_real, null_type, M=M, alpha=ALPHA)
+        for j, null_type in enumerate(NULL_TYPES):
+            results = run_null_analysis(
+                lang, G_real, null_type, M=M, alpha=ALPHA,
+                seed=SEED + i * len(NULL_TYPES) + j, workers=WORKERS,
+                log_dir=LOG_DIR / f"{lang}_{null_type}"
+            )
             lang_results[null_type] = results
             
             # Save individual result
@@ -8,12 +8,18 @@ import sys
 import json
 import logging
 import argparse
+from functools import partial
 from pathlib import Path
 import numpy as np
 import networkx as nx
-from tqdm import tqdm
+import pandas as pd
 from scipy.stats import percentileofscore
 
+sys.path.insert(0, str(Path(__file__).parent))
+from curvature_cache import default_cache, graphricci_edge_kappa, graphricci_version
+from null_ensemble import run_ensemble
+from graph_loader import LOADER_VERSION, load_edge_table
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,28 +27,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bump when the NetworkX null generators below draw differently for a given rng
+NULL_MODEL_VERSION = "07_single_lang/1"
+
 
 def load_real_network(edge_file):
     """Load real semantic network from preprocessed edges."""
-    G = nx.DiGraph()
-    
-    with open(edge_file, 'r') as f:
-        next(f)  # Skip header
-        for line in f:
-            source, target, weight = line.strip().split(',')
-            G.add_edge(source, target, weight=float(weight))
+    # Labels stay verbatim strings (no NA parsing), as with the plain split(',') reader
+    df = pd.read_csv(edge_file, dtype={'source': str, 'target': str}, keep_default_na=False)
+    G = load_edge_table(df, directed=True, combine="last", self_loops=True).to_networkx()
     
     logger.info(f"Loaded {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
     return G  # Return DIRECTED for null generation
 
 
-def generate_configuration_null(G, alpha=0.5):
+def generate_configuration_null(G, alpha=0.5, rng=None):
     """
     Generate configuration model null preserving degree sequence.
     CRITICAL FIX: If G is directed, convert to undirected FIRST,
     then generate undirected configuration model.
     This ensures null has same edge density as real network.
     """
+    rng = np.random.default_rng(rng)
     try:
         # Convert to undirected if directed
         if G.is_directed():
@@ -54,7 +60,7 @@ def generate_configuration_null(G, alpha=0.5):
         degrees = [d for n, d in G_work.degree()]
         
         # Create UNDIRECTED configuration model
-        G_null = nx.configuration_model(degrees, create_using=nx.Graph())
+        G_null = nx.configuration_model(degrees, create_using=nx.Graph(), seed=rng)
         
         # Remove self-loops and parallel edges
         G_null = nx.Graph(G_null)
@@ -67,7 +73,7 @@ def generate_configuration_null(G, alpha=0.5):
         # Assign random weights from original distribution
         weights = [d['weight'] for _, _, d in G_work.edges(data=True)]
         for u, v in G_null.edges():
-            G_null[u][v]['weight'] = np.random.choice(weights)
+            G_null[u][v]['weight'] = rng.choice(weights)
         
         return G_null
     except Exception as e:
@@ -75,11 +81,12 @@ def generate_configuration_null(G, alpha=0.5):
         return None
 
 
-def generate_triadic_null(G, n_swaps=None, max_tries_per_swap=100, alpha=0.5):
+def generate_triadic_null(G, n_swaps=None, max_tries_per_swap=100, alpha=0.5, rng=None):
     """
     Generate triadic-rewire null preserving triangle distribution.
     Uses double-edge swap with triangle-preserving constraint.
     """
+    rng = np.random.default_rng(rng)
     try:
         G_null = G.copy()
         
@@ -94,7 +101,7 @@ def generate_triadic_null(G, n_swaps=None, max_tries_per_swap=100, alpha=0.5):
                 if len(edges) < 2:
                     break
                     
-                edge1, edge2 = np.random.choice(len(edges), size=2, replace=False)
+                edge1, edge2 = rng.choice(len(edges), size=2, replace=False)
                 u1, v1 = edges[edge1]
                 u2, v2 = edges[edge2]
                 
@@ -152,25 +159,23 @@ def generate_triadic_null(G, n_swaps=None, max_tries_per_swap=100, alpha=0.5):
         return None
 
 
-def compute_or_curvature(G, alpha=0.5, weight='weight'):
+def compute_or_curvature(G, alpha=0.5, weight='weight', proc=None, cache=None):
     """
     Compute network-level Ollivier-Ricci curvature.
     Returns mean curvature across all edges.
     Converts to UNDIRECTED before computation (standard practice).
+    Per-edge values are looked up in `cache` (a CurvatureCache) first.
     """
     try:
-        from GraphRicciCurvature.OllivierRicci import OllivierRicci
-        
         # Convert to undirected for curvature (standard practice)
         if G.is_directed():
             G_compute = G.to_undirected()
         else:
             G_compute = G
         
-        orc = OllivierRicci(G_compute, alpha=alpha, weight=weight, verbose="ERROR")
-        orc.compute_ricci_curvature()
-        
-        curvatures = [d['ricciCurvature'] for _, _, d in orc.G.edges(data=True)]
+        kwargs = {} if proc is None else {'proc': proc}
+        curvatures = graphricci_edge_kappa(G_compute, alpha=alpha, weight=weight,
+                                           cache=cache, **kwargs)
         return np.mean(curvatures)
     except Exception as e:
         logger.error(f"Curvature computation failed: {e}")
@@ -199,7 +204,19 @@ def cliffs_delta(real_value, null_distribution):
     return delta
 
 
-def run_null_analysis(language, edge_file, null_type, M=1000, alpha=0.5, seed=123, output_dir=None):
+def null_replicate(G_real, null_type, alpha, proc, rng):
+    """Mean curvature of one valid null replicate; failed draws are redrawn from `rng`."""
+    null_func = generate_configuration_null if null_type == 'configuration' else generate_triadic_null
+    while True:
+        G_null = null_func(G_real, alpha=alpha, rng=rng)
+        if G_null is not None:
+            kappa_null = compute_or_curvature(G_null, alpha=alpha, proc=proc)
+            if kappa_null is not None:
+                return kappa_null
+
+
+def run_null_analysis(language, edge_file, null_type, M=1000, alpha=0.5, seed=123, output_dir=None,
+                      workers=1, log_dir=None):
     """
     Run null model analysis for a single language and null type.
     
@@ -216,11 +233,14 @@ def run_null_analysis(language, edge_file, null_type, M=1000, alpha=0.5, seed=12
     alpha : float
         Idleness parameter for OR curvature
     seed : int
-        Random seed
+        Root seed; replicate i uses SeedSequence(seed, spawn_key=(i,))
     output_dir : str
         Output directory for results
+    workers : int
+        Replicate-level processes
+    log_dir : str
+        Append-only replicate log; an interrupted run resumes from it
     """
-    np.random.seed(seed)
     
     logger.info(f"{'='*60}")
     logger.info(f"Starting: {language} - {null_type}")
@@ -231,7 +251,7 @@ def run_null_analysis(language, edge_file, null_type, M=1000, alpha=0.5, seed=12
     
     # Compute real curvature
     logger.info(f"Computing real curvature...")
-    kappa_real = compute_or_curvature(G_real, alpha=alpha)
+    kappa_real = compute_or_curvature(G_real, alpha=alpha, cache=default_cache())
     if kappa_real is None:
         logger.error(f"Failed to compute real curvature for {language}")
         return None
@@ -240,25 +260,15 @@ def run_null_analysis(language, edge_file, null_type, M=1000, alpha=0.5, seed=12
     
     # Generate nulls
     logger.info(f"Starting null generation (M={M})...")
-    kappa_nulls = []
-    
-    null_func = generate_configuration_null if null_type == 'configuration' else generate_triadic_null
-    
-    pbar = tqdm(total=M, desc=f"{language}-{null_type}")
-    valid_nulls = 0
-    
-    while valid_nulls < M:
-        G_null = null_func(G_real, alpha=alpha)
-        
-        if G_null is not None:
-            kappa_null = compute_or_curvature(G_null, alpha=alpha)
-            
-            if kappa_null is not None:
-                kappa_nulls.append(kappa_null)
-                valid_nulls += 1
-                pbar.update(1)
-    
-    pbar.close()
+    replicate = partial(null_replicate, G_real, null_type, alpha, 1 if workers > 1 else None)
+    kappas = run_ensemble(
+        replicate, M, root_seed=seed, log_dir=log_dir, workers=workers,
+        meta={'language': language, 'null_type': null_type, 'alpha': alpha,
+              'null_model_version': NULL_MODEL_VERSION, 'loader_version': LOADER_VERSION,
+              'solver_version': graphricci_version()}
+    )
+    kappa_nulls = kappas[~np.isnan(kappas)]
+    valid_nulls = len(kappa_nulls)
     
     logger.info(f"Generated {valid_nulls}/{M} valid nulls")
     
@@ -273,6 +283,7 @@ def run_null_analysis(language, edge_file, null_type, M=1000, alpha=0.5, seed=12
         'null_type': null_type,
         'M': M,
         'alpha': alpha,
+        'seed': seed,
         'kappa_real': float(kappa_real),
         'kappa_null_mean': float(np.mean(kappa_nulls)),
         'kappa_null_std': float(np.std(kappa_nulls)),
@@ -312,7 +323,10 @@ def main():
     parser.add_argument('--output-dir', required=True, help='Output directory')
     parser.add_argument('--M', type=int, default=1000, help='Number of replicates')
     parser.add_argument('--alpha', type=float, default=0.5, help='Idleness parameter')
-    parser.add_argument('--seed', type=int, default=123, help='Random seed')
+    parser.add_argument('--seed', type=int, default=123, help='Root seed of the replicate SeedSequence')
+    parser.add_argument('--workers', type=int, default=1, help='Replicate-level processes')
+    parser.add_argument('--log-dir', default=None,
+                        help='Append-only replicate log directory (re-run to resume)')
     
     args = parser.parse_args()
     
@@ -324,7 +338,9 @@ def main():
         M=args.M,
         alpha=args.alpha,
         seed=args.seed,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        log_dir=args.log_dir
     )
     
     if results:
@@ -6,11 +6,14 @@ CRITICAL: This will determine TRUE Chinese κ value!
 """
 
 import pandas as pd
-import networkx as nx
-from GraphRicciCurvature.OllivierRicci import OllivierRicci
 import numpy as np
 from pathlib import Path
 import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from curvature_cache import default_cache, graphricci_edge_kappa
+from graph_loader import load_edge_table
 
 def compute_curvature(edge_file: Path, language: str, alpha: float = 0.5):
     """Compute Ollivier-Ricci curvature."""
@@ -22,29 +25,14 @@ def compute_curvature(edge_file: Path, language: str, alpha: float = 0.5):
     df = pd.read_csv(edge_file)
     print(f"Loaded {len(df)} edges")
     
-    # Build directed graph
-    G = nx.DiGraph()
-    for _, row in df.iterrows():
-        G.add_edge(row['source'], row['target'], weight=row['weight'])
-    
-    # Convert to undirected
-    G_undir = G.to_undirected()
-    
-    # Get largest component
-    if not nx.is_connected(G_undir):
-        largest_cc = max(nx.connected_components(G_undir), key=len)
-        G_undir = G_undir.subgraph(largest_cc).copy()
+    # Directed edges collapsed to undirected (DiGraph.to_undirected weights), largest component
+    G_undir = load_edge_table(df, combine="digraph", self_loops=True, largest_component=True).to_networkx()
     
     print(f"Network: {G_undir.number_of_nodes()} nodes, {G_undir.number_of_edges()} edges")
     
     # Compute OR curvature
     print(f"Computing OR curvature (α={alpha})...")
-    orc = OllivierRicci(G_undir, alpha=alpha, verbose="ERROR")
-    orc.compute_ricci_curvature()
-    G_orc = orc.G
-    
-    # Extract curvatures
-    curvatures = [G_orc[u][v]['ricciCurvature'] for u, v in G_orc.edges()]
+    curvatures = graphricci_edge_kappa(G_undir, alpha=alpha, cache=default_cache())
     
     κ_mean = np.mean(curvatures)
     κ_median = np.median(curvatures)
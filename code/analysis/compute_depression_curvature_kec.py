@@ -4,14 +4,21 @@ Compute Curvature and Complete KEC for Depression Networks
 """
 
 import pandas as pd
-import networkx as nx
 import numpy as np
 from pathlib import Path
-from GraphRicciCurvature.OllivierRicci import OllivierRicci
-from scipy import linalg
 from scipy.stats import spearmanr, pearsonr
 import json
 
+from curvature_cache import default_cache, graphricci_edge_kappa
+from graph_loader import load_edge_table
+from spectrum import default_spectrum_service
+
+# Spectral entropy solver: "exact" (dense spectrum), "slq" (stochastic Lanczos
+# quadrature) or "auto" (exact up to spectrum.DENSE_MAX_NODES nodes). The
+# optimal networks have up to ~3100 nodes, so "exact" keeps the reported H
+# exact at a few seconds per network.
+SPECTRAL_METHOD = "exact"
+
 print("="*70)
 print("COMPUTING CURVATURE + COMPLETE KEC FOR DEPRESSION")
 print("="*70)
@@ -24,10 +31,7 @@ severity_levels = ['minimum', 'mild', 'moderate', 'severe']
 for level in severity_levels:
     edge_file = f'data/processed/depression_networks_optimal/depression_{level}_edges.csv'
     if Path(edge_file).exists():
-        df_edges = pd.read_csv(edge_file)
-        G = nx.Graph()
-        for _, row in df_edges.iterrows():
-            G.add_edge(row['source'], row['target'], weight=row['weight'])
+        G = load_edge_table(edge_file, combine="last", self_loops=True).to_networkx()
         networks[level] = G
         print(f"✅ Loaded {level}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
 
@@ -49,11 +53,7 @@ for level, G in networks.items():
     print("-"*70)
     
     # Compute OR curvature
-    orc = OllivierRicci(G, alpha=0.5, verbose="ERROR")
-    orc.compute_ricci_curvature()
-    
-    # Extract edge curvatures
-    edge_curvatures = [orc.G[u][v]['ricciCurvature'] for u, v in orc.G.edges()]
+    edge_curvatures = graphricci_edge_kappa(G, alpha=0.5, cache=default_cache())
     
     # Mean curvature
     kappa = np.mean(edge_curvatures)
@@ -86,17 +86,8 @@ spectral_results = {}
 for level, G in networks.items():
     print(f"{level.upper()}:")
     
-    # Normalized Laplacian
-    L = nx.normalized_laplacian_matrix(G).toarray()
-    
-    # Eigenvalues
-    eigenvalues = linalg.eigvalsh(L)
-    eigenvalues = np.abs(eigenvalues)
-    eigenvalues = eigenvalues / eigenvalues.sum()
-    eigenvalues = eigenvalues[eigenvalues > 1e-10]
-    
-    # Spectral entropy
-    H_spectral = -np.sum(eigenvalues * np.log2(eigenvalues + 1e-10))
+    # Spectral entropy of the normalized Laplacian
+    H_spectral = default_spectrum_service().spectral_entropy(G, method=SPECTRAL_METHOD)
     
     print(f"  H_spectral: {H_spectral:.4f}")
     
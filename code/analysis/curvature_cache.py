@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Persistent, content-addressed cache of per-edge Ollivier-Ricci curvature.
+
+An entry is keyed by the SHA-256 of everything the curvature depends on:
+
+  - the canonical edge array (int64, (min, max) per undirected edge, sorted
+    lexicographically; directed arcs keep their orientation)
+  - per-edge weights / lengths in the same order (float64), if any
+  - the queried edges, when only a subset of the graph is solved
+  - alpha, the method string (backend name plus solver options) and the
+    solver version (`orc_engine.SOLVER_VERSION`, or the installed
+    GraphRicciCurvature version)
+
+and stored as two files under the cache root:
+
+    <root>/<key>.npy     per-edge kappa (float64, canonical query order)
+    <root>/<key>.json    metadata (method, alpha, version, E, caller extras)
+
+`CurvatureCache.get` memory-maps an entry (read-only); `cached_edge_kappa`
+scatters a hit into a new array in the caller's edge order, so callers
+always own their result. The .npy modification time is
+the last-access stamp: hits touch it, and after every store the least
+recently used entries are evicted until the cache is within `max_bytes`
+(and `max_entries`). Writes go to a temporary file renamed into place, so
+concurrent processes never see a partial entry; the worst case of a race is
+two processes computing the same kappas.
+
+The root is $ORC_CACHE_DIR, else <repo>/.cache/curvature; setting
+$ORC_CACHE_DISABLE makes `default_cache()` return None (no caching).
+
+Usage:
+  cache = default_cache()
+  kappa = parallel_edge_kappa(graph, backend="flow", cache=cache)
+  kappa = graphricci_edge_kappa(G, alpha=0.5, cache=cache)   # G.edges() minus self-loops
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_ROOT = REPO_ROOT / ".cache" / "curvature"
+DEFAULT_MAX_BYTES = 2 << 30  # 2 GiB
+
+
+def canonical_edges(edges: np.ndarray, directed: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """(canonical int64 edge array, order) with canonical[i] = edges[order[i]]
+    (endpoints sorted per row unless `directed`)."""
+    e = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if not directed:
+        e = np.sort(e, axis=1)
+    order = np.lexsort((e[:, 1], e[:, 0]))
+    return np.ascontiguousarray(e[order]), order
+
+
+def curvature_key(
+    edges: np.ndarray,
+    *,
+    alpha: float,
+    method: str,
+    version: str,
+    weights: np.ndarray | None = None,
+    lengths: np.ndarray | None = None,
+    query: np.ndarray | None = None,
+    directed: bool = False,
+) -> str:
+    """Hex digest identifying one curvature computation.
+
+    `edges`, `weights`, `lengths` and `query` must already be canonical
+    (see `canonical_edges`); `query` is omitted when every edge is solved.
+    """
+    h = hashlib.sha256()
+    header = {"alpha": float(alpha), "method": method, "version": version, "directed": directed}
+    h.update(json.dumps(header, sort_keys=True).encode())
+    for name, arr, dtype in (
+        ("edges", edges, np.int64),
+        ("weights", weights, np.float64),
+        ("lengths", lengths, np.float64),
+        ("query", query, np.int64),
+    ):
+        h.update(name.encode())
+        if arr is not None:
+            h.update(np.ascontiguousarray(arr, dtype=dtype).tobytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class CurvatureCache:
+    """Directory of (<key>.npy, <key>.json) entries with LRU size-bounded eviction."""
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int | None = None,
+    ):
+        self.root = Path(root) if root is not None else DEFAULT_ROOT
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.root / f"{key}.npy", self.root / f"{key}.json"
+
+    def __contains__(self, key: str) -> bool:
+        return all(p.exists() for p in self._paths(key))
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Memory-mapped kappas for `key`, or None on a miss."""
+        npy, meta = self._paths(key)
+        if not meta.exists():
+            return None
+        try:
+            kappa = np.load(npy, mmap_mode="r")
+            os.utime(npy)
+        except (FileNotFoundError, ValueError):  # evicted or torn by another process
+            return None
+        return kappa
+
+    def metadata(self, key: str) -> dict | None:
+        meta = self._paths(key)[1]
+        return json.loads(meta.read_text()) if meta.exists() else None
+
+    def put(self, key: str, kappa: np.ndarray, meta: dict | None = None) -> None:
+        npy, meta_path = self._paths(key)
+        kappa = np.ascontiguousarray(kappa, dtype=np.float64)
+        pid = os.getpid()
+        tmp = npy.with_name(f"{key}.{pid}.npy.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, kappa)
+        os.replace(tmp, npy)
+        tmp = meta_path.with_name(f"{key}.{pid}.json.tmp")
+        tmp.write_text(json.dumps({"key": key, "n_edges": len(kappa), **(meta or {})}, indent=2) + "\n")
+        os.replace(tmp, meta_path)
+        self.evict(keep=key)
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        """(last access, bytes, key) per entry, least recently used first."""
+        out = []
+        for npy in self.root.glob("*.npy"):
+            meta = npy.with_suffix(".json")
+            try:
+                size = npy.stat().st_size + meta.stat().st_size
+                out.append((npy.stat().st_mtime, size, npy.stem))
+            except FileNotFoundError:
+                continue
+        return sorted(out)
+
+    def evict(self, keep: str | None = None) -> int:
+        """Drop least recently used entries beyond the size/count bounds."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        removed = 0
+        for _, size, key in entries:
+            over_size = total > self.max_bytes
+            over_count = self.max_entries is not None and count > self.max_entries
+            if not (over_size or over_count):
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            total -= size
+            count -= 1
+            removed += 1
+        return removed
+
+    def remove(self, key: str) -> None:
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for _, _, key in self.entries():
+            self.remove(key)
+
+
+def default_cache() -> CurvatureCache | None:
+    """Cache at $ORC_CACHE_DIR (default <repo>/.cache/curvature); None if disabled."""
+    if os.environ.get("ORC_CACHE_DISABLE"):
+        return None
+    root = os.environ.get("ORC_CACHE_DIR")
+    return CurvatureCache(root or DEFAULT_ROOT)
+
+
+def cached_edge_kappa(
+    cache: CurvatureCache | None,
+    compute: Callable[[], np.ndarray],
+    edges: np.ndarray,
+    *,
+    alpha: float,
+    method: str,
+    version: str,
+    weights: np.ndarray | None = None,
+    lengths: np.ndarray | None = None,
+    query: np.ndarray | None = None,
+    directed: bool = False,
+    meta: dict | None = None,
+) -> np.ndarray:
+    """Per-edge kappa in input order, from `cache` or from `compute()`.
+
+    `edges` (with aligned `weights` / `lengths`) describes the graph;
+    `compute()` returns kappas aligned with `query` (default: `edges`).
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if cache is None:
+        return np.asarray(compute(), dtype=np.float64)
+
+    canon, order = canonical_edges(edges, directed)
+    w = None if weights is None else np.asarray(weights, dtype=np.float64)[order]
+    ln = None if lengths is None else np.asarray(lengths, dtype=np.float64)[order]
+    if query is None:
+        q_canon, q_order = None, order
+    else:
+        q_canon, q_order = canonical_edges(query, directed)
+        if np.array_equal(q_canon, canon):  # every edge: same entry as query=None
+            q_canon = None
+    key = curvature_key(
+        canon, alpha=alpha, method=method, version=version,
+        weights=w, lengths=ln, query=q_canon, directed=directed,
+    )
+
+    out = np.empty(len(q_order), dtype=np.float64)
+    hit = cache.get(key)
+    if hit is not None and len(hit) == len(q_order):
+        logger.debug(f"Curvature cache hit {key[:12]} ({method}, E={len(q_order)})")
+        out[q_order] = hit
+        return out
+
+    kappa = np.asarray(compute(), dtype=np.float64)
+    cache.put(key, kappa[q_order], {
+        "alpha": float(alpha), "method": method, "version": version,
+        "directed": directed, "graph_edges": len(canon), **(meta or {}),
+    })
+    return kappa
+
+
+# ------------------------------------------------------------ entry points
+def graph_edge_data(graph) -> tuple[np.ndarray, np.ndarray | None, np.ndarray | None]:
+    """Canonical edges of an `orc_engine.CSRGraph` with their weights / lengths."""
+    rows = np.repeat(np.arange(graph.n, dtype=np.int64), graph.degree)
+    keep = rows < graph.indices
+    edges = np.column_stack([rows[keep], graph.indices[keep]])
+    weights = None if graph.weights is None else graph.weights[keep]
+    lengths = None if graph.lengths is None else graph.lengths[keep]
+    return edges, weights, lengths
+
+
+def graphricci_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return f"GraphRicciCurvature/{version('GraphRicciCurvature')}"
+    except PackageNotFoundError:
+        return "GraphRicciCurvature/unknown"
+
+
+def _sorted_nodes(G) -> list:
+    nodes = list(G.nodes())
+    try:
+        return sorted(nodes)
+    except TypeError:  # mixed label types: keep insertion order
+        return nodes
+
+
+def graphricci_edge_kappa(
+    G,
+    alpha: float = 0.5,
+    weight: str = "weight",
+    cache: CurvatureCache | None = None,
+    **orc_kwargs,
+) -> np.ndarray:
+    """GraphRicciCurvature ORC per edge, aligned with `G.edges()` minus self-loops.
+
+    OllivierRicci drops self-loops from its copy of the graph, so they get no
+    curvature; they are left out of the key and of the result, as when
+    reading `orc.G.edges()` directly.
+    `orc_kwargs` go to `OllivierRicci` (method, exp_power, proc, ...); those
+    that change the result are part of the cache key, `proc`/`verbose`/
+    `chunksize`/`cache_maxsize` are not. Edges without a `weight` attribute
+    count as weight 1, as in GraphRicciCurvature.
+    """
+    from GraphRicciCurvature.OllivierRicci import OllivierRicci
+
+    directed = G.is_directed()
+    index = {node: i for i, node in enumerate(_sorted_nodes(G))}
+    data = [(u, v, d) for u, v, d in G.edges(data=True) if u != v]
+    edges = np.array([(index[u], index[v]) for u, v, _ in data], dtype=np.int64).reshape(-1, 2)
+    weights = np.array([d.get(weight, 1.0) for _, _, d in data], dtype=np.float64)
+
+    def compute() -> np.ndarray:
+        kwargs = {"verbose": "ERROR", **orc_kwargs}
+        orc = OllivierRicci(G, alpha=alpha, weight=weight, **kwargs)
+        orc.compute_ricci_curvature()
+        return np.array([orc.G[u][v]["ricciCurvature"] for u, v, _ in data], dtype=np.float64)
+
+    options = {k: v for k, v in sorted(orc_kwargs.items())
+               if k not in ("proc", "verbose", "chunksize", "cache_maxsize")}
+    method = "graphricci" + "".join(f";{k}={v}" for k, v in options.items())
+    return cached_edge_kappa(
+        cache, compute, edges, alpha=alpha, method=method, version=graphricci_version(),
+        weights=weights, directed=directed,
+    )
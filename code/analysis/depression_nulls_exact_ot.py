@@ -14,19 +14,30 @@ Ground-truth check: minimum group kappa_real must match
 results/unified/depression_minimum_exact_lp.json (kappa_mean = -0.130267)
 and the existing null z-score (~403) in config_model_nulls.json.
 
+With --chain-every K the nulls are samples of ONE swap chain (burn-in 10*E,
+then every K swaps), re-solving only the edges each swap can affect
+(orc_incremental); samples are correlated but far cheaper.
+
 Usage:
   python3 depression_nulls_exact_ot.py --groups minimum --n-nulls 3 --time-only
   python3 depression_nulls_exact_ot.py --groups all --n-nulls 5
+  python3 depression_nulls_exact_ot.py --groups all --n-nulls 200 --chain-every 100
 """
 import argparse
 import csv
 import json
+import sys
 import time
 from pathlib import Path
 
 import networkx as nx
 import numpy as np
-import ot
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from curvature_cache import default_cache  # noqa: E402
+from orc_engine import CSRGraph  # noqa: E402
+from orc_incremental import swap_chain_kappas  # noqa: E402
+from orc_parallel import parallel_edge_kappa  # noqa: E402
 
 REPO = Path(__file__).resolve().parents[2]
 EDGES_DIR = REPO / "data/processed/depression_networks_optimal"
@@ -51,41 +62,12 @@ def load_graph(group):
     return nx.convert_node_labels_to_integers(g)
 
 
-def lazy_measure(g, x, alpha=ALPHA):
-    """Lazy random-walk probability measure at node x."""
-    nbrs = list(g.neighbors(x))
-    m = {x: alpha}
-    if nbrs:
-        w = (1.0 - alpha) / len(nbrs)
-        for z in nbrs:
-            m[z] = m.get(z, 0.0) + w
-    return m
-
-
-def edge_curvature(g, u, v, dist_cache):
-    """Exact Ollivier-Ricci curvature of edge (u,v) via network-simplex OT."""
-    mu, nu = lazy_measure(g, u), lazy_measure(g, v)
-    src_nodes = list(mu.keys())
-    tgt_nodes = list(nu.keys())
-    a = np.array([mu[n] for n in src_nodes], dtype=np.float64)
-    b = np.array([nu[n] for n in tgt_nodes], dtype=np.float64)
-    # Ground cost = shortest-path distance (cached single-source BFS).
-    M = np.empty((len(src_nodes), len(tgt_nodes)), dtype=np.float64)
-    for i, s in enumerate(src_nodes):
-        ds = dist_cache.get(s)
-        if ds is None:
-            ds = nx.single_source_shortest_path_length(g, s)
-            dist_cache[s] = ds
-        for j, t in enumerate(tgt_nodes):
-            M[i, j] = ds.get(t, len(g))  # disconnected => large
-    w1 = ot.emd2(a, b, M)
-    return 1.0 - w1  # d(u,v)=1 for an edge
-
-
-def mean_curvature(g):
-    dist_cache = {}
-    ks = [edge_curvature(g, u, v, dist_cache) for u, v in g.edges()]
-    return float(np.mean(ks)), np.array(ks)
+def mean_curvature(g, workers=1, cache=None):
+    """Exact ORC for every edge via the shared CSR engine (POT network simplex),
+    edge-parallel over `workers` processes (looked up in `cache` first)."""
+    graph, _ = CSRGraph.from_networkx(g)
+    ks = parallel_edge_kappa(graph, alpha=ALPHA, backend="emd", workers=workers, cache=cache)
+    return float(np.mean(ks)), ks
 
 
 def maslov_sneppen(g, n_swaps_factor=10, seed=0):
@@ -96,11 +78,11 @@ def maslov_sneppen(g, n_swaps_factor=10, seed=0):
     return h
 
 
-def run_group(group, n_nulls, base_seed=42, time_only=False):
+def run_group(group, n_nulls, base_seed=42, time_only=False, workers=1, chain_every=0):
     t0 = time.time()
     g = load_graph(group)
     N, E = g.number_of_nodes(), g.number_of_edges()
-    kappa_real, _ = mean_curvature(g)
+    kappa_real, _ = mean_curvature(g, workers, cache=default_cache())
     t_real = time.time() - t0
     print(f"[{group}] N={N} E={E} kappa_real={kappa_real:.6f} "
           f"(real pass {t_real:.1f}s)", flush=True)
@@ -109,14 +91,21 @@ def run_group(group, n_nulls, base_seed=42, time_only=False):
                 "kappa_real": kappa_real, "t_real_s": round(t_real, 1),
                 "est_full_s": round(t_real * (1 + n_nulls), 1)}
 
-    null_kappas = []
-    for i in range(n_nulls):
-        ts = time.time()
-        h = maslov_sneppen(g, seed=base_seed + i)
-        kn, _ = mean_curvature(h)
-        null_kappas.append(kn)
-        print(f"  [{group}] null {i+1}/{n_nulls} kappa={kn:.6f} "
-              f"({time.time()-ts:.1f}s)", flush=True)
+    if chain_every:
+        adj = [set(g[u]) for u in range(N)]
+        null_kappas = swap_chain_kappas(adj, n_nulls, chain_every, seed=base_seed,
+                                        alpha=ALPHA, backend="emd").tolist()
+        print(f"  [{group}] chain of {n_nulls} samples every {chain_every} swaps "
+              f"({time.time()-t0:.1f}s)", flush=True)
+    else:
+        null_kappas = []
+        for i in range(n_nulls):
+            ts = time.time()
+            h = maslov_sneppen(g, seed=base_seed + i)
+            kn, _ = mean_curvature(h, workers)
+            null_kappas.append(kn)
+            print(f"  [{group}] null {i+1}/{n_nulls} kappa={kn:.6f} "
+                  f"({time.time()-ts:.1f}s)", flush=True)
 
     nk = np.array(null_kappas)
     null_mean, null_std = float(nk.mean()), float(nk.std(ddof=1)) if n_nulls > 1 else None
@@ -140,22 +129,30 @@ def main():
     ap.add_argument("--n-nulls", type=int, default=5)
     ap.add_argument("--time-only", action="store_true")
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--chain-every", type=int, default=0,
+                    help="sample one swap chain every K swaps (0: independent rewires)")
     args = ap.parse_args()
 
     groups = GROUPS if args.groups == "all" else args.groups.split(",")
     results = {
-        "method": "maslov_sneppen_edge_rewiring_10E + exact_OT (POT network simplex)",
+        "method": ("maslov_sneppen_edge_rewiring_10E + exact_OT (POT network simplex)"
+                   if not args.chain_every else
+                   f"maslov_sneppen_swap_chain_burnin_10E_every_{args.chain_every} "
+                   "+ incremental exact_OT (POT network simplex)"),
         "alpha": ALPHA, "seed": args.seed, "n_nulls": args.n_nulls,
         "results": [],
     }
     for grp in groups:
         results["results"].append(
-            run_group(grp, args.n_nulls, args.seed, args.time_only))
+            run_group(grp, args.n_nulls, args.seed, args.time_only, args.workers,
+                      args.chain_every))
 
     if not args.time_only:
-        OUT.parent.mkdir(parents=True, exist_ok=True)
-        OUT.write_text(json.dumps(results, indent=2))
-        print(f"\nWrote {OUT}")
+        out = OUT.with_name(f"{OUT.stem}_chain{args.chain_every}.json") if args.chain_every else OUT
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {out}")
     print(json.dumps(results["results"], indent=2))
 
 
@@ -26,8 +26,21 @@ Datasets:
   3. HPO phenotype/comorbidity networks (data/processed/)
   4. Real fMRI ADHD-200 (from results/fmri/ or synthetic Phase 8B)
 
+Feature pipeline:
+  - per-graph primitives (degrees, clustering, edge index, sparse adjacency)
+    are computed once and shared by every extractor; Laplacian spectra come
+    from the batched, cached `spectrum` service
+  - graphs are fanned out over a process pool in chunks; sedenion orbits run
+    batched within each chunk
+  - each extractor's row is cached on disk under
+    <repo>/.cache/dual_features/<extractor>-v<version>/<graph hash>.npy
+    (`spectrum.graph_hash`: node order, edges and edge weights)
+    ($DUAL_FEATURE_CACHE_DIR overrides the root, $DUAL_FEATURE_CACHE_DISABLE
+    turns caching off), so re-running an evaluation recomputes nothing;
+    bump an extractor's version in FEATURE_EXTRACTORS when its output changes
+
 Usage:
-    python dual_classifier.py [--dataset synthetic|semantic|hpo|fmri] [--n-eval 50]
+    python dual_classifier.py [--dataset synthetic|semantic|hpo|fmri] [--n-eval 50] [--n-jobs 4]
 """
 
 from __future__ import annotations
@@ -38,12 +51,15 @@ import os
 import sys
 import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
 import networkx as nx
 import numpy as np
+import scipy.sparse as sp
 from scipy.stats import wilcoxon
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import roc_auc_score
@@ -56,22 +72,70 @@ warnings.filterwarnings("ignore")
 
 # Add analysis dir to path
 sys.path.insert(0, str(Path(__file__).parent))
-from sedenion_mandelbrot import sedenion_features
+from spectrum import graph_hash
+from sedenion_mandelbrot import normalized_laplacian_spectra, sedenion_encoding, sedenion_features_from_encodings
 
 # Repository root
 REPO_ROOT = Path(__file__).parent.parent.parent
+FEATURE_CACHE_ROOT = REPO_ROOT / ".cache" / "dual_features"
+
+
+# =============================================================================
+# Shared per-graph primitives
+# =============================================================================
+
+@dataclass
+class GraphPrimitives:
+    """Quantities every extractor needs, computed once per graph (arrays in G.nodes() order)."""
+    graph:      nx.Graph
+    degrees:    np.ndarray
+    clustering: np.ndarray
+    edges:      np.ndarray   # (m, 2) node positions, in G.edges() order
+
+    @classmethod
+    def from_graph(cls, G: nx.Graph) -> "GraphPrimitives":
+        index = {v: i for i, v in enumerate(G.nodes())}
+        degrees = np.array([d for _, d in G.degree()], dtype=float)
+        try:
+            clustering = np.array(list(nx.clustering(G).values()), dtype=float)
+        except Exception:
+            clustering = np.zeros(G.number_of_nodes())
+        edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+        return cls(G, degrees, clustering, edges)
+
+    @property
+    def n(self) -> int:
+        return len(self.degrees)
+
+    @property
+    def m(self) -> int:
+        return len(self.edges)
+
+    @cached_property
+    def adjacency(self) -> sp.csr_matrix:
+        """Symmetric sparse adjacency; a self-loop counts twice, so row sums equal `degrees`."""
+        i, j = self.edges[:, 0], self.edges[:, 1]
+        rows = np.concatenate([i, j])
+        cols = np.concatenate([j, i])
+        return sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(self.n, self.n))
+
+    @cached_property
+    def average_clustering(self) -> float:
+        # Same summation as nx.average_clustering
+        return sum(self.clustering.tolist()) / self.n if self.n else 0.0
 
 
 # =============================================================================
 # ORC feature extraction (from graph structure, no Julia dependency)
 # =============================================================================
 
-def orc_features_approx(G: nx.Graph, seed: int = 42) -> np.ndarray:
+def orc_features_approx(G: nx.Graph, seed: int = 42, prims: Optional[GraphPrimitives] = None) -> np.ndarray:
     """
     Approximate ORC features from graph topology (no Julia/Sinkhorn required).
     Uses hop-count Ricci curvature approximation:
       κ̃(u,v) ≈ 1 - |N(u) Δ N(v)| / (deg(u) + deg(v))
-    where Δ = symmetric difference of neighborhoods.
+    where Δ = symmetric difference of neighborhoods (excluding u and v),
+    counted for all edges at once from the common-neighbour counts (A·A)[u, v].
 
     Returns 8-dim vector:
       [κ̄_R, κ̄_I, κ̄_J, κ̄_K, |κ̄|, η, η/η_c, CI_width]
@@ -82,15 +146,18 @@ def orc_features_approx(G: nx.Graph, seed: int = 42) -> np.ndarray:
     if m == 0 or n < 2:
         return np.zeros(8)
 
-    degrees = dict(G.degree())
-    kappas = []
-    for u, v in G.edges():
-        nu = set(G.neighbors(u)) - {v}
-        nv = set(G.neighbors(v)) - {u}
-        sym_diff = len(nu.symmetric_difference(nv))
-        denom = degrees[u] + degrees[v]
-        kappa = 1.0 - sym_diff / max(denom, 1)
-        kappas.append(kappa)
+    prims = prims or GraphPrimitives.from_graph(G)
+    i, j = prims.edges[:, 0], prims.edges[:, 1]
+    # Neighbour sets as a 0/1 pattern (a self-loop makes a node its own neighbour)
+    P = (prims.adjacency != 0).astype(float)
+    n_nbrs = np.diff(P.indptr)
+    loop = P.diagonal()
+    # (A·A)[u, v] common-neighbour counts, only at the edges: row inner products
+    common = np.asarray(P[i].multiply(P[j]).sum(axis=1)).ravel()
+    # |N(u)\{v} ∩ N(v)\{u}| drops v (if v loops) and u (if u loops) from the common count
+    inter = common - loop[i] - loop[j]
+    sym_diff = np.where(i == j, 0.0, (n_nbrs[i] - 1) + (n_nbrs[j] - 1) - 2.0 * inter)
+    kappas = 1.0 - sym_diff / np.maximum(prims.degrees[i] + prims.degrees[j], 1.0)
 
     kappa_mean = float(np.mean(kappas))
     kappa_std  = float(np.std(kappas))
@@ -119,7 +186,7 @@ def orc_features_approx(G: nx.Graph, seed: int = 42) -> np.ndarray:
 # FSNN: first-order structural node features → graph-level pooling
 # =============================================================================
 
-def fsnn_features(G: nx.Graph) -> np.ndarray:
+def fsnn_features(G: nx.Graph, prims: Optional[GraphPrimitives] = None) -> np.ndarray:
     """
     FSNN (First-order Structural Neural Net) baseline.
     Node features: [degree, clustering_coeff, betweenness_centrality_approx]
@@ -129,11 +196,9 @@ def fsnn_features(G: nx.Graph) -> np.ndarray:
     if n < 2:
         return np.zeros(6)
 
-    degrees = np.array([d for _, d in G.degree()], dtype=float)
-    try:
-        cc = np.array(list(nx.clustering(G).values()), dtype=float)
-    except Exception:
-        cc = np.zeros(n)
+    prims = prims or GraphPrimitives.from_graph(G)
+    degrees = prims.degrees
+    cc = prims.clustering
     # Approximate betweenness (k=min(n,50) pivots for speed)
     try:
         bc_dict = nx.betweenness_centrality(G, k=min(n, 50), normalized=True, seed=42)
@@ -157,36 +222,31 @@ def fsnn_features(G: nx.Graph) -> np.ndarray:
 # GCN-like: normalised Laplacian smoothing of degree features
 # =============================================================================
 
-def gcn_features(G: nx.Graph) -> np.ndarray:
+def gcn_features(G: nx.Graph, prims: Optional[GraphPrimitives] = None, n_layers: int = 1) -> np.ndarray:
     """
-    GCN-like approximation (no PyTorch): one layer of graph convolution.
+    GCN-like approximation (no PyTorch): `n_layers` rounds of graph convolution.
     Node features h = degree + clustering; pooled via mean-aggregation.
-    h' = D^{-1/2} A D^{-1/2} h  (one step of normalised convolution)
+    h' = D^{-1/2} A D^{-1/2} h  (one sparse product per layer, k layers = k hops)
     Graph-level: mean + std + max of h' → 6-dim vector.
     """
     n = G.number_of_nodes()
     if n < 2:
         return np.zeros(6)
 
-    nodes = list(G.nodes())
-    node_idx = {v: i for i, v in enumerate(nodes)}
-    deg = np.array([G.degree(v) for v in nodes], dtype=float)
-    try:
-        cc = np.array([nx.clustering(G, v) for v in nodes], dtype=float)
-    except Exception:
-        cc = np.zeros(n)
+    prims = prims or GraphPrimitives.from_graph(G)
+    deg = prims.degrees
+    cc = prims.clustering
 
     # Node feature matrix (n × 2)
     h = np.stack([deg / max(deg.max(), 1.0), cc], axis=1)
 
     # Normalised adjacency (D^{-1/2} A D^{-1/2})
-    d_inv_sqrt = 1.0 / np.sqrt(np.maximum(deg, 1.0))
+    d_inv_sqrt = sp.diags(1.0 / np.sqrt(np.maximum(deg, 1.0)))
+    A_norm = (d_inv_sqrt @ prims.adjacency @ d_inv_sqrt).tocsr()
     # Aggregate: h'[i] = sum_{j in N(i)} d_inv_sqrt[i] * d_inv_sqrt[j] * h[j]
-    h_prime = np.zeros_like(h)
-    for u, v in G.edges():
-        i, j = node_idx[u], node_idx[v]
-        h_prime[i] += d_inv_sqrt[i] * d_inv_sqrt[j] * h[j]
-        h_prime[j] += d_inv_sqrt[j] * d_inv_sqrt[i] * h[i]
+    h_prime = h
+    for _ in range(n_layers):
+        h_prime = A_norm @ h_prime
 
     # Global pooling
     return np.concatenate([
@@ -200,38 +260,33 @@ def gcn_features(G: nx.Graph) -> np.ndarray:
 # GAT-like: attention-weighted pooling
 # =============================================================================
 
-def gat_features(G: nx.Graph) -> np.ndarray:
+def gat_features(G: nx.Graph, prims: Optional[GraphPrimitives] = None, n_layers: int = 1) -> np.ndarray:
     """
     GAT-like approximation: attention weights ∝ exp(-|deg_u - deg_v|).
-    One attention head. Graph-level: mean + std of attention-weighted h.
+    One attention head, applied `n_layers` times (k hops).
+    Graph-level: mean + std of attention-weighted h.
     """
     n = G.number_of_nodes()
     if n < 2:
         return np.zeros(6)
 
-    nodes = list(G.nodes())
-    node_idx = {v: i for i, v in enumerate(nodes)}
-    deg = np.array([G.degree(v) for v in nodes], dtype=float)
-    try:
-        cc = np.array([nx.clustering(G, v) for v in nodes], dtype=float)
-    except Exception:
-        cc = np.zeros(n)
+    prims = prims or GraphPrimitives.from_graph(G)
+    deg = prims.degrees
+    cc = prims.clustering
 
     h = np.stack([deg / max(deg.max(), 1.0), cc], axis=1)
 
-    h_attn = np.zeros_like(h)
-    attn_sum = np.zeros(n)
-    for u, v in G.edges():
-        i, j = node_idx[u], node_idx[v]
-        # Attention: scaled dot-product of degree features
-        score = float(np.exp(-abs(deg[i] - deg[j]) / max(deg.max(), 1.0)))
-        h_attn[i] += score * h[j]
-        h_attn[j] += score * h[i]
-        attn_sum[i] += score
-        attn_sum[j] += score
+    i, j = prims.edges[:, 0], prims.edges[:, 1]
+    # Attention: scaled dot-product of degree features, one score per edge
+    score = np.exp(-np.abs(deg[i] - deg[j]) / max(deg.max(), 1.0))
+    attn = sp.csr_matrix((np.concatenate([score, score]), (np.concatenate([i, j]), np.concatenate([j, i]))),
+                         shape=(n, n))
+    attn_sum = np.bincount(i, weights=score, minlength=n) + np.bincount(j, weights=score, minlength=n)
 
     safe_sum = np.maximum(attn_sum[:, None], 1e-9)
-    h_attn = h_attn / safe_sum
+    h_attn = h
+    for _ in range(n_layers):
+        h_attn = (attn @ h_attn) / safe_sum
 
     return np.concatenate([
         np.mean(h_attn, axis=0),
@@ -399,41 +454,156 @@ def fmri_dataset(n_per_class: int = 50, seed: int = 42) -> tuple[list, np.ndarra
 # Feature computation pipeline
 # =============================================================================
 
+# name → (feature dim, version); bump the version when an extractor's output changes
+FEATURE_EXTRACTORS: dict[str, tuple[int, int]] = {
+    "orc":      (8, 1),
+    "sedenion": (16, 1),
+    "fsnn":     (6, 1),
+    "gcn":      (6, 2),
+    "gat":      (6, 2),
+}
+
+
+class FeatureCache:
+    """One .npy row per (extractor version, graph hash); written atomically, never evicted."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @staticmethod
+    def extractor_key(name: str, max_iter_sed: int, gnn_layers: int = 1) -> str:
+        key = f"{name}-v{FEATURE_EXTRACTORS[name][1]}"
+        if name == "sedenion":
+            return f"{key}-iter{max_iter_sed}"
+        if name in ("gcn", "gat"):
+            return f"{key}-k{gnn_layers}"
+        return key
+
+    def _path(self, key: str, digest: str) -> Path:
+        return self.root / key / f"{digest}.npy"
+
+    def get(self, key: str, digest: str) -> Optional[np.ndarray]:
+        path = self._path(key, digest)
+        if not path.exists():
+            return None
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, digest: str, row: np.ndarray) -> None:
+        path = self._path(key, digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, np.asarray(row, dtype=float))
+        os.replace(tmp, path)
+
+
+def default_feature_cache() -> Optional[FeatureCache]:
+    """Cache under $DUAL_FEATURE_CACHE_DIR or <repo>/.cache/dual_features (None if disabled)."""
+    if os.environ.get("DUAL_FEATURE_CACHE_DISABLE"):
+        return None
+    return FeatureCache(Path(os.environ.get("DUAL_FEATURE_CACHE_DIR", FEATURE_CACHE_ROOT)))
+
+
+def _feature_rows(
+    graphs:       list[nx.Graph],
+    needed:       list[tuple[str, ...]],
+    max_iter_sed: int,
+    gnn_layers:   int = 1,
+) -> list[dict[str, np.ndarray]]:
+    """Rows of each needed extractor per graph; sedenion orbits run as one batch."""
+    prims = [GraphPrimitives.from_graph(G) for G in graphs]
+    rows: list[dict[str, np.ndarray]] = [{} for _ in graphs]
+    for idx, (p, names) in enumerate(zip(prims, needed)):
+        if "orc" in names:
+            rows[idx]["orc"] = orc_features_approx(p.graph, prims=p)
+        if "fsnn" in names:
+            rows[idx]["fsnn"] = fsnn_features(p.graph, prims=p)
+        if "gcn" in names:
+            rows[idx]["gcn"] = gcn_features(p.graph, prims=p, n_layers=gnn_layers)
+        if "gat" in names:
+            rows[idx]["gat"] = gat_features(p.graph, prims=p, n_layers=gnn_layers)
+
+    sed_idx = [idx for idx, names in enumerate(needed) if "sedenion" in names]
+    if sed_idx:
+        spectra = normalized_laplacian_spectra([prims[idx].graph for idx in sed_idx])
+        encodings = [
+            sedenion_encoding(prims[idx].n, prims[idx].m, prims[idx].degrees,
+                              prims[idx].average_clustering, eigvals)
+            for idx, eigvals in zip(sed_idx, spectra)
+        ]
+        cs, z0s = zip(*encodings)
+        sed = sedenion_features_from_encodings(list(cs), list(z0s), max_iter=max_iter_sed)
+        for idx, row in zip(sed_idx, sed):
+            rows[idx]["sedenion"] = row
+    return rows
+
+
 def compute_all_features(
     graphs:       list[nx.Graph],
     max_iter_sed: int  = 50,
     verbose:      bool = True,
+    n_jobs:       Optional[int] = 1,
+    cache:        Optional[FeatureCache] = None,
+    chunk_size:   int  = 32,
+    gnn_layers:   int  = 1,
 ) -> dict[str, np.ndarray]:
     """
     Compute all feature sets for a list of graphs.
     Returns dict with keys: 'orc', 'sedenion', 'dual', 'fsnn', 'gcn', 'gat'.
+
+    Rows already in `cache` are reused; the rest are computed in chunks of
+    `chunk_size` graphs over `n_jobs` processes (None = all cores) and stored.
+    `gnn_layers` is the number of propagation hops of the GCN/GAT baselines.
     """
     n = len(graphs)
-    orc_feats  = np.empty((n, 8))
-    sed_feats  = np.empty((n, 16))
-    fsnn_feats = np.empty((n, 6))
-    gcn_feats  = np.empty((n, 6))
-    gat_feats  = np.empty((n, 6))
-
-    for idx, G in enumerate(graphs):
-        if verbose and idx % 50 == 0:
-            print(f"  Features: {idx}/{n}...", flush=True)
-        orc_feats[idx]  = orc_features_approx(G)
-        sed_feats[idx]  = sedenion_features(G, max_iter=max_iter_sed)
-        fsnn_feats[idx] = fsnn_features(G)
-        gcn_feats[idx]  = gcn_features(G)
-        gat_feats[idx]  = gat_features(G)
-
-    dual_feats = np.hstack([orc_feats, sed_feats])
-
-    return {
-        "orc":     orc_feats,
-        "sedenion": sed_feats,
-        "dual":    dual_feats,
-        "fsnn":    fsnn_feats,
-        "gcn":     gcn_feats,
-        "gat":     gat_feats,
-    }
+    names = list(FEATURE_EXTRACTORS)
+    feats = {name: np.empty((n, FEATURE_EXTRACTORS[name][0])) for name in names}
+    keys = {name: FeatureCache.extractor_key(name, max_iter_sed, gnn_layers) for name in names}
+
+    digests = [graph_hash(G) for G in graphs] if cache is not None else [None] * n
+    needed: list[tuple[str, ...]] = []
+    for idx, digest in enumerate(digests):
+        missing = []
+        for name in names:
+            row = cache.get(keys[name], digest) if cache is not None else None
+            if row is not None and row.shape == (FEATURE_EXTRACTORS[name][0],):
+                feats[name][idx] = row
+            else:
+                missing.append(name)
+        needed.append(tuple(missing))
+
+    todo = [idx for idx in range(n) if needed[idx]]
+    if verbose and cache is not None:
+        print(f"  Features: {n - len(todo)}/{n} graphs cached", flush=True)
+
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    args = [([graphs[i] for i in chunk], [needed[i] for i in chunk], max_iter_sed, gnn_layers) for chunk in chunks]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as pool:
+            results = pool.map(_feature_rows, *zip(*args))
+            _collect_rows(results, chunks, feats, cache, keys, digests, n, verbose)
+    else:
+        results = (_feature_rows(*a) for a in args)
+        _collect_rows(results, chunks, feats, cache, keys, digests, n, verbose)
+
+    feats["dual"] = np.hstack([feats["orc"], feats["sedenion"]])
+    return {name: feats[name] for name in ("orc", "sedenion", "dual", "fsnn", "gcn", "gat")}
+
+
+def _collect_rows(results, chunks, feats, cache, keys, digests, n, verbose) -> None:
+    done = 0
+    for chunk, rows in zip(chunks, results):
+        for idx, row in zip(chunk, rows):
+            for name, values in row.items():
+                feats[name][idx] = values
+                if cache is not None:
+                    cache.put(keys[name], digests[idx], values)
+        done += len(chunk)
+        if verbose:
+            print(f"  Features: computed {done}/{sum(map(len, chunks))} (of {n})...", flush=True)
 
 
 # =============================================================================
@@ -664,7 +834,15 @@ DATASET_LOADERS = {
 }
 
 
-def run_dataset(name: str, n_eval: int = 10, max_iter_sed: int = 50, verbose: bool = True):
+def run_dataset(
+    name:          str,
+    n_eval:        int  = 10,
+    max_iter_sed:  int  = 50,
+    verbose:       bool = True,
+    n_jobs:        Optional[int] = 1,
+    feature_cache: bool = True,
+    gnn_layers:    int  = 1,
+):
     """Full pipeline for one dataset."""
     print(f"\n{'='*60}")
     print(f"Dataset: {name}")
@@ -685,7 +863,9 @@ def run_dataset(name: str, n_eval: int = 10, max_iter_sed: int = 50, verbose: bo
 
     # Compute features
     print("  Computing features...")
-    feat_dict = compute_all_features(graphs, max_iter_sed=max_iter_sed, verbose=verbose)
+    cache = default_feature_cache() if feature_cache else None
+    feat_dict = compute_all_features(graphs, max_iter_sed=max_iter_sed, verbose=verbose,
+                                     n_jobs=n_jobs, cache=cache, gnn_layers=gnn_layers)
 
     # ORC vs sedenion correlation (Spearman |ρ| should be < 0.4 for complementarity)
     from scipy.stats import spearmanr
@@ -733,6 +913,12 @@ def main():
                         help="Number of evaluation rounds (default 10; paper uses 50)")
     parser.add_argument("--max-iter-sed", type=int, default=50,
                         help="Sedenion orbit iterations (default 50; paper uses 100)")
+    parser.add_argument("--n-jobs", type=int, default=1,
+                        help="Processes for feature extraction (0 = all cores)")
+    parser.add_argument("--gnn-layers", type=int, default=1,
+                        help="Propagation hops of the GCN/GAT baselines (default 1)")
+    parser.add_argument("--no-feature-cache", action="store_true",
+                        help="Recompute features instead of reusing .cache/dual_features")
     parser.add_argument("--quiet", action="store_true")
     args = parser.parse_args()
 
@@ -741,7 +927,8 @@ def main():
 
     for ds in datasets:
         run_dataset(ds, n_eval=args.n_eval, max_iter_sed=args.max_iter_sed,
-                    verbose=not args.quiet)
+                    verbose=not args.quiet, n_jobs=args.n_jobs or None,
+                    feature_cache=not args.no_feature_cache, gnn_layers=args.gnn_layers)
 
     print("\nDone. Results in results/experiments/dual_analysis_*.json")
 
@@ -8,9 +8,15 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from scipy import linalg
 import json
 
+from graph_loader import load_edge_table
+from spectrum import default_spectrum_service
+
+# Spectral entropy solver: "exact" (dense spectrum), "slq" (stochastic Lanczos
+# quadrature) or "auto" (exact up to spectrum.DENSE_MAX_NODES nodes)
+SPECTRAL_METHOD = "auto"
+
 print("="*70)
 print("ENTROPIA: SHANNON vs. ESPECTRAL")
 print("Qual detecta melhor a pathology?")
@@ -85,7 +91,7 @@ def compute_shannon_entropy_degree(G):
     return H
 
 
-def compute_spectral_entropy(G):
+def compute_spectral_entropy(G, method=SPECTRAL_METHOD):
     """
     Entropia Espectral baseada em autovalores do Laplaciano
     H_spectral = -Σ λ_i log(λ_i)
@@ -106,27 +112,12 @@ def compute_spectral_entropy(G):
     if G.number_of_nodes() < 2:
         return 0.0
     
-    # Compute normalized Laplacian
-    L = nx.normalized_laplacian_matrix(G).toarray()
-    
-    # Eigenvalues
-    eigenvalues = linalg.eigvalsh(L)
-    
-    # Normalize (sum to 1)
-    # Some eigenvalues may be negative due to numerical errors, take abs
-    eigenvalues = np.abs(eigenvalues)
-    eigenvalues = eigenvalues / eigenvalues.sum()
-    
-    # Spectral entropy
-    # Remove zeros
-    eigenvalues = eigenvalues[eigenvalues > 1e-10]
-    
-    H_spectral = -np.sum(eigenvalues * np.log2(eigenvalues + 1e-10))
-    
-    return H_spectral
+    # Normalized Laplacian spectrum: exact (dense, cached), or stochastic
+    # Lanczos quadrature per `method`
+    return default_spectrum_service().spectral_entropy(G, kind="normalized", method=method)
 
 
-def compute_von_neumann_entropy(G):
+def compute_von_neumann_entropy(G, method=SPECTRAL_METHOD):
     """
     Von Neumann Entropy (quantum-inspired)
     H_vn = -Tr(ρ log(ρ))
@@ -143,25 +134,8 @@ def compute_von_neumann_entropy(G):
     if G.number_of_nodes() < 2:
         return 0.0
     
-    # Laplacian matrix
-    L = nx.laplacian_matrix(G).toarray()
-    
-    # Normalize by trace to get density matrix
-    trace = np.trace(L)
-    if trace <= 0:
-        return 0.0
-    
-    rho = L / trace
-    
-    # Eigenvalues of density matrix
-    eigenvalues = linalg.eigvalsh(rho)
-    eigenvalues = np.abs(eigenvalues)
-    eigenvalues = eigenvalues[eigenvalues > 1e-10]
-    
-    # Von Neumann entropy
-    H_vn = -np.sum(eigenvalues * np.log2(eigenvalues + 1e-10))
-    
-    return H_vn
+    # ρ = L / Tr(L): eigenvalues of the combinatorial Laplacian over its trace
+    return default_spectrum_service().spectral_entropy(G, kind="combinatorial", method=method)
 
 # ============================================================================
 # LOAD NETWORKS AND COMPARE
@@ -178,12 +152,7 @@ languages = ['spanish', 'english', 'chinese']
 for lang in languages:
     edge_file = f'data/processed/{lang}_edges.csv'
     if Path(edge_file).exists():
-        df_edges = pd.read_csv(edge_file)
-        G = nx.Graph()
-        
-        for _, row in df_edges.iterrows():
-            weight = row.get('strength', 1.0) if 'strength' in df_edges.columns else 1.0
-            G.add_edge(row['source'], row['target'], weight=weight)
+        G = load_edge_table(edge_file, combine="last", weight_column="strength", self_loops=True).to_networkx()
         
         networks[lang] = G
         print(f"✅ {lang}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
@@ -195,11 +164,7 @@ depression_levels = ['minimum', 'mild', 'moderate', 'severe']
 for level in depression_levels:
     edge_file = f'data/processed/depression_networks/depression_{level}_edges.csv'
     if Path(edge_file).exists():
-        df_edges = pd.read_csv(edge_file)
-        G = nx.Graph()
-        
-        for _, row in df_edges.iterrows():
-            G.add_edge(row['source'], row['target'], weight=row.get('weight', 1.0))
+        G = load_edge_table(edge_file, combine="last", self_loops=True).to_networkx()
         
         networks[f'depression_{level}'] = G
         print(f"✅ depression_{level}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
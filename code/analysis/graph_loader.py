@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Array-native edge-list loader shared by the curvature and CPC pipelines.
+
+A source/target/weight table becomes integer arrays in four vectorized
+passes:
+
+  1. labels: source and target columns are interleaved and `pd.factorize`d,
+     then ranked so that node index order is sorted label order (appearance
+     order if the labels do not sort, e.g. mixed types)
+  2. merging: rows are keyed by their encoded (u, v) pair, unordered for
+     undirected graphs, and reduced with one pandas groupby (`combine`)
+  3. components: `scipy.sparse.csgraph.connected_components` (weak for
+     directed graphs) when only the largest component is kept
+  4. compaction: nodes without edges are dropped and the rest renumbered,
+     keeping their sorted order
+
+The result is an `EdgeTable`. Its edges are canonical: (u, v) with u < v for
+undirected graphs, lexicographically sorted over label-sorted node indices.
+That is the order of `expected_exact_edge_order` and of `CSRGraph.edges()`.
+NetworkX graphs are only built on request (`to_networkx`), with nodes in
+label order and edges inserted in canonical order.
+
+`combine` decides how rows that land on the same edge merge:
+
+  - "sum", "mean", "max", "min", "first", "last": a pandas aggregation over
+    the rows in file order. "last" reproduces `nx.Graph().add_edge` row by
+    row (undirected) or `nx.DiGraph().add_edge` (directed).
+  - "digraph": the weight that `nx.DiGraph` built row by row and then
+    `to_undirected()` keeps. That is the last row of each arc, then, of the
+    two arcs u->v and v->u, the one whose source label appeared later in
+    the file.
+
+Graphs that many processes reload can be compiled once into a snapshot
+directory of raw .npy arrays (labels, edges, weights, CSR indptr/indices/
+weights) plus `snapshot.json`, written last. Later loads memory-map the
+arrays. The JSON records the SHA-256 of the source CSV and the load options,
+and a snapshot whose source hash or options differ is rebuilt in place.
+Snapshots live under $GRAPH_SNAPSHOT_DIR, else <repo>/.cache/graphs, in
+<stem>-<hash> directories whose hash covers the load options, the resolved
+CSV path and the reader.
+
+Usage:
+  table = load_edge_table("data/processed/english_edges_FINAL.csv", largest_component=True)
+  csr = table.to_csr()              # orc_engine.CSRGraph, weights aligned
+  G = table.to_networkx()           # only when NetworkX is needed
+  snapshot = load_graph_snapshot("data/processed/english_edges_FINAL.csv", largest_component=True)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from orc_engine import CSRGraph
+
+COMBINE_MODES = ("sum", "mean", "max", "min", "first", "last", "digraph")
+LOADER_VERSION = "graph_loader/1"  # bump when node or edge order of a loaded table changes
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SNAPSHOT_ROOT = REPO_ROOT / ".cache" / "graphs"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ARRAYS = ("labels", "edges", "weights", "indptr", "indices", "csr_weights")
+
+
+@dataclass(frozen=True)
+class EdgeTable:
+    """Node labels plus one row per merged edge, over label-sorted node indices."""
+
+    labels: np.ndarray
+    edges: np.ndarray
+    weights: np.ndarray
+    directed: bool = False
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.labels)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.edges)
+
+    def edge_labels(self) -> list[tuple]:
+        """Edges as (label_u, label_v) tuples, in canonical order."""
+        return list(zip(self.labels[self.edges[:, 0]].tolist(), self.labels[self.edges[:, 1]].tolist()))
+
+    def to_scipy(self) -> csr_matrix:
+        """Weighted adjacency (symmetric unless directed); self-loops stored once."""
+        u, v, w = self.edges[:, 0], self.edges[:, 1], self.weights
+        if not self.directed:
+            off = u != v
+            u, v, w = np.concatenate([u, v[off]]), np.concatenate([v, u[off]]), np.concatenate([w, w[off]])
+        return csr_matrix((w, (u, v)), shape=(self.n_nodes, self.n_nodes))
+
+    def to_csr(self) -> CSRGraph:
+        """`orc_engine.CSRGraph` of an undirected table (self-loops dropped)."""
+        if self.directed:
+            raise ValueError("CSRGraph is undirected; load the table with directed=False.")
+        return CSRGraph.from_edges(self.n_nodes, self.edges, weights=self.weights)
+
+    def largest_component(self) -> "EdgeTable":
+        """Restrict to the largest (weakly) connected component."""
+        if self.n_nodes == 0:
+            return self
+        _, component = connected_components(self.to_scipy(), directed=self.directed, connection="weak")
+        largest = int(np.argmax(np.bincount(component)))
+        keep = component[self.edges[:, 0]] == largest
+        return _compact(self.labels, self.edges[keep], self.weights[keep], self.directed)
+
+    def to_networkx(self, weight: str = "weight") -> nx.Graph:
+        """nx.Graph / nx.DiGraph with nodes in label order and canonical edge order."""
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        labels = self.labels.tolist()
+        G.add_nodes_from(labels)
+        G.add_weighted_edges_from(
+            zip(
+                [labels[i] for i in self.edges[:, 0].tolist()],
+                [labels[j] for j in self.edges[:, 1].tolist()],
+                self.weights.tolist(),
+            ),
+            weight=weight,
+        )
+        return G
+
+
+def _sorted_label_order(uniques: np.ndarray) -> np.ndarray:
+    try:
+        return np.argsort(uniques, kind="stable")
+    except TypeError:  # labels that do not sort (mixed types): keep appearance order
+        return np.arange(len(uniques))
+
+
+def _compact(labels: np.ndarray, edges: np.ndarray, weights: np.ndarray, directed: bool) -> EdgeTable:
+    """Drop nodes without edges; renumbering keeps relative (sorted) order."""
+    used = np.zeros(len(labels), dtype=bool)
+    used[edges.reshape(-1)] = True
+    new_index = np.cumsum(used) - 1
+    return EdgeTable(
+        labels=labels[used],
+        edges=new_index[edges].astype(np.int64).reshape(-1, 2),
+        weights=np.asarray(weights, dtype=np.float64),
+        directed=directed,
+    )
+
+
+def load_edge_table(
+    edgelist: pd.DataFrame | Path | str,
+    *,
+    directed: bool = False,
+    combine: str = "sum",
+    source_column: str = "source",
+    target_column: str = "target",
+    weight_column: str | None = "weight",
+    default_weight: float = 1.0,
+    self_loops: bool = False,
+    largest_component: bool = False,
+    as_str: bool = False,
+) -> EdgeTable:
+    """Load an edge list (DataFrame or CSV path) into an `EdgeTable`.
+
+    A missing `weight_column` (or None) gives every row `default_weight`.
+    `as_str` casts labels with `str()` first. Self-loops are dropped unless
+    `self_loops`.
+    """
+    if combine not in COMBINE_MODES:
+        raise ValueError(f"Unknown combine mode {combine!r}; expected one of {COMBINE_MODES}.")
+    if combine == "digraph" and directed:
+        raise ValueError("combine='digraph' merges arcs into undirected edges; use directed=False.")
+
+    frame = pd.read_csv(edgelist) if isinstance(edgelist, (str, Path)) else edgelist
+    source = frame[source_column]
+    target = frame[target_column]
+    if as_str:
+        source, target = source.astype(str), target.astype(str)
+    if weight_column is not None and weight_column in frame.columns:
+        weights = frame[weight_column].to_numpy(dtype=np.float64)
+    else:
+        weights = np.full(len(frame), float(default_weight))
+
+    interleaved = np.empty(2 * len(frame), dtype=object)
+    interleaved[0::2] = source.to_numpy(dtype=object)
+    interleaved[1::2] = target.to_numpy(dtype=object)
+    appearance, uniques = pd.factorize(interleaved, use_na_sentinel=False)
+    uniques = np.asarray(uniques, dtype=object)
+    order = _sorted_label_order(uniques)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    labels = uniques[order]
+    n = len(labels)
+
+    u = rank[appearance[0::2]]
+    v = rank[appearance[1::2]]
+    source_appearance = appearance[0::2]
+    if not self_loops:
+        keep = u != v
+        u, v, weights, source_appearance = u[keep], v[keep], weights[keep], source_appearance[keep]
+
+    if directed:
+        a, b = u, v
+    else:
+        a, b = np.minimum(u, v), np.maximum(u, v)
+    key = a * n + b
+
+    if combine == "digraph":
+        # Last row per arc, then the arc whose source was inserted later.
+        last_arc = ~pd.Series(u * n + v).duplicated(keep="last").to_numpy()
+        key, weights, source_appearance = key[last_arc], weights[last_arc], source_appearance[last_arc]
+        pick = np.lexsort((source_appearance, key))
+        key, weights = key[pick], weights[pick]
+        merged = pd.Series(weights).groupby(key, sort=True).last()
+    else:
+        merged = pd.Series(weights).groupby(key, sort=True).agg(combine)
+
+    keys = merged.index.to_numpy(dtype=np.int64)
+    edges = np.column_stack([keys // n, keys % n]) if n else np.empty((0, 2), dtype=np.int64)
+    table = _compact(labels, edges, merged.to_numpy(dtype=np.float64), directed)
+    return table.largest_component() if largest_component else table
+
+
+def load_graph(edgelist: pd.DataFrame | Path | str, weight: str = "weight", **kwargs) -> nx.Graph:
+    """`load_edge_table(...).to_networkx()` for callers that need NetworkX."""
+    return load_edge_table(edgelist, **kwargs).to_networkx(weight=weight)
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """A compiled, memory-mapped graph: edge table, CSR view and provenance."""
+
+    table: EdgeTable
+    csr: CSRGraph | None
+    path: Path
+    metadata: dict[str, Any]
+
+    @property
+    def source_sha256(self) -> str:
+        return self.metadata["source_sha256"]
+
+
+def file_sha256(path: Path | str) -> str:
+    """Hex SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _reader_name(reader: Callable) -> str:
+    """Stable name of a reader callable (module-qualified; partials include their arguments)."""
+    if isinstance(reader, functools.partial):
+        return f"partial({_reader_name(reader.func)}, {reader.args!r}, {sorted(reader.keywords.items())!r})"
+    return f"{getattr(reader, '__module__', '')}.{getattr(reader, '__qualname__', type(reader).__qualname__)}"
+
+
+def _options_key(options: dict[str, Any], source: Path | None = None, reader: Callable | None = None) -> str:
+    header = {"version": SNAPSHOT_VERSION, **options}
+    if source is not None:
+        header["source_path"] = str(source.resolve())
+    if reader is not None:
+        header["reader"] = _reader_name(reader)
+    return hashlib.sha256(json.dumps(header, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _snapshot_labels(labels: np.ndarray) -> np.ndarray:
+    """Fixed-width label array (memory-mappable); labels must share one type."""
+    values = labels.tolist()
+    if len({type(value) for value in values}) > 1:
+        raise ValueError("Graph snapshots need labels of a single type; load with as_str=True.")
+    return np.asarray(values) if values else np.empty(0, dtype="<U1")
+
+
+def write_graph_snapshot(
+    table: EdgeTable,
+    directory: Path | str,
+    source_sha256: str,
+    options: dict[str, Any] | None = None,
+) -> GraphSnapshot:
+    """Write `table` (and its CSR view, if undirected) as raw .npy arrays plus snapshot.json."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    meta_path = directory / "snapshot.json"
+    meta_path.unlink(missing_ok=True)  # readers never pair old metadata with new arrays
+
+    csr = None if table.directed else table.to_csr()
+    arrays = {
+        "labels": _snapshot_labels(table.labels),
+        "edges": table.edges,
+        "weights": table.weights,
+        "indptr": csr.indptr if csr is not None else None,
+        "indices": csr.indices if csr is not None else None,
+        "csr_weights": csr.weights if csr is not None else None,
+    }
+    pid = os.getpid()
+    for name, array in arrays.items():
+        path = directory / f"{name}.npy"
+        if array is None:
+            path.unlink(missing_ok=True)
+            continue
+        tmp = directory / f"{name}.{pid}.npy.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp, path)
+
+    metadata = {
+        "version": SNAPSHOT_VERSION,
+        "source_sha256": source_sha256,
+        "options": options or {},
+        "directed": table.directed,
+        "n_nodes": table.n_nodes,
+        "n_edges": table.n_edges,
+    }
+    tmp = directory / f"snapshot.{pid}.json.tmp"
+    tmp.write_text(json.dumps(metadata, indent=2) + "\n")
+    os.replace(tmp, meta_path)
+    return read_graph_snapshot(directory)
+
+
+def read_graph_snapshot(directory: Path | str, source_sha256: str | None = None) -> GraphSnapshot | None:
+    """Memory-map a snapshot; None if missing, torn, or built from a different source hash."""
+    directory = Path(directory)
+    meta_path = directory / "snapshot.json"
+    if not meta_path.exists():
+        return None
+    metadata = json.loads(meta_path.read_text())
+    if metadata.get("version") != SNAPSHOT_VERSION:
+        return None
+    if source_sha256 is not None and metadata.get("source_sha256") != source_sha256:
+        return None
+    try:
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in SNAPSHOT_ARRAYS
+            if name in ("labels", "edges", "weights") or not metadata["directed"]
+        }
+    except (FileNotFoundError, ValueError):
+        return None
+    table = EdgeTable(arrays["labels"], arrays["edges"], arrays["weights"], directed=metadata["directed"])
+    csr = None
+    if not metadata["directed"]:
+        csr = CSRGraph(arrays["indptr"], arrays["indices"], weights=arrays["csr_weights"])
+    return GraphSnapshot(table=table, csr=csr, path=directory, metadata=metadata)
+
+
+def load_graph_snapshot(
+    edge_file: Path | str,
+    root: Path | str | None = None,
+    reader: Callable[[Path], pd.DataFrame] = pd.read_csv,
+    **options: Any,
+) -> GraphSnapshot:
+    """Snapshot of `load_edge_table(edge_file, **options)`, compiled on first use.
+
+    The snapshot is rebuilt whenever the CSV's SHA-256 changes. `reader`
+    parses the CSV on a rebuild (e.g. to validate columns).
+    """
+    edge_file = Path(edge_file)
+    root = Path(root or os.environ.get("GRAPH_SNAPSHOT_DIR") or DEFAULT_SNAPSHOT_ROOT)
+    # The resolved path and reader are part of the key: equal stems in different
+    # directories, or a different parser, never share a snapshot
+    directory = root / f"{edge_file.stem}-{_options_key(options, source=edge_file, reader=reader)}"
+    source_sha256 = file_sha256(edge_file)
+    snapshot = read_graph_snapshot(directory, source_sha256)
+    if snapshot is None:
+        table = load_edge_table(reader(edge_file), **options)
+        snapshot = write_graph_snapshot(table, directory, source_sha256, options)
+    return snapshot
@@ -26,12 +26,15 @@ NO clinical claim. n=1 single case; this is a methods pilot on the canonical CSD
 import csv
 import json
 import math
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import numpy as np
 import networkx as nx
-import ot
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from orc_engine import CSRGraph, CurvatureEngine  # noqa: E402
 
 DATA = Path(__file__).resolve().parents[2] / "data/external/kossakowski_csd/ESMdata/ESMdata.csv"
 OUT = Path(__file__).resolve().parents[2] / "results/unified"
@@ -171,46 +174,16 @@ def poincare_metric(assoc):
 
 # ---- Ollivier-Ricci curvature ------------------------------------------------
 
-def lazy_measure(g, x):
-    nbrs = list(g.neighbors(x))
-    m = {x: ALPHA}
-    if nbrs:
-        wsum = sum(g[x][z]["w"] for z in nbrs)
-        for z in nbrs:
-            p = (1.0 - ALPHA) * (g[x][z]["w"] / wsum if wsum > 0 else 1.0 / len(nbrs))
-            m[z] = m.get(z, 0.0) + p
-    return m
-
-
 def mean_kappa_graph(g):
     """LLY-ORC with weighted shortest-path distances (metrics A,B)."""
-    dist = dict(nx.all_pairs_dijkstra_path_length(g, weight="d"))
-    ks = []
-    for u, v in g.edges():
-        mu, nu = lazy_measure(g, u), lazy_measure(g, v)
-        sn, tn = list(mu), list(nu)
-        a = np.array([mu[s] for s in sn]); b = np.array([nu[t] for t in tn])
-        M = np.array([[dist[s].get(t, len(g)) for t in tn] for s in sn], float)
-        duv = g[u][v]["d"]
-        if duv <= 0:
-            continue
-        ks.append(1.0 - ot.emd2(a, b, M) / duv)
-    return float(np.mean(ks)) if ks else float("nan")
+    graph, _ = CSRGraph.from_networkx(g, weight="w", length="d")
+    return CurvatureEngine(graph, alpha=ALPHA, backend="emd").mean_kappa()
 
 
 def mean_kappa_poincare(g, Mp):
     """LLY-ORC using the Poincare geodesic distance matrix Mp as the metric."""
-    ks = []
-    for u, v in g.edges():
-        mu, nu = lazy_measure(g, u), lazy_measure(g, v)
-        sn, tn = list(mu), list(nu)
-        a = np.array([mu[s] for s in sn]); b = np.array([nu[t] for t in tn])
-        M = np.array([[Mp[s, t] for t in tn] for s in sn], float)
-        duv = Mp[u, v]
-        if duv <= 0:
-            continue
-        ks.append(1.0 - ot.emd2(a, b, M) / duv)
-    return float(np.mean(ks)) if ks else float("nan")
+    graph, _ = CSRGraph.from_networkx(g, weight="w", nodelist=range(len(Mp)))
+    return CurvatureEngine(graph, alpha=ALPHA, backend="emd", dist=Mp).mean_kappa()
 
 
 def kappa_one(W, name):
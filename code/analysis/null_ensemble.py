@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Checkpointed, process-parallel null-ensemble runner.
+
+A null ensemble is M independent replicates, each a function of its own
+random stream. Replicate i always draws from
+
+    SeedSequence(root_seed, spawn_key=(i,))
+
+(the i-th child of `SeedSequence(root_seed).spawn(M)`), so a replicate's value
+does not depend on worker count, scheduling order, or whether the run was
+interrupted and resumed.
+
+Finished replicates are appended to an on-disk log directory:
+
+    <log_dir>/meta.json            run configuration plus LOG_VERSION (checked on resume)
+    <log_dir>/shard_00000.npy      structured array (replicate int64, value float64)
+    <log_dir>/shard_00001.npy      ...
+
+Shards are written to a temporary file and renamed into place, so a crash
+never leaves a partial shard; at most the last `flush_every` unflushed
+replicates are recomputed. Re-running with the same log directory skips every
+replicate already on disk. A replicate whose function raises is logged as a
+warning but not written, so it stays NaN in the result and is retried on the
+next resume. Callers should put the versions of everything a replicate value
+depends on (null-model generator, graph loader, curvature solver) into
+`meta`, so a log is never resumed across versions.
+
+Usage:
+  kappas = run_ensemble(partial(replicate_fn, G), M=1000, root_seed=123,
+                        log_dir=out / "english_configuration", workers=8)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LOG_DTYPE = np.dtype([("replicate", "<i8"), ("value", "<f8")])
+FLUSH_EVERY = 10
+LOG_VERSION = 2  # 2: failed replicates are no longer logged as NaN
+
+ReplicateFn = Callable[[np.random.Generator], float]
+
+
+def replicate_seed(root_seed: int, index: int) -> np.random.SeedSequence:
+    """Seed of replicate `index`; equal to SeedSequence(root_seed).spawn(M)[index]."""
+    return np.random.SeedSequence(root_seed, spawn_key=(index,))
+
+
+def replicate_rng(root_seed: int, index: int) -> np.random.Generator:
+    return np.random.default_rng(replicate_seed(root_seed, index))
+
+
+class ReplicateLog:
+    """Append-only shard log of (replicate, value) records."""
+
+    def __init__(self, log_dir: Path, meta: dict, flush_every: int = FLUSH_EVERY):
+        self.flush_every = flush_every
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        meta = {"log_version": LOG_VERSION, **meta}
+        meta_path = self.log_dir / "meta.json"
+        if meta_path.exists():
+            stored = json.loads(meta_path.read_text())
+            if stored != meta:
+                raise ValueError(
+                    f"{self.log_dir}: existing log was written for {stored}, not {meta}"
+                )
+        else:
+            meta_path.write_text(json.dumps(meta, indent=2) + "\n")
+        self._pending: list[tuple[int, float]] = []
+        self._next_shard = len(self._shards())
+
+    def _shards(self) -> list[Path]:
+        return sorted(self.log_dir.glob("shard_*.npy"))
+
+    def load(self) -> np.ndarray:
+        """All flushed records (first record wins if a replicate repeats)."""
+        shards = [np.load(p) for p in self._shards()]
+        if not shards:
+            return np.empty(0, dtype=LOG_DTYPE)
+        records = np.concatenate(shards)
+        _, first = np.unique(records["replicate"], return_index=True)
+        return records[np.sort(first)]
+
+    def append(self, replicate: int, value: float) -> None:
+        self._pending.append((replicate, value))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        records = np.array(self._pending, dtype=LOG_DTYPE)
+        path = self.log_dir / f"shard_{self._next_shard:05d}.npy"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self._next_shard += 1
+        self._pending = []
+
+
+_REPLICATE: ReplicateFn | None = None
+
+
+def _init_worker(fn: ReplicateFn) -> None:
+    global _REPLICATE
+    _REPLICATE = fn
+
+
+def _run_replicate(fn: ReplicateFn, root_seed: int, index: int) -> tuple[int, float | None]:
+    """(index, value), or (index, None) if the replicate failed (not logged, retried on resume)."""
+    try:
+        return index, float(fn(replicate_rng(root_seed, index)))
+    except Exception as e:
+        logger.warning(f"Replicate {index} failed: {e}")
+        return index, None
+
+
+def _worker_replicate(root_seed: int, index: int) -> tuple[int, float | None]:
+    return _run_replicate(_REPLICATE, root_seed, index)
+
+
+def run_ensemble(
+    fn: ReplicateFn,
+    M: int,
+    root_seed: int,
+    log_dir: Path | None = None,
+    workers: int = 1,
+    meta: dict | None = None,
+    flush_every: int = FLUSH_EVERY,
+) -> np.ndarray:
+    """Values of replicates 0..M-1 (float64, replicate order; NaN = failed this run).
+
+    `fn(rng)` computes one replicate and must be picklable when workers > 1
+    (a module-level function or a functools.partial of one). Workers are
+    non-daemonic, so `fn` may itself start a process pool.
+    """
+    values = np.full(M, np.nan)
+    done = np.zeros(M, dtype=bool)
+    log = None
+    if log_dir is not None:
+        # M is not part of the identity: replicate seeds do not depend on it,
+        # so a finished ensemble can be extended by re-running with larger M.
+        log = ReplicateLog(log_dir, {"root_seed": root_seed, **(meta or {})}, flush_every)
+        records = log.load()
+        records = records[records["replicate"] < M]
+        values[records["replicate"]] = records["value"]
+        done[records["replicate"]] = True
+        if done.any():
+            logger.info(f"Resuming from {log_dir}: {int(done.sum())}/{M} replicates on disk")
+
+    todo = np.flatnonzero(~done).tolist()
+
+    n_done = int(done.sum())
+
+    def record(index: int, value: float | None) -> None:
+        nonlocal n_done
+        n_done += 1
+        if value is not None:
+            values[index] = value
+            if log is not None:
+                log.append(index, value)
+        if n_done % flush_every == 0 or n_done == M:
+            logger.info(f"{n_done}/{M} replicates done")
+
+    try:
+        if workers <= 1:
+            for index in todo:
+                record(*_run_replicate(fn, root_seed, index))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(fn,)) as pool:
+                # Keep a bounded number of replicates in flight so a crash loses
+                # little work and memory stays flat for large M.
+                queue = iter(todo)
+                futures = set()
+                for index in queue:
+                    futures.add(pool.submit(_worker_replicate, root_seed, index))
+                    if len(futures) >= 2 * workers:
+                        break
+                while futures:
+                    finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        record(*fut.result())
+                        index = next(queue, None)
+                        if index is not None:
+                            futures.add(pool.submit(_worker_replicate, root_seed, index))
+    finally:
+        if log is not None:
+            log.flush()
+    return values
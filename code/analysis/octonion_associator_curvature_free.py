@@ -19,7 +19,7 @@ from pathlib import Path
 import networkx as nx, numpy as np
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from octonion_associator_permutation_test import assoc, load_graph
+from octonion_associator_permutation_test import load_graph, mean_assoc_energy
 
 REPO = Path(__file__).resolve().parents[2]
 OUT = REPO / "results/unified/octonion_associator_curvature_free.json"
@@ -66,10 +66,7 @@ def energy(h, feats, max_triples=20000, seed=0):
     nt_all = len(triples)
     if len(triples) > max_triples:
         triples = [triples[i] for i in rng.choice(len(triples), max_triples, replace=False)]
-    acc = 0.0
-    for u, v, w in triples:
-        e = assoc(feats[u], feats[v], feats[w]); acc += float(e @ e)
-    return acc / len(triples), nt_all
+    return mean_assoc_energy(feats, triples), nt_all
 
 
 def main():
@@ -14,7 +14,7 @@ from pathlib import Path
 import networkx as nx, numpy as np
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from octonion_associator_permutation_test import assoc, load_graph, NODE_METRICS
+from octonion_associator_permutation_test import load_graph, mean_assoc_energy, NODE_METRICS
 
 REPO = Path(__file__).resolve().parents[2]
 OUT = REPO / "results/unified/octonion_associator_density_matched.json"
@@ -54,10 +54,7 @@ def energy(h, feats, max_triples=20000, seed=0):
     if not triples: return 0.0
     if len(triples) > max_triples:
         triples = [triples[i] for i in rng.choice(len(triples), max_triples, replace=False)]
-    acc = 0.0
-    for u, v, w in triples:
-        e = assoc(feats[u], feats[v], feats[w]); acc += float(e @ e)
-    return acc / len(triples)
+    return mean_assoc_energy(feats, triples)
 
 
 def main():
@@ -23,44 +23,30 @@ from collections import defaultdict
 from pathlib import Path
 import networkx as nx, numpy as np
 
+from hypercomplex import from_fano_lines
+
 REPO = Path(__file__).resolve().parents[2]
 EDGES_DIR = REPO / "data/processed/depression_networks_optimal"
 NODE_METRICS = REPO / "results/cpc2026/depression_node_metrics.csv"
 OUT = REPO / "results/unified/octonion_associator_permutation_test.json"
 GROUPS = ["minimum", "mild", "moderate", "severe"]
 
-# Octonion multiplication table (Cayley-Dickson, standard basis). mult[i][j] = (sign, index)
-def _build_oct_table():
-    # Quaternion-extended Cayley-Dickson construction.
-    # Use known octonion table (e0=1). Signs per standard reference.
-    T = [[(1, 0)] * 8 for _ in range(8)]
-    # e0 is identity
-    for i in range(8):
-        T[0][i] = (1, i); T[i][0] = (1, i)
-    # imaginary units square to -e0
-    for i in range(1, 8):
-        T[i][i] = (-1, 0)
-    # triples (Fano lines) that multiply cyclically to +: standard octonion
-    lines = [(1,2,3),(1,4,5),(1,7,6),(2,4,6),(2,5,7),(3,4,7),(3,6,5)]
-    for a, b, c in lines:
-        for x, y, z in [(a,b,c),(b,c,a),(c,a,b)]:
-            T[x][y] = (1, z); T[y][x] = (-1, z)
-    return T
-
-OCT = _build_oct_table()
+# Octonion multiplication (standard basis, e0 = 1): Fano lines that multiply cyclically to +
+FANO_LINES = [(1,2,3),(1,4,5),(1,7,6),(2,4,6),(2,5,7),(3,4,7),(3,6,5)]
+OCTONION = from_fano_lines(FANO_LINES)
 
 def omul(p, q):
-    r = np.zeros(8)
-    for i in range(8):
-        if p[i] == 0.0: continue
-        for j in range(8):
-            if q[j] == 0.0: continue
-            s, k = OCT[i][j]
-            r[k] += s * p[i] * q[j]
-    return r
+    return OCTONION.mul(p, q)
 
 def assoc(a, b, c):
-    return omul(omul(a, b), c) - omul(a, omul(b, c))
+    return OCTONION.associator(a, b, c)
+
+def mean_assoc_energy(feats, triples, perm=None):
+    """Mean |[a,b,c]|^2 over node triples, all associators in one batched call."""
+    cols = slice(None) if perm is None else perm
+    a, b, c = (np.array([feats[t[k]] for t in triples])[:, cols] for k in range(3))
+    e = assoc(a, b, c)
+    return float(np.einsum("ij,ij->", e, e)) / len(triples)
 
 
 def load_graph(group):
@@ -117,12 +103,7 @@ def associator_energy(g, feats, perm, max_triples=20000, seed=0):
         triples = [triples[i] for i in idx]
     if not triples:
         return 0.0, 0
-    acc = 0.0
-    for u, v, w in triples:
-        a = feats[u][perm]; b = feats[v][perm]; c = feats[w][perm]
-        e = assoc(a, b, c)
-        acc += float(e @ e)
-    return acc / len(triples), len(triples)
+    return mean_assoc_energy(feats, triples, perm), len(triples)
 
 
 def main():
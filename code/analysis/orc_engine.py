@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Shared CSR-backed Ollivier-Ricci curvature engine.
+
+One implementation of lazy-walk ORC for every pipeline that used to carry its
+own copy (audit/sounio_orc_core, structural_nulls_r1lcc, depression_nulls_exact_ot,
+kossakowski_geometric_csd, zuco_kec):
+
+  - graph:    int32 CSR arrays (indptr/indices), neighbours sorted per row,
+              optional per-edge measure weights and edge lengths
+  - measure:  mu_x = alpha * delta_x + (1 - alpha) * w(x,.) / sum w(x,.)
+              (uniform over neighbours when the graph is unweighted)
+  - cost:     hop distance (unweighted; answered by a bounded-radius oracle,
+              never an n x n matrix) or weighted shortest-path distance
+              (edge lengths), or any caller-supplied metric matrix
+  - W1:       pluggable backend -- "lp" (scipy linprog, HiGHS), "emd"
+              (POT network simplex), "sinkhorn" (log-domain, entropic), or any
+              callable (a, b, cost) -> float; "flow" is the exact combinatorial
+              fast path for unweighted graphs (integer masses, 0/1/2/3 costs)
+
+Support vectors and cost submatrices are built with array gathers straight
+from the CSR rows; no per-node Python dicts.
+
+Edge order: `CSRGraph.edges()` is lexicographic over (u, v) with u < v, i.e.
+the order of `expected_exact_edge_order` when node indices follow sorted labels.
+
+Usage:
+  graph = CSRGraph.from_adjacency(adj)
+  engine = CurvatureEngine(graph, backend="lp")
+  kappas = engine.edge_kappa()          # float64, one per canonical edge
+  kappa_mean = engine.mean_kappa()
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from math import lcm
+from typing import Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import shortest_path
+
+try:
+    import ot
+except Exception:  # pragma: no cover - optional dependency at runtime
+    ot = None  # type: ignore[assignment]
+
+ALPHA = 0.5
+SOLVER_VERSION = "orc_engine/1"  # bump when per-edge kappas of any backend change (cache key)
+
+W1Solver = Callable[[np.ndarray, np.ndarray, np.ndarray], float]
+
+
+# ---------------------------------------------------------------------- graph
+@dataclass(frozen=True)
+class CSRGraph:
+    """Undirected simple graph as symmetric int32 CSR arrays.
+
+    `weights` (measure weights) and `lengths` (edge lengths for the cost
+    metric) are optional float64 arrays aligned with `indices`.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray | None = None
+    lengths: np.ndarray | None = None
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices) // 2
+
+    @property
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def edges(self) -> np.ndarray:
+        """Canonical (E, 2) int32 edge array, u < v, lexicographically sorted."""
+        rows = np.repeat(np.arange(self.n, dtype=np.int32), self.degree)
+        keep = rows < self.indices
+        return np.column_stack([rows[keep], self.indices[keep]]).astype(np.int32)
+
+    def edge_slot(self, u: int, v: int) -> int:
+        """Position of v in the CSR row of u (raises KeyError if not adjacent)."""
+        row = self.neighbors(u)
+        pos = int(np.searchsorted(row, v))
+        if pos >= len(row) or row[pos] != v:
+            raise KeyError(f"({u}, {v}) is not an edge")
+        return int(self.indptr[u]) + pos
+
+    def to_scipy(self, data: np.ndarray | None = None) -> csr_matrix:
+        if data is None:
+            data = np.ones(len(self.indices), dtype=np.float64)
+        return csr_matrix((data, self.indices, self.indptr), shape=(self.n, self.n))
+
+    @classmethod
+    def from_edges(
+        cls,
+        n: int,
+        edges: np.ndarray | Sequence[tuple[int, int]],
+        weights: np.ndarray | Sequence[float] | None = None,
+        lengths: np.ndarray | Sequence[float] | None = None,
+    ) -> "CSRGraph":
+        """Build from an undirected edge list; self-loops are dropped and
+        duplicate pairs keep their first occurrence."""
+        e = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        lo = np.minimum(e[:, 0], e[:, 1])
+        hi = np.maximum(e[:, 0], e[:, 1])
+        keep = lo != hi
+        key = lo[keep] * n + hi[keep]
+        _, first = np.unique(key, return_index=True)
+        sel = np.flatnonzero(keep)[first]
+        lo, hi = lo[sel], hi[sel]
+
+        rows = np.concatenate([lo, hi])
+        cols = np.concatenate([hi, lo])
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        indices = cols[order].astype(np.int32)
+
+        def _aligned(values):
+            if values is None:
+                return None
+            vals = np.asarray(values, dtype=np.float64)[sel]
+            return np.concatenate([vals, vals])[order]
+
+        return cls(indptr, indices, _aligned(weights), _aligned(lengths))
+
+    @classmethod
+    def from_adjacency(
+        cls, adj: Sequence[Iterable[int]] | Mapping[int, Iterable[int]], n: int | None = None
+    ) -> "CSRGraph":
+        """Build from a list/dict of neighbour collections indexed 0..n-1."""
+        if isinstance(adj, Mapping):
+            n = max(adj, default=-1) + 1 if n is None else n
+            items = adj.items()
+        else:
+            n = len(adj) if n is None else n
+            items = enumerate(adj)
+        src, dst = [], []
+        for u, nbrs in items:
+            nbrs = np.fromiter(nbrs, dtype=np.int64)
+            src.append(np.full(len(nbrs), u, dtype=np.int64))
+            dst.append(nbrs)
+        if not src:
+            return cls.from_edges(n, np.empty((0, 2), dtype=np.int64))
+        return cls.from_edges(n, np.column_stack([np.concatenate(src), np.concatenate(dst)]))
+
+    @classmethod
+    def from_networkx(
+        cls, g, weight: str | None = None, length: str | None = None, nodelist=None
+    ) -> tuple["CSRGraph", list]:
+        """Build from a NetworkX graph; returns (graph, node labels by index)."""
+        nodes = list(g.nodes()) if nodelist is None else list(nodelist)
+        pos = {node: i for i, node in enumerate(nodes)}
+        data = list(g.edges(data=True))
+        edges = np.array([(pos[s], pos[t]) for s, t, _ in data], dtype=np.int64).reshape(-1, 2)
+        w = [d.get(weight, 1.0) for _, _, d in data] if weight else None
+        ln = [d.get(length, 1.0) for _, _, d in data] if length else None
+        return cls.from_edges(len(nodes), edges, weights=w, lengths=ln), nodes
+
+
+def as_edge_array(edges: np.ndarray | Iterable[tuple[int, int]]) -> np.ndarray:
+    """Coerce an edge iterable to an (E, 2) int64 array."""
+    if not isinstance(edges, np.ndarray):
+        edges = list(edges)
+    return np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+
+
+# ----------------------------------------------------------------- distances
+def distance_matrix(graph: CSRGraph, unreachable_cost: float | None = None) -> np.ndarray:
+    """All-pairs shortest-path matrix: hop counts, or weighted if `lengths` set.
+
+    Unreachable pairs get `unreachable_cost` (default n, the convention used by
+    the per-script implementations this module replaces).
+    """
+    if graph.lengths is None:
+        d = shortest_path(graph.to_scipy(), method="D", directed=False, unweighted=True)
+    else:
+        d = shortest_path(graph.to_scipy(graph.lengths), method="D", directed=False)
+    d[np.isinf(d)] = float(graph.n if unreachable_cost is None else unreachable_cost)
+    return d
+
+
+def csr_gather(graph: CSRGraph, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenated neighbour lists of `rows` as (position in rows, neighbour)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    counts = graph.indptr[rows + 1] - graph.indptr[rows]
+    owner = np.repeat(np.arange(len(rows)), counts)
+    starts = np.repeat(graph.indptr[rows] - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return owner, graph.indices[starts + np.arange(len(owner))]
+
+
+class HopDistanceOracle:
+    """Bounded-radius hop distances on an unweighted `CSRGraph`.
+
+    Answers d in {0, 1, 2} from sorted-neighbour lookups and common-neighbour
+    intersections; anything farther is reported as `cap` (default 3). For
+    adjacent u, v every pair in N[u] x N[v] is within 3 hops, so the blocks ORC
+    needs are exact without an n x n matrix.
+
+    Indexing mirrors a dense distance matrix: `oracle[x, y]` for one pair,
+    `oracle[np.ix_(src, tgt)]` for a block over distinct node arrays.
+    """
+
+    def __init__(self, graph: CSRGraph, cap: int = 3):
+        self.graph = graph
+        self.cap = int(cap)
+        self._pos = np.full(graph.n, -1, dtype=np.int64)
+
+    def __getitem__(self, key) -> int | np.ndarray:
+        x, y = key
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return self.distance(int(x), int(y))
+        return self.block(np.ravel(x), np.ravel(y))
+
+    def distance(self, x: int, y: int) -> int:
+        if x == y:
+            return 0
+        nx_, ny_ = self.graph.neighbors(x), self.graph.neighbors(y)
+        pos = int(np.searchsorted(nx_, y))
+        if pos < len(nx_) and nx_[pos] == y:
+            return 1
+        if len(np.intersect1d(nx_, ny_, assume_unique=True)):
+            return 2
+        return self.cap
+
+    def block(self, src: np.ndarray, tgt: np.ndarray) -> np.ndarray:
+        """int64 distance block over distinct node arrays src x tgt."""
+        src = np.asarray(src, dtype=np.int64)
+        tgt = np.asarray(tgt, dtype=np.int64)
+        d = np.full((len(src), len(tgt)), self.cap, dtype=np.int64)
+        i_s, z_s = csr_gather(self.graph, src)
+        j_t, z_t = csr_gather(self.graph, tgt)
+        pos = self._pos
+        # 2 hops: src/tgt incidence over tgt's neighbours, common-neighbour product.
+        mid, inv = np.unique(z_t, return_inverse=True)
+        pos[mid] = np.arange(len(mid))
+        try:
+            col = pos[z_s]
+            inc_s = np.zeros((len(src), len(mid)), dtype=np.float32)
+            inc_t = np.zeros((len(tgt), len(mid)), dtype=np.float32)
+            inc_s[i_s[col >= 0], col[col >= 0]] = 1.0
+            inc_t[j_t, inv] = 1.0
+        finally:
+            pos[mid] = -1
+        d[(inc_s @ inc_t.T) > 0] = 2
+        pos[tgt] = np.arange(len(tgt))
+        try:
+            hit = pos[z_s]
+            d[i_s[hit >= 0], hit[hit >= 0]] = 1
+            hit = pos[src]
+            d[np.flatnonzero(hit >= 0), hit[hit >= 0]] = 0
+        finally:
+            pos[tgt] = -1
+        return d
+
+
+# ---------------------------------------------------------------- W1 backends
+DENSE_LP_MAX_VARS = 64  # below this, scipy's sparse input handling costs more than it saves
+
+
+@lru_cache(maxsize=512)
+def transport_constraints(n: int, m: int) -> csr_matrix | np.ndarray:
+    """Equality constraints of the n x m transport LP (row sums, then column
+    sums of the row-major plan), cached per support shape.
+
+    Sparse CSR with 2nm nonzeros; tiny problems get the dense template.
+    """
+    flat = np.arange(n * m)
+    rows = np.concatenate([flat // m, n + flat % m])
+    a_eq = csr_matrix(
+        (np.ones(2 * n * m), (rows, np.concatenate([flat, flat]))), shape=(n + m, n * m)
+    )
+    a_eq.sort_indices()
+    return a_eq.toarray() if n * m <= DENSE_LP_MAX_VARS else a_eq
+
+
+def w1_lp_timed(a: np.ndarray, b: np.ndarray, cost: np.ndarray) -> tuple[float, float, float]:
+    """Exact W1 via the transport LP; returns (W1, build seconds, solve seconds)."""
+    t0 = time.perf_counter()
+    a_eq = transport_constraints(len(a), len(b))
+    c = np.asarray(cost, dtype=np.float64).reshape(-1)
+    b_eq = np.concatenate([a, b])
+    t1 = time.perf_counter()
+    res = linprog(c, A_eq=a_eq, b_eq=b_eq, bounds=(0.0, None), method="highs")
+    t2 = time.perf_counter()
+    if not res.success:
+        raise RuntimeError(f"LP failed: {res.message}")
+    return float(res.fun), t1 - t0, t2 - t1
+
+
+def w1_lp(a: np.ndarray, b: np.ndarray, cost: np.ndarray) -> float:
+    """Exact W1 via the transport LP (scipy linprog, HiGHS, sparse constraints)."""
+    return w1_lp_timed(a, b, cost)[0]
+
+
+def w1_emd(a: np.ndarray, b: np.ndarray, cost: np.ndarray) -> float:
+    """Exact W1 via network simplex (POT `ot.emd2`)."""
+    if ot is None:
+        raise ImportError("POT (`pip install pot`) is required for the 'emd' backend.")
+    return float(ot.emd2(a, b, np.ascontiguousarray(cost, dtype=np.float64)))
+
+
+def w1_sinkhorn(
+    a: np.ndarray,
+    b: np.ndarray,
+    cost: np.ndarray,
+    epsilon: float = 0.01,
+    max_iter: int = 1000,
+) -> float:
+    """Entropic W1 (primal transport cost of the log-domain Sinkhorn plan)."""
+    log_a = np.log(np.maximum(a, 1e-300))
+    log_b = np.log(np.maximum(b, 1e-300))
+    logk = -cost / epsilon
+    logu = np.zeros(len(a))
+    logv = np.zeros(len(b))
+    for _ in range(max_iter):
+        logu = log_a - np.logaddexp.reduce(logk + logv[None, :], axis=1)
+        logv = log_b - np.logaddexp.reduce(logk + logu[:, None], axis=0)
+    p = np.exp(logu[:, None] + logk + logv[None, :])
+    return float((p * cost).sum())
+
+
+# ----------------------------------------------------- combinatorial W1 (flow)
+def w1_flow_integer(a: np.ndarray, b: np.ndarray, cost: np.ndarray) -> int:
+    """Exact min-cost transport for integer masses and small integer metric costs.
+
+    Shared mass (cost-0 pairs) stays in place; the remainder is routed by the
+    primal-dual method: each phase computes residual shortest-path distances,
+    then saturates the zero-reduced-cost ("tight") arcs with augmenting paths.
+    Every excess/deficit pair is joined by a direct arc, so the number of
+    phases is bounded by the largest cost (3 for adjacent lazy measures).
+    Returns the optimal total cost sum(f_ij * c_ij) as an exact integer.
+    """
+    a = np.asarray(a, dtype=np.int64).copy()
+    b = np.asarray(b, dtype=np.int64).copy()
+    cost = np.asarray(cost, dtype=np.int64)
+    for i, j in zip(*np.nonzero(cost == 0)):
+        shared = min(a[i], b[j])
+        a[i] -= shared
+        b[j] -= shared
+    src, tgt = np.flatnonzero(a > 0), np.flatnonzero(b > 0)
+    if len(src) == 0:
+        return 0
+    supply, demand = a[src], b[tgt]
+    c = cost[np.ix_(src, tgt)]
+    big = np.iinfo(np.int64).max // 4
+    flow = np.zeros(c.shape, dtype=np.int64)
+    while supply.any():
+        # Bellman-Ford over the bipartite residual graph (forward arcs cost c,
+        # backward arcs -c where flow > 0), vectorized over the dense block.
+        d_src = np.where(supply > 0, 0, big)
+        while True:
+            d_tgt = (d_src[:, None] + c).min(axis=0)
+            back = np.where(flow > 0, d_tgt[None, :] - c, big).min(axis=1)
+            nxt = np.minimum(d_src, back)
+            if np.array_equal(nxt, d_src):
+                break
+            d_src = nxt
+        tight = d_src[:, None] + c == d_tgt[None, :]
+        sink = (demand > 0) & (d_tgt == d_tgt[demand > 0].min())
+        # Direct excess -> deficit arcs first; BFS only for the residual.
+        for i, j in zip(*np.nonzero(tight & (supply > 0)[:, None] & sink[None, :])):
+            push = min(supply[i], demand[j])
+            if push:
+                flow[i, j] += push
+                supply[i] -= push
+                demand[j] -= push
+        sink &= demand > 0
+        while (path := _tight_path(tight, flow, supply, sink)) is not None:
+            push = min(supply[path[0][0]], demand[path[-1][1]])
+            for i, j in path[1::2]:
+                push = min(push, flow[i, j])
+            for k, (i, j) in enumerate(path):
+                flow[i, j] += push if k % 2 == 0 else -push
+            supply[path[0][0]] -= push
+            demand[path[-1][1]] -= push
+            sink &= demand > 0
+    return int((flow * c).sum())
+
+
+def _tight_path(
+    tight: np.ndarray, flow: np.ndarray, supply: np.ndarray, sink: np.ndarray
+) -> list[tuple[int, int]] | None:
+    """BFS for an augmenting path in the tight residual network.
+
+    Returns the alternating arc list [(i0, j0), (i1, j0), (i1, j1), ...]:
+    even positions are forward arcs, odd positions are flow-carrying arcs
+    traversed backwards. None if no excess node reaches an active deficit.
+    """
+    ns, nt = tight.shape
+    via_t = np.full(nt, -1)
+    via_s = np.full(ns, -1)
+    seen_s = supply > 0
+    seen_t = np.zeros(nt, dtype=bool)
+    frontier = np.flatnonzero(seen_s)
+    while len(frontier):
+        arcs = tight[frontier]
+        new_t = arcs.any(axis=0) & ~seen_t
+        if not new_t.any():
+            return None
+        via_t[new_t] = frontier[arcs[:, new_t].argmax(axis=0)]
+        seen_t |= new_t
+        hit = np.flatnonzero(new_t & sink)
+        if len(hit):
+            j = int(hit[0])
+            path = []
+            while True:
+                i = int(via_t[j])
+                path.append((i, j))
+                if via_s[i] < 0:
+                    return path[::-1]
+                j = int(via_s[i])
+                path.append((i, j))
+        cols = np.flatnonzero(new_t)
+        back = tight[:, cols] & (flow[:, cols] > 0)
+        new_s = back.any(axis=1) & ~seen_s
+        via_s[new_s] = cols[back[new_s].argmax(axis=1)]
+        seen_s |= new_s
+        frontier = np.flatnonzero(new_s)
+    return None
+
+
+W1_BACKENDS: dict[str, W1Solver] = {
+    "lp": w1_lp,
+    "emd": w1_emd,
+    "sinkhorn": w1_sinkhorn,
+}
+
+
+FLOW_BACKEND = "flow"
+
+
+def resolve_backend(backend: str | W1Solver) -> W1Solver:
+    if callable(backend):
+        return backend
+    try:
+        return W1_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown W1 backend {backend!r}; expected one of {sorted(W1_BACKENDS)} or a callable."
+        ) from None
+
+
+# --------------------------------------------------------------------- engine
+class CurvatureEngine:
+    """Lazy-walk Ollivier-Ricci curvature on a `CSRGraph`.
+
+    Parameters
+    ----------
+    graph : CSRGraph
+    alpha : float
+        Laziness (mass kept on the node itself).
+    backend : str or callable
+        W1 solver: a key of `W1_BACKENDS`, a callable (a, b, cost) -> float,
+        or "flow" -- the exact combinatorial solver (`w1_flow_integer`) for
+        unweighted graphs with hop-distance cost, where lazy measures are
+        rational and costs are 0/1/2/3.
+    dist : ndarray, optional
+        Metric matrix to use as ground cost. Defaults to a `HopDistanceOracle`
+        for unweighted graphs (no n x n matrix) and to weighted all-pairs
+        shortest paths when `graph.lengths` is set.
+    unreachable_cost : float, optional
+        Cost between disconnected nodes when weighted distances are computed here.
+    """
+
+    def __init__(
+        self,
+        graph: CSRGraph,
+        alpha: float = ALPHA,
+        backend: str | W1Solver = "lp",
+        dist: np.ndarray | None = None,
+        unreachable_cost: float | None = None,
+    ):
+        self.graph = graph
+        self.alpha = float(alpha)
+        self.flow = backend == FLOW_BACKEND
+        if self.flow:
+            if graph.weights is not None or graph.lengths is not None or dist is not None:
+                raise ValueError("The 'flow' backend needs an unweighted graph with hop-distance cost.")
+            self._alpha_frac = Fraction(self.alpha).limit_denominator(1 << 16)
+            self.solver = w1_lp
+        else:
+            self.solver = resolve_backend(backend)
+        self._dist = dist
+        self._unreachable_cost = unreachable_cost
+        self._probs = self._neighbour_probs()
+
+    @property
+    def metric(self) -> np.ndarray | HopDistanceOracle:
+        """Ground-cost lookup supporting `metric[u, v]` and `metric[np.ix_(src, tgt)]`."""
+        if self._dist is None:
+            if self.graph.lengths is None:
+                self._dist = HopDistanceOracle(self.graph)
+            else:
+                self._dist = distance_matrix(self.graph, self._unreachable_cost)
+        return self._dist
+
+    def _neighbour_probs(self) -> np.ndarray:
+        """(1 - alpha) * transition probabilities, aligned with `graph.indices`."""
+        g = self.graph
+        deg = g.degree
+        rows = np.repeat(np.arange(g.n), deg)
+        if g.weights is None:
+            p = 1.0 / deg[rows]
+        else:
+            wsum = np.bincount(rows, weights=g.weights, minlength=g.n)
+            uniform = wsum[rows] <= 0
+            p = np.where(uniform, 1.0 / deg[rows], g.weights / np.where(uniform, 1.0, wsum[rows]))
+        return (1.0 - self.alpha) * p
+
+    def measure(self, node: int) -> tuple[np.ndarray, np.ndarray]:
+        """Support nodes and masses of the lazy measure at `node`."""
+        lo, hi = self.graph.indptr[node], self.graph.indptr[node + 1]
+        support = np.concatenate([[node], self.graph.indices[lo:hi]])
+        mass = np.concatenate([[self.alpha], self._probs[lo:hi]])
+        return support, mass
+
+    def edge_length(self, u: int, v: int) -> float:
+        if self.graph.lengths is not None:
+            return float(self.graph.lengths[self.graph.edge_slot(u, v)])
+        return float(self.metric[u, v])
+
+    def transport_problem(self, u: int, v: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(mu_u, mu_v, cost submatrix) for edge (u, v)."""
+        src, a = self.measure(u)
+        tgt, b = self.measure(v)
+        return a, b, self.metric[np.ix_(src, tgt)]
+
+    def exact_w1(self, u: int, v: int) -> Fraction:
+        """W1 between the lazy measures of u and v as an exact rational.
+
+        Masses are scaled to integers by q * lcm(deg u, deg v) (alpha = p/q);
+        problems whose scale overflows int32 capacities fall back to the LP.
+        """
+        p, q = self._alpha_frac.numerator, self._alpha_frac.denominator
+        du, dv = int(self.graph.degree[u]), int(self.graph.degree[v])
+        scale = q * lcm(du, dv)
+        src, tgt = self.measure(u)[0], self.measure(v)[0]
+        cost = self.metric[np.ix_(src, tgt)]
+        if scale > np.iinfo(np.int32).max:
+            a, b = self.measure(u)[1], self.measure(v)[1]
+            return Fraction(w1_lp(a, b, cost))
+        a = np.full(len(src), (q - p) * scale // (q * du), dtype=np.int64)
+        b = np.full(len(tgt), (q - p) * scale // (q * dv), dtype=np.int64)
+        a[0] = b[0] = p * scale // q
+        return Fraction(w1_flow_integer(a, b, cost.astype(np.int64)), scale)
+
+    def _kappa(self, u: int, v: int) -> float:
+        d_uv = self.edge_length(u, v)
+        if d_uv <= 0:
+            return float("nan")
+        if self.flow:
+            return float(1 - self.exact_w1(u, v) / Fraction(d_uv))
+        a, b, cost = self.transport_problem(u, v)
+        return 1.0 - self.solver(a, b, cost) / d_uv
+
+    def edge_kappa(self, edges: np.ndarray | Iterable[tuple[int, int]] | None = None) -> np.ndarray:
+        """Per-edge curvature as float64 (canonical edge order by default).
+
+        Edges with non-positive length get NaN.
+        """
+        e = self.graph.edges() if edges is None else as_edge_array(edges)
+        return np.array([self._kappa(int(u), int(v)) for u, v in e], dtype=np.float64)
+
+    def lp_profile(self, edges: np.ndarray | Iterable[tuple[int, int]] | None = None) -> dict[str, np.ndarray]:
+        """Per-edge LP support shape and constraint-build vs HiGHS-solve seconds."""
+        e = self.graph.edges() if edges is None else as_edge_array(edges)
+        out = np.empty((len(e), 4))
+        for k, (u, v) in enumerate(e):
+            a, b, cost = self.transport_problem(int(u), int(v))
+            _, build_s, solve_s = w1_lp_timed(a, b, cost)
+            out[k] = (len(a), len(b), build_s, solve_s)
+        return {
+            "edges": e,
+            "support_src": out[:, 0].astype(np.int32),
+            "support_tgt": out[:, 1].astype(np.int32),
+            "build_s": out[:, 2],
+            "solve_s": out[:, 3],
+        }
+
+    def mean_kappa(self) -> float:
+        kappas = self.edge_kappa()
+        return float(np.nanmean(kappas)) if np.isfinite(kappas).any() else float("nan")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Parity gate for the combinatorial W1 fast path (orc_engine backend "flow").
+
+For every SWOW R1/LCC network, per-edge kappa from the exact rational flow
+solver must agree with
+
+  - the HiGHS transport LP on the same CSR graph:       |diff| < LP_TOL
+  - the canonical Julia artifact results/unified/{id}_exact_lp.json
+    (per_edge_curvatures, stored to 6 decimals):        |diff| < REF_TOL
+
+and the gate reports wall time for both solvers.
+
+Usage:
+  python3 orc_flow_parity.py
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from orc_engine import CSRGraph, CurvatureEngine  # noqa: E402
+from structural_nulls_r1lcc import ALPHA, DATA_DIR, NETWORKS, REF_DIR, load_lcc  # noqa: E402
+
+OUT = REF_DIR / "orc_flow_parity.json"
+LP_TOL = 1e-12
+REF_TOL = 1e-6
+
+
+def check_network(net_id, filename):
+    adj, _, _ = load_lcc(DATA_DIR / filename)
+    graph = CSRGraph.from_adjacency(adj)
+    ref = np.asarray(json.loads((REF_DIR / f"{net_id}_exact_lp.json").read_text())
+                     ["per_edge_curvatures"], dtype=float)
+
+    t0 = time.time()
+    k_lp = CurvatureEngine(graph, alpha=ALPHA, backend="lp").edge_kappa()
+    t_lp = time.time() - t0
+    t0 = time.time()
+    k_flow = CurvatureEngine(graph, alpha=ALPHA, backend="flow").edge_kappa()
+    t_flow = time.time() - t0
+
+    diff_lp = float(np.max(np.abs(k_flow - k_lp)))
+    diff_ref = float(np.max(np.abs(k_flow - ref)))
+    row = {
+        "network_id": net_id,
+        "N": graph.n, "E": graph.n_edges,
+        "max_abs_diff_vs_lp": diff_lp,
+        "n_bit_identical_vs_lp": int(np.sum(k_flow == k_lp)),
+        "max_abs_diff_vs_ref": diff_ref,
+        "kappa_mean_flow": float(k_flow.mean()),
+        "t_lp_s": round(t_lp, 3), "t_flow_s": round(t_flow, 3),
+        "pass": diff_lp < LP_TOL and diff_ref < REF_TOL,
+    }
+    print(f"[{net_id}] E={row['E']} |flow-lp|={diff_lp:.2e} |flow-ref|={diff_ref:.2e} "
+          f"lp={t_lp:.2f}s flow={t_flow:.2f}s {'PASS' if row['pass'] else 'FAIL'}",
+          flush=True)
+    return row
+
+
+def main():
+    rows = [check_network(net_id, filename) for net_id, filename in NETWORKS]
+    out = {
+        "generator": "code/analysis/orc_flow_parity.py",
+        "alpha": ALPHA, "lp_tol": LP_TOL, "ref_tol": REF_TOL,
+        "all_pass": all(r["pass"] for r in rows),
+        "networks": rows,
+    }
+    OUT.write_text(json.dumps(out, indent=2) + "\n")
+    print(f"-> {OUT}")
+    return 0 if out["all_pass"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Edge-parallel Ollivier-Ricci curvature over a shared-memory CSR graph.
+
+The CSR arrays of an `orc_engine.CSRGraph` (plus any dense metric matrix)
+are placed once in `multiprocessing.shared_memory`; pool workers attach to
+them by name and build their own `CurvatureEngine` (hop-distance oracles are
+derived from the shared CSR, so they cost nothing extra to share).
+
+Scheduling: edges are sorted by LP support size, (deg u + 1) * (deg v + 1),
+largest first, and cut into small chunks handed out dynamically, so hub
+edges start early and no worker is left holding a long tail.
+
+Determinism: each kappa depends only on its own edge, and results are
+written back by edge position, so the returned float64 array is identical
+for any worker count (including the serial path, workers=1).
+
+Caching: with `cache` (a `curvature_cache.CurvatureCache`), results for a
+named backend are looked up by graph content first and stored after solving.
+
+Usage:
+  kappas = parallel_edge_kappa(graph, backend="flow", workers=8)
+  kappas = parallel_edge_kappa(graph, backend="flow", cache=default_cache())
+"""
+
+from __future__ import annotations
+
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable
+
+import numpy as np
+
+from curvature_cache import CurvatureCache, cached_edge_kappa, graph_edge_data
+from orc_engine import ALPHA, SOLVER_VERSION, CSRGraph, CurvatureEngine, W1Solver, as_edge_array
+
+CHUNKS_PER_WORKER = 16
+
+
+class SharedArrays:
+    """Copy named NumPy arrays into shared memory; unlinked on close()."""
+
+    def __init__(self, arrays: dict[str, np.ndarray | None]):
+        self._blocks: list[SharedMemory] = []
+        self.spec: dict[str, tuple[str, tuple[int, ...], str] | None] = {}
+        for key, arr in arrays.items():
+            if arr is None:
+                self.spec[key] = None
+                continue
+            arr = np.ascontiguousarray(arr)
+            shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._blocks.append(shm)
+            self.spec[key] = (shm.name, arr.shape, arr.dtype.str)
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach from a pool worker. Workers share the parent's resource tracker,
+    so the segment stays registered exactly once and the parent's unlink in
+    `SharedArrays.close` is the only cleanup."""
+    try:
+        return SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+_ENGINE: CurvatureEngine | None = None
+_ATTACHED: list[SharedMemory] = []
+
+
+def _init_worker(spec, alpha, backend, unreachable_cost) -> None:
+    global _ENGINE
+    views = {}
+    for key, entry in spec.items():
+        if entry is None:
+            views[key] = None
+            continue
+        name, shape, dtype = entry
+        shm = _attach(name)
+        _ATTACHED.append(shm)
+        views[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    graph = CSRGraph(views["indptr"], views["indices"], views["weights"], views["lengths"])
+    _ENGINE = CurvatureEngine(
+        graph, alpha=alpha, backend=backend, dist=views["dist"], unreachable_cost=unreachable_cost
+    )
+
+
+def _chunk_kappa(task: tuple[np.ndarray, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    positions, edges = task
+    return positions, _ENGINE.edge_kappa(edges)
+
+
+def support_cost(graph: CSRGraph, edges: np.ndarray) -> np.ndarray:
+    """Per-edge transport problem size (deg u + 1) * (deg v + 1)."""
+    deg = graph.degree.astype(np.int64) + 1
+    return deg[edges[:, 0]] * deg[edges[:, 1]]
+
+
+def parallel_edge_kappa(
+    graph: CSRGraph,
+    edges: np.ndarray | Iterable[tuple[int, int]] | None = None,
+    alpha: float = ALPHA,
+    backend: str | W1Solver = "lp",
+    workers: int = 1,
+    dist: np.ndarray | None = None,
+    unreachable_cost: float | None = None,
+    chunk_size: int | None = None,
+    cache: CurvatureCache | None = None,
+) -> np.ndarray:
+    """Per-edge kappa (float64, in `edges` order; canonical order by default).
+
+    `backend` must be picklable (a backend name or a module-level function).
+    `cache` is consulted only for named backends without a custom `dist`.
+    """
+    e = graph.edges() if edges is None else as_edge_array(edges)
+    if cache is not None and isinstance(backend, str) and dist is None:
+        g_edges, weights, lengths = graph_edge_data(graph)
+        method = backend if unreachable_cost is None else f"{backend};unreachable={unreachable_cost}"
+        return cached_edge_kappa(
+            cache,
+            lambda: parallel_edge_kappa(
+                graph, e, alpha, backend, workers, unreachable_cost=unreachable_cost,
+                chunk_size=chunk_size,
+            ),
+            g_edges, alpha=alpha, method=method, version=SOLVER_VERSION,
+            weights=weights, lengths=lengths, query=None if edges is None else e,
+        )
+    if workers <= 1 or len(e) == 0:
+        engine = CurvatureEngine(
+            graph, alpha=alpha, backend=backend, dist=dist, unreachable_cost=unreachable_cost
+        )
+        return engine.edge_kappa(e)
+
+    order = np.argsort(-support_cost(graph, e), kind="stable")
+    if chunk_size is None:
+        chunk_size = max(1, len(e) // (workers * CHUNKS_PER_WORKER))
+    tasks = [(pos, e[pos]) for pos in np.array_split(order, max(1, len(e) // chunk_size))]
+
+    out = np.empty(len(e), dtype=np.float64)
+    arrays = {
+        "indptr": graph.indptr, "indices": graph.indices,
+        "weights": graph.weights, "lengths": graph.lengths, "dist": dist,
+    }
+    with SharedArrays(arrays) as shared:
+        ctx = get_context()
+        with ctx.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(shared.spec, alpha, backend, unreachable_cost),
+        ) as pool:
+            for positions, kappas in pool.imap_unordered(_chunk_kappa, tasks):
+                out[positions] = kappas
+    return out
+
+
+def parallel_mean_kappa(graph: CSRGraph, **kwargs) -> float:
+    kappas = parallel_edge_kappa(graph, **kwargs)
+    return float(np.nanmean(kappas)) if np.isfinite(kappas).any() else float("nan")
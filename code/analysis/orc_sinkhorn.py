@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batched log-domain Sinkhorn ORC: every edge of a graph in a few tensor sweeps.
+
+Each edge's transport problem (lazy measures on N[u], N[v] and their cost
+block) is zero-padded to a square P x P, with P rounded up to a multiple of
+BUCKET, and edges with the same P are stacked into (B, P, P) tensors. Padded
+entries carry zero mass (log-mass -inf) and so never enter a log-sum-exp.
+
+The solver is log-stabilized Sinkhorn (Schmitzer's absorption): the plan is
+
+    P_ij = u_i * exp((f_i + g_j - C_ij) / eps) * v_j
+
+with log-domain dual potentials f, g held in the kernel and scaling vectors
+u, v updated by batched mat-vecs (u = a / K v, v = b / K^T u). Whenever u or
+v grows past ABSORB_AT it is folded into f, g (f += eps log u) and the kernel
+is rebuilt, so nothing over- or underflows even at small epsilon while the
+inner loop stays exp-free. With `scaling`, epsilon is annealed geometrically
+from the largest cost down to the target, one sweep and one absorption per
+step, warm-starting the potentials. Fixed-epsilon sweeps are over-relaxed
+(u <- u^(1-w) (a / K v)^w, w = `relax`), which cuts iteration counts several
+fold on these small, tie-heavy cost matrices. Every `check_every` iterations,
+edges whose marginal L1 error is below `tol` are retired and the batch
+compacted, so a bucket costs only as much as its slowest edges. W1 is the
+primal cost of the final plan, as in `orc_engine.w1_sinkhorn`;
+`scaling=None, relax=1, tol=0` runs exactly that fixed-iteration solver.
+
+Usage:
+  engine = CurvatureEngine(graph)
+  kappa = sinkhorn_edge_kappa(engine, epsilon=0.01)
+  report = sinkhorn_lp_bias(engine, epsilon=0.01)
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from orc_engine import CurvatureEngine, as_edge_array
+
+BUCKET = 8
+MAX_BATCH_ENTRIES = 1 << 23  # B * P * P doubles per tensor (~64 MB)
+CHECK_EVERY = 10
+ABSORB_AT = 1e30  # fold scalings into the potentials once they exceed this
+_TINY = 1e-300
+RELAX = 1.8  # over-relaxation weight of the fixed-epsilon sweeps (1 = plain Sinkhorn)
+
+
+def sinkhorn_log_batched(
+    a: np.ndarray,
+    b: np.ndarray,
+    cost: np.ndarray,
+    epsilon: float = 0.01,
+    max_iter: int = 1000,
+    tol: float = 1e-6,
+    scaling: float | None = 0.7,
+    relax: float = RELAX,
+    check_every: int = CHECK_EVERY,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Entropic W1 of a batch of padded problems.
+
+    a, b: (B, P) masses (zero on padding); cost: (B, P, P).
+    Returns (w1, iterations), both of shape (B,). `max_iter` counts
+    fixed-epsilon iterations only.
+    """
+    n_batch = len(a)
+    # -inf potentials on padding zero the kernel there
+    f = np.where(a > 0, 0.0, -np.inf)
+    g = np.where(b > 0, 0.0, -np.inf)
+    w1 = np.full(n_batch, np.nan)
+    iters = np.zeros(n_batch, dtype=np.int64)
+    if not n_batch:
+        return w1, iters
+
+    def kernel(eps, f, g, cost):
+        return np.exp((f[:, :, None] + g[:, None, :] - cost) / eps)
+
+    def absorb(eps, f, g, u, v):
+        return (f + eps * np.log(np.maximum(u, _TINY)),
+                g + eps * np.log(np.maximum(v, _TINY)))
+
+    def relaxed(old, new, mass, w):
+        if np.isscalar(w) and w == 1.0:
+            return new
+        with np.errstate(divide="ignore", invalid="ignore"):  # 0 ** (1 - w) on padding
+            return np.where(mass > 0, old ** (1 - w) * new ** w, 0.0)
+
+    def sweep(k, u, v, a, b, w=1.0):
+        u = relaxed(u, a / np.maximum(np.matmul(k, v[:, :, None])[:, :, 0], _TINY), a, w)
+        v = relaxed(v, b / np.maximum(np.matmul(u[:, None, :], k)[:, 0, :], _TINY), b, w)
+        return u, v
+
+    u = np.ones_like(a)
+    v = np.ones_like(b)
+    if scaling is not None:
+        eps = float(cost.max())
+        while eps > epsilon:
+            u, v = sweep(kernel(eps, f, g, cost), u, v, a, b)
+            f, g = absorb(eps, f, g, u, v)
+            u, v = np.ones_like(a), np.ones_like(b)
+            eps *= scaling
+
+    active = np.arange(n_batch)
+    # per-edge relaxation weight; an edge whose error blows up falls back to w = 1
+    w = np.full((n_batch, 1), float(relax))
+    best_err = np.full(n_batch, np.inf)
+    k = kernel(epsilon, f, g, cost)
+    for it in range(1, max_iter + 1):
+        u, v = sweep(k, u, v, a, b, w)
+        if max(u.max(), v.max()) > ABSORB_AT:
+            f, g = absorb(epsilon, f, g, u, v)
+            u, v = np.ones_like(a), np.ones_like(b)
+            k = kernel(epsilon, f, g, cost)
+        if (tol > 0 or relax != 1.0) and it % check_every == 0:
+            err = (np.abs(u * np.matmul(k, v[:, :, None])[:, :, 0] - a).sum(axis=1)
+                   + np.abs(v * np.matmul(u[:, None, :], k)[:, 0, :] - b).sum(axis=1))
+            w[~(err <= 10.0 * best_err)] = 1.0
+            best_err = np.minimum(best_err, err)
+            done = err < tol
+            if done.any():
+                p = u[done, :, None] * k[done] * v[done, None, :]
+                w1[active[done]] = (p * cost[done]).sum(axis=(1, 2))
+                iters[active[done]] = it
+                keep = ~done
+                if not keep.any():
+                    return w1, iters
+                active, f, g, u, v = active[keep], f[keep], g[keep], u[keep], v[keep]
+                w, best_err = w[keep], best_err[keep]
+                a, b, cost, k = a[keep], b[keep], cost[keep], k[keep]
+    p = u[:, :, None] * k * v[:, None, :]
+    w1[active] = (p * cost).sum(axis=(1, 2))
+    iters[active] = max_iter
+    return w1, iters
+
+
+def bucket_size(support: int, bucket: int = BUCKET) -> int:
+    return -(-support // bucket) * bucket
+
+
+def sinkhorn_edge_w1(
+    engine: CurvatureEngine,
+    edges: np.ndarray | Iterable[tuple[int, int]] | None = None,
+    epsilon: float = 0.01,
+    max_iter: int = 1000,
+    tol: float = 1e-6,
+    scaling: float | None = 0.7,
+    relax: float = RELAX,
+    bucket: int = BUCKET,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Batched Sinkhorn W1 (and iteration counts) for `edges` (canonical default)."""
+    e = engine.graph.edges() if edges is None else as_edge_array(edges)
+    deg = engine.graph.degree
+    pad = np.array([bucket_size(k, bucket) for k in np.maximum(deg[e[:, 0]], deg[e[:, 1]]) + 1],
+                   dtype=np.int64)
+    w1 = np.full(len(e), np.nan)
+    iters = np.zeros(len(e), dtype=np.int64)
+    for size in np.unique(pad):
+        members = np.flatnonzero(pad == size)
+        per_batch = max(1, MAX_BATCH_ENTRIES // (size * size))
+        for start in range(0, len(members), per_batch):
+            idx = members[start:start + per_batch]
+            a = np.zeros((len(idx), size))
+            b = np.zeros((len(idx), size))
+            cost = np.zeros((len(idx), size, size))
+            for row, k in enumerate(idx):
+                ak, bk, ck = engine.transport_problem(int(e[k, 0]), int(e[k, 1]))
+                a[row, :len(ak)] = ak
+                b[row, :len(bk)] = bk
+                cost[row, :len(ak), :len(bk)] = ck
+            w1[idx], iters[idx] = sinkhorn_log_batched(
+                a, b, cost, epsilon, max_iter, tol, scaling, relax
+            )
+    return w1, iters
+
+
+def sinkhorn_edge_kappa(
+    engine: CurvatureEngine,
+    edges: np.ndarray | Iterable[tuple[int, int]] | None = None,
+    **kwargs,
+) -> np.ndarray:
+    """Per-edge Sinkhorn kappa = 1 - W1_eps / d(u, v); NaN where d <= 0."""
+    e = engine.graph.edges() if edges is None else as_edge_array(edges)
+    w1, _ = sinkhorn_edge_w1(engine, e, **kwargs)
+    d = np.array([engine.edge_length(int(u), int(v)) for u, v in e], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(d > 0, 1.0 - w1 / d, np.nan)
+
+
+def sinkhorn_lp_bias(
+    engine: CurvatureEngine,
+    edges: np.ndarray | Iterable[tuple[int, int]] | None = None,
+    exact: CurvatureEngine | None = None,
+    k_sink: np.ndarray | None = None,
+    **kwargs,
+) -> dict:
+    """Sinkhorn-vs-exact kappa bias over a network.
+
+    `exact` supplies the reference kappas (default: `engine` itself, which
+    should then use an exact backend such as "lp" or "flow"); `k_sink`
+    reuses already computed Sinkhorn kappas for `edges`.
+    """
+    e = engine.graph.edges() if edges is None else as_edge_array(edges)
+    if k_sink is None:
+        k_sink = sinkhorn_edge_kappa(engine, e, **kwargs)
+    k_exact = (exact or engine).edge_kappa(e)
+    bias = k_sink - k_exact
+    return {
+        "E": int(len(e)),
+        "epsilon": kwargs.get("epsilon", 0.01),
+        "kappa_mean_sinkhorn": float(np.nanmean(k_sink)),
+        "kappa_mean_exact": float(np.nanmean(k_exact)),
+        "bias_mean": float(np.nanmean(bias)),
+        "bias_max_abs": float(np.nanmax(np.abs(bias))),
+        "frac_edges_abs_bias_gt_1e-3": float(np.mean(np.abs(bias) > 1e-3)),
+    }
@@ -12,16 +12,20 @@ Date: 2025-11-05
 import argparse
 import json
 import logging
+import sys
 from pathlib import Path
 
 import networkx as nx
 import numpy as np
 import pandas as pd
 from scipy import stats
-from GraphRicciCurvature.OllivierRicci import OllivierRicci
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 
+sys.path.insert(0, str(Path(__file__).parent))
+from curvature_cache import default_cache, graphricci_edge_kappa
+from graph_loader import load_edge_table
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -43,8 +47,8 @@ def compute_edge_metrics(G: nx.Graph, alpha: float = 0.5) -> pd.DataFrame:
         DataFrame with edge-level metrics
     """
     logger.info("Computing Ollivier-Ricci curvature...")
-    orc = OllivierRicci(G, alpha=alpha, weight='weight', verbose='INFO')
-    orc.compute_ricci_curvature()
+    kappas = graphricci_edge_kappa(G, alpha=alpha, weight='weight', cache=default_cache(),
+                                   verbose='INFO')
     
     logger.info("Computing edge metrics...")
     
@@ -55,7 +59,9 @@ def compute_edge_metrics(G: nx.Graph, alpha: float = 0.5) -> pd.DataFrame:
     # Collect metrics per edge
     edge_data = []
     
-    for u, v, data in orc.G.edges(data=True):
+    # graphricci_edge_kappa leaves self-loops out, so iterate the same edges
+    edges = [(u, v, data) for u, v, data in G.edges(data=True) if u != v]
+    for (u, v, data), kappa in zip(edges, kappas, strict=True):
         # Triangle count
         n_triangles = count_edge_triangles(G, u, v)
         
@@ -65,9 +71,6 @@ def compute_edge_metrics(G: nx.Graph, alpha: float = 0.5) -> pd.DataFrame:
         deg_min = min(deg_u, deg_v)
         deg_max = max(deg_u, deg_v)
         
-        # Curvature
-        kappa = data.get('ricciCurvature', 0.0)
-        
         # Betweenness
         betw = edge_betweenness.get((u, v), edge_betweenness.get((v, u), 0.0))
         
@@ -232,18 +235,8 @@ def main():
     logger.info("Loading network...")
     df_edges = pd.read_csv(args.edge_file)
     
-    G_dir = nx.DiGraph()
-    for _, row in df_edges.iterrows():
-        G_dir.add_edge(row['source'], row['target'], weight=row['weight'])
-    
-    # Convert to undirected
-    G = G_dir.to_undirected()
-    
-    # Keep LCC
-    if not nx.is_connected(G):
-        components = list(nx.connected_components(G))
-        largest_cc = max(components, key=len)
-        G = G.subgraph(largest_cc).copy()
+    # Directed edges collapsed to undirected, largest component only
+    G = load_edge_table(df_edges, combine="digraph", self_loops=True, largest_component=True).to_networkx()
     
     logger.info(f"Network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
     logger.info("")
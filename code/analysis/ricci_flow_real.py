@@ -11,6 +11,7 @@ Date: 2025-11-05
 import argparse
 import json
 import logging
+import sys
 import time
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -20,6 +21,9 @@ import numpy as np
 import pandas as pd
 from GraphRicciCurvature.OllivierRicci import OllivierRicci
 
+sys.path.insert(0, str(Path(__file__).parent))
+from curvature_cache import default_cache, graphricci_edge_kappa
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -92,10 +96,8 @@ def compute_initial_metrics(G: nx.Graph) -> Dict:
     
     # Ollivier-Ricci curvature (network-level average)
     try:
-        orc = OllivierRicci(G, alpha=0.5, weight='weight', verbose='INFO')
-        orc.compute_ricci_curvature()
-        
-        curvatures = [d['ricciCurvature'] for u, v, d in orc.G.edges(data=True)]
+        curvatures = graphricci_edge_kappa(G, alpha=0.5, weight='weight',
+                                           cache=default_cache(), verbose='INFO')
         kappa = np.mean(curvatures)
         kappa_std = np.std(curvatures)
         
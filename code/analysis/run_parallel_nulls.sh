@@ -1,6 +1,8 @@
 #!/bin/bash
 # Run Structural Null Analysis in Parallel (8 processes)
 # 4 languages × 2 null types = 8 parallel jobs
+# Each job logs finished replicates under results/structural_nulls/replicate_logs;
+# re-running this script resumes every job from its log.
 
 set -e
 
@@ -58,6 +60,7 @@ for job in "${JOBS[@]}"; do
         --M 1000 \
         --alpha 0.5 \
         --seed "${seed}" \
+        --log-dir "${OUTPUT_DIR}/replicate_logs/${lang}_${null_type}" \
         > "${log_file}" 2>&1 &
     
     PIDS+=($!)
@@ -16,6 +16,12 @@ Usage:
     import networkx as nx
     G = nx.random_regular_graph(4, 100)
     feats = sedenion_features(G)   # shape (16,)
+
+Products use the precomputed 16x16 Cayley-Dickson table in `hypercomplex`
+(one gather + multiply + reduce per product), and orbits run for a whole
+batch of graphs at once with per-row escape masks. The spectral part of the
+encoding needs only the 8 smallest normalised-Laplacian eigenvalues, which
+come from the cached, batched `spectrum` service.
 """
 
 from __future__ import annotations
@@ -25,6 +31,12 @@ from dataclasses import dataclass
 from typing import Optional
 import networkx as nx
 
+from hypercomplex import cayley_dickson, norm_sq
+from spectrum import default_spectrum_service
+
+# Laplacian eigenvalues read by the encoding (components 0-7 of c)
+N_SPECTRAL = 8
+
 
 # =============================================================================
 # Cayley-Dickson sedenion algebra
@@ -40,21 +52,17 @@ def _cd_conj(a: np.ndarray) -> np.ndarray:
 
 def _cd_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     """
-    Recursive Cayley-Dickson multiplication.
+    Cayley-Dickson multiplication over the last axis (broadcast over leading axes).
     For n-dim algebras built as pairs of (n/2)-dim algebras:
       (a1, a2) * (b1, b2) = (a1*b1 - conj(b2)*a2, b2*a1 + a2*conj(b1))
-    Base case: n=1 is real multiplication.
+    evaluated through the algebra's precomputed n x n basis table.
     """
-    n = len(a)
-    assert n == len(b)
-    if n == 1:
-        return a * b
-    h = n // 2
-    a1, a2 = a[:h], a[h:]
-    b1, b2 = b[:h], b[h:]
-    r1 = _cd_mul(a1, b1) - _cd_mul(_cd_conj(b2), a2)
-    r2 = _cd_mul(b2, a1) + _cd_mul(a2, _cd_conj(b1))
-    return np.concatenate([r1, r2])
+    n = np.shape(a)[-1]
+    assert n == np.shape(b)[-1]
+    return cayley_dickson(n).mul(a, b)
+
+
+SEDENION = cayley_dickson(16)
 
 
 class Sedenion:
@@ -82,7 +90,7 @@ class Sedenion:
     def __mul__(self, other) -> "Sedenion":
         if isinstance(other, (int, float, np.floating)):
             return Sedenion(self.c * float(other))
-        return Sedenion(_cd_mul(self.c, other.c))
+        return Sedenion(SEDENION.mul(self.c, other.c))
 
     def __rmul__(self, scalar) -> "Sedenion":
         return Sedenion(self.c * float(scalar))
@@ -147,7 +155,7 @@ class Sedenion:
 # Graph → sedenion encoding
 # =============================================================================
 
-def graph_to_sedenion(G: nx.Graph) -> tuple[Sedenion, Sedenion]:
+def graph_to_sedenion(G: nx.Graph, eigvals: Optional[np.ndarray] = None) -> tuple[Sedenion, Sedenion]:
     """
     Encode graph G into sedenion pair (c, z₀) ∈ 𝕊².
 
@@ -158,22 +166,61 @@ def graph_to_sedenion(G: nx.Graph) -> tuple[Sedenion, Sedenion]:
     z₀ (orbit seed): derived from degree sequence statistics
        Components 0-7: degree distribution moments (normalised)
        Components 8-15: centraliy stats
+
+    `eigvals` may carry precomputed normalised-Laplacian eigenvalues
+    (ascending, at least the N_SPECTRAL smallest); otherwise they are computed.
     """
     n = G.number_of_nodes()
     m = G.number_of_edges()
     if n < 2:
         return Sedenion.zero(), Sedenion.basis(0)
 
-    # Structural stats (robust to disconnected graphs)
     degrees = np.array([d for _, d in G.degree()], dtype=float)
-    mean_deg = float(np.mean(degrees)) if n > 0 else 0.0
-    std_deg  = float(np.std(degrees))  if n > 0 else 0.0
-    density  = 2.0 * m / max(n * (n - 1), 1)
-    eta      = mean_deg**2 / max(n, 1)
     try:
         clustering = nx.average_clustering(G)
     except Exception:
         clustering = 0.0
+    if eigvals is None:
+        eigvals = normalized_laplacian_spectrum(G)
+    return sedenion_encoding(n, m, degrees, clustering, eigvals)
+
+
+def normalized_laplacian_spectrum(G: nx.Graph, k: int = N_SPECTRAL) -> Optional[np.ndarray]:
+    """The k smallest normalised-Laplacian eigenvalues, ascending (None if they cannot be computed)."""
+    try:
+        return default_spectrum_service().smallest(G, k)
+    except Exception:
+        return None
+
+
+def normalized_laplacian_spectra(graphs: list[nx.Graph], k: int = N_SPECTRAL) -> list[Optional[np.ndarray]]:
+    """`normalized_laplacian_spectrum` for many graphs; equal-size graphs share one eigvalsh call."""
+    try:
+        return default_spectrum_service().smallest_batch(graphs, k)
+    except Exception:
+        return [normalized_laplacian_spectrum(G, k) for G in graphs]
+
+
+def sedenion_encoding(
+    n:          int,
+    m:          int,
+    degrees:    np.ndarray,
+    clustering: float,
+    eigvals:    Optional[np.ndarray],
+) -> tuple[Sedenion, Sedenion]:
+    """
+    (c, z₀) from precomputed graph statistics: degree sequence (node order),
+    average clustering and normalised-Laplacian spectrum (see `graph_to_sedenion`).
+    """
+    if n < 2:
+        return Sedenion.zero(), Sedenion.basis(0)
+
+    # Structural stats (robust to disconnected graphs)
+    degrees = np.asarray(degrees, dtype=float)
+    mean_deg = float(np.mean(degrees)) if n > 0 else 0.0
+    std_deg  = float(np.std(degrees))  if n > 0 else 0.0
+    density  = 2.0 * m / max(n * (n - 1), 1)
+    eta      = mean_deg**2 / max(n, 1)
 
     # Degree distribution moments
     max_deg = float(np.max(degrees)) if n > 0 else 1.0
@@ -181,14 +228,11 @@ def graph_to_sedenion(G: nx.Graph) -> tuple[Sedenion, Sedenion]:
     skewness = float(np.mean(((degrees - mean_deg) / max(std_deg, 1e-9))**3))
     kurtosis = float(np.mean(((degrees - mean_deg) / max(std_deg, 1e-9))**4)) - 3.0
 
-    # Laplacian spectrum (first 8 eigenvalues)
-    try:
-        L = nx.normalized_laplacian_matrix(G).toarray()
-        eigvals = np.sort(np.linalg.eigvalsh(L))
-        # Use first 8 eigenvalues (already in [0, 2])
-        spec8 = eigvals[:8] if len(eigvals) >= 8 else np.pad(eigvals, (0, 8 - len(eigvals)))
-    except Exception:
+    # Laplacian spectrum (first 8 eigenvalues, already in [0, 2])
+    if eigvals is None:
         spec8 = np.zeros(8)
+    else:
+        spec8 = eigvals[:8] if len(eigvals) >= 8 else np.pad(eigvals, (0, 8 - len(eigvals)))
 
     # Build c ∈ 𝕊: spectral (0-7) + structural (8-15)
     c_vec = np.zeros(16)
@@ -239,46 +283,55 @@ class OrbitResult:
     hessian_asym:     float        # max |H - Hᵀ| (should be ≈ 0, Theorem 4.6)
 
 
-def mandelbrot_orbit(
-    c:         Sedenion,
-    z0:        Sedenion,
-    max_iter:  int   = 100,
-    threshold: float = 1e3,
-) -> OrbitResult:
+def _iterate_orbits(
+    c:         np.ndarray,
+    z0:        np.ndarray,
+    max_iter:  int,
+    threshold: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Run sedenion Mandelbrot iteration:  zₙ₊₁ = zₙ * zₙ + c
-
-    Parameters
-    ----------
-    c         : Mandelbrot parameter ∈ 𝕊
-    z0        : Initial seed ∈ 𝕊
-    max_iter  : Maximum iterations
-    threshold : Escape radius (‖z‖ > threshold → escaped)
+    Iterate zₙ₊₁ = zₙ * zₙ + c for a batch of rows c, z0 of shape (n, 16).
 
-    Returns
-    -------
-    OrbitResult with 8 scalar features + z_final + norms sequence
+    Returns (norms (n, max_iter), escape_time (n,), z_final (n, 16)).
+    A row escapes at the first t with ‖zₜ‖ > threshold and is frozen from
+    then on, so its norm repeats for the remaining steps.
     """
-    z = z0
-    norms = np.empty(max_iter)
-    escape_time = max_iter
+    c = np.atleast_2d(np.asarray(c, dtype=float))
+    z = np.atleast_2d(np.array(z0, dtype=float, copy=True))
+    n = len(z)
+    norms = np.empty((n, max_iter))
+    escape_time = np.full(n, max_iter, dtype=int)
+    active = np.ones(n, dtype=bool)
 
     for t in range(max_iter):
-        n = z.norm()
-        norms[t] = n
-        if n > threshold:
-            escape_time = t
-            norms[t+1:] = n  # fill rest with escape value
+        norms[:, t] = np.sqrt(norm_sq(z))
+        escaped = active & (norms[:, t] > threshold)
+        escape_time[escaped] = t
+        active &= ~escaped
+        if not active.any():
+            norms[:, t + 1:] = norms[:, t:t + 1]  # fill rest with escape value
             break
-        z = z * z + c
-    else:
-        # Did not escape — record final z
-        pass
+        rows = np.flatnonzero(active)
+        z[rows] = SEDENION.square(z[rows]) + c[rows]
+
+    return norms, escape_time, z
+
 
-    norm_seq = norms[:max_iter]
+def _summarize_orbit(
+    c:           Sedenion,
+    z0:          Sedenion,
+    norm_seq:    np.ndarray,
+    escape_time: int,
+    z_final:     np.ndarray,
+    max_iter:    int,
+    threshold:   float,
+    hessian_asym: float,
+) -> OrbitResult:
+    """Scalar orbit statistics for one row of `_iterate_orbits`."""
+    z = Sedenion(z_final)
     valid = norm_seq[norm_seq < threshold * 10]
 
-    norm_mean = float(np.mean(valid)) if len(valid) > 0 else float(norms[-1])
+    norm_mean = float(np.mean(valid)) if len(valid) > 0 else float(norm_seq[-1])
     norm_std  = float(np.std(valid))  if len(valid) > 0 else 0.0
     norm_max  = float(np.max(norm_seq))
 
@@ -292,13 +345,9 @@ def mandelbrot_orbit(
     diffs = np.diff(norm_seq)
     sign_changes = int(np.sum(diffs[:-1] * diffs[1:] < 0))
 
-    # Hessian symmetry check (Theorem 4.6): ∂²‖z_final‖²/∂cᵢ∂cⱼ
-    # Uses finite differences on a small 2D slice (components 0,1 of c)
-    hessian_asym = _hessian_asymmetry(c, z0, max_iter, threshold)
-
     return OrbitResult(
-        escape_time   = escape_time,
-        norm_final    = float(norms[min(escape_time, max_iter - 1)]),
+        escape_time   = int(escape_time),
+        norm_final    = float(norm_seq[min(escape_time, max_iter - 1)]),
         norm_mean     = norm_mean,
         norm_std      = norm_std,
         norm_max      = norm_max,
@@ -311,16 +360,163 @@ def mandelbrot_orbit(
     )
 
 
-def _orbit_norm_sq(c_vec: np.ndarray, z0_vec: np.ndarray, max_iter: int, threshold: float) -> float:
-    """Helper: run orbit and return ‖z_final‖² for Hessian finite differences."""
-    c  = Sedenion(c_vec)
-    z0 = Sedenion(z0_vec)
-    z  = z0
+def mandelbrot_orbits(
+    cs:        list[Sedenion],
+    z0s:       list[Sedenion],
+    max_iter:  int   = 100,
+    threshold: float = 1e3,
+) -> list[OrbitResult]:
+    """Run `mandelbrot_orbit` for many (c, z₀) pairs in one batched iteration."""
+    if not cs:
+        return []
+    c_vecs = np.stack([c.c for c in cs])
+    z0_vecs = np.stack([z0.c for z0 in z0s])
+    norms, escape_time, z_final = _iterate_orbits(c_vecs, z0_vecs, max_iter, threshold)
+    # Hessian symmetry check (Theorem 4.6): ∂²‖z_final‖²/∂cᵢ∂cⱼ, all stencils in one batch
+    hessian_asym = _hessian_asymmetry_batch(c_vecs, z0_vecs, max_iter, threshold)
+    return [
+        _summarize_orbit(c, z0, norms[i], escape_time[i], z_final[i], max_iter, threshold, hessian_asym[i])
+        for i, (c, z0) in enumerate(zip(cs, z0s))
+    ]
+
+
+def mandelbrot_orbit(
+    c:         Sedenion,
+    z0:        Sedenion,
+    max_iter:  int   = 100,
+    threshold: float = 1e3,
+) -> OrbitResult:
+    """
+    Run sedenion Mandelbrot iteration:  zₙ₊₁ = zₙ * zₙ + c
+
+    Parameters
+    ----------
+    c         : Mandelbrot parameter ∈ 𝕊
+    z0        : Initial seed ∈ 𝕊
+    max_iter  : Maximum iterations
+    threshold : Escape radius (‖z‖ > threshold → escaped)
+
+    Returns
+    -------
+    OrbitResult with 8 scalar features + z_final + norms sequence
+    """
+    return mandelbrot_orbits([c], [z0], max_iter=max_iter, threshold=threshold)[0]
+
+
+def _orbit_norm_sq(c_vec: np.ndarray, z0_vec: np.ndarray, max_iter: int, threshold: float) -> np.ndarray | float:
+    """Helper: run orbit(s) and return ‖z_final‖² for Hessian finite differences."""
+    _, _, z = _iterate_orbits(c_vec, z0_vec, max_iter, threshold)
+    out = norm_sq(z)
+    return float(out[0]) if np.ndim(c_vec) == 1 else out
+
+
+_STENCIL_SIGNS = np.array([(1.0, 1.0), (1.0, -1.0), (-1.0, 1.0), (-1.0, -1.0)])
+
+
+def _hessian_pairs(n_pairs: int) -> np.ndarray:
+    """The (i, j) component pairs probed for every graph (fixed seed, shared by the batch)."""
+    rng = np.random.default_rng(42)
+    return np.array([rng.choice(16, size=2, replace=False) for _ in range(n_pairs)], dtype=int).reshape(-1, 2)
+
+
+def _mixed_partials_stencil(
+    c_vecs:    np.ndarray,
+    z0_vecs:   np.ndarray,
+    pairs:     np.ndarray,
+    max_iter:  int,
+    threshold: float,
+    h:         float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Central-difference H_ij and H_ji, each (n_graphs, n_pairs).
+    All n_graphs × n_pairs × 4 stencil orbits are iterated as one batch.
+    """
+    n, n_pairs = len(c_vecs), len(pairs)
+    points = np.repeat(c_vecs[:, None, None, :], n_pairs, axis=1).repeat(4, axis=2)
+    p = np.arange(n_pairs)[:, None]
+    points[:, p, np.arange(4), pairs[:, 0:1]] += _STENCIL_SIGNS[:, 0] * h
+    points[:, p, np.arange(4), pairs[:, 1:2]] += _STENCIL_SIGNS[:, 1] * h
+    seeds = np.repeat(z0_vecs, n_pairs * 4, axis=0)
+
+    f = _orbit_norm_sq(points.reshape(-1, 16), seeds, max_iter, threshold).reshape(n, n_pairs, 4)
+    f_pp, f_pm, f_mp, f_mm = f[..., 0], f[..., 1], f[..., 2], f[..., 3]
+    # Mixed partial: ∂²f/∂cᵢ∂cⱼ ≈ [f(+h,+h)-f(+h,-h)-f(-h,+h)+f(-h,-h)] / (4h²)
+    hij = (f_pp - f_pm - f_mp + f_mm) / (4 * h**2)
+    hji = (f_pp - f_mp - f_pm + f_mm) / (4 * h**2)
+    return hij, hji
+
+
+def _mixed_partials_dual(
+    c_vecs:    np.ndarray,
+    z0_vecs:   np.ndarray,
+    pairs:     np.ndarray,
+    max_iter:  int,
+    threshold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact H_ij and H_ji, each (n_graphs, n_pairs), by forward-mode hyper-dual numbers.
+
+    Each row carries z, ∂z/∂cᵢ, ∂z/∂cⱼ and ∂²z/∂cᵢ∂cⱼ through z → z z + c
+    (product rule in the non-commutative algebra), seeded with (i, j) for H_ij
+    and (j, i) for H_ji, and stops where the unperturbed orbit escapes.
+    """
+    n, n_pairs = len(c_vecs), len(pairs)
+    order = np.concatenate([pairs, pairs[:, ::-1]])             # (2 n_pairs, 2)
+    rows = n * len(order)
+    c = np.repeat(c_vecs, len(order), axis=0)
+    z = np.repeat(z0_vecs, len(order), axis=0).astype(float)
+    first, second = np.tile(order[:, 0], n), np.tile(order[:, 1], n)
+    e_first = np.zeros((rows, 16)); e_first[np.arange(rows), first] = 1.0
+    e_second = np.zeros((rows, 16)); e_second[np.arange(rows), second] = 1.0
+    d_first, d_second, d_both = np.zeros((3, rows, 16))
+
     for _ in range(max_iter):
-        if z.norm() > threshold:
+        active = np.flatnonzero(np.sqrt(norm_sq(z)) <= threshold)
+        if not len(active):
             break
-        z = z * z + c
-    return z.norm_sq()
+        za, da, db, dab = z[active], d_first[active], d_second[active], d_both[active]
+        d_both[active] = (SEDENION.mul(dab, za) + SEDENION.mul(da, db)
+                          + SEDENION.mul(db, da) + SEDENION.mul(za, dab))
+        d_first[active] = SEDENION.mul(da, za) + SEDENION.mul(za, da) + e_first[active]
+        d_second[active] = SEDENION.mul(db, za) + SEDENION.mul(za, db) + e_second[active]
+        z[active] = SEDENION.square(za) + c[active]
+
+    # f = ‖z‖²  →  ∂²f/∂cᵢ∂cⱼ = 2 (∂ᵢz · ∂ⱼz + z · ∂²ᵢⱼz)
+    hess = 2.0 * (np.einsum("rk,rk->r", d_first, d_second) + np.einsum("rk,rk->r", z, d_both))
+    hess = hess.reshape(n, 2, n_pairs)
+    return hess[:, 0], hess[:, 1]
+
+
+def _hessian_asymmetry_batch(
+    c_vecs:    np.ndarray,
+    z0_vecs:   np.ndarray,
+    max_iter:  int,
+    threshold: float,
+    h:         float = 1e-4,
+    n_pairs:   int = 4,
+    method:    str = "stencil",
+) -> np.ndarray:
+    """
+    Numerically estimate max |H_ij - H_ji| over n_pairs random (i,j) pairs, per graph.
+    Theorem 4.6: For any smooth f(c) = ‖z_n(c)‖², H is symmetric → this should ≈ 0.
+
+    method="stencil" uses the central-difference 2nd-order mixed partial (both
+    H_ij and H_ji from the same 4 orbits, so only rounding separates them);
+    method="dual" uses exact forward-mode second derivatives.
+    """
+    c_vecs = np.atleast_2d(np.asarray(c_vecs, dtype=float))
+    z0_vecs = np.atleast_2d(np.asarray(z0_vecs, dtype=float))
+    if n_pairs < 1 or not len(c_vecs):
+        return np.zeros(len(c_vecs))
+    pairs = _hessian_pairs(n_pairs)
+    n_steps = min(max_iter, 20)
+    if method == "stencil":
+        hij, hji = _mixed_partials_stencil(c_vecs, z0_vecs, pairs, n_steps, threshold, h)
+    elif method == "dual":
+        hij, hji = _mixed_partials_dual(c_vecs, z0_vecs, pairs, n_steps, threshold)
+    else:
+        raise ValueError(f"Unknown Hessian method {method!r}; expected 'stencil' or 'dual'.")
+    return np.max(np.abs(hij - hji), axis=1)
 
 
 def _hessian_asymmetry(
@@ -331,33 +527,8 @@ def _hessian_asymmetry(
     h: float = 1e-4,
     n_pairs: int = 4,
 ) -> float:
-    """
-    Numerically estimate max |H_ij - H_ji| over n_pairs random (i,j) pairs.
-    Theorem 4.6: For any smooth f(c) = ‖z_n(c)‖², H is symmetric → this should ≈ 0.
-    Uses central-difference 2nd-order mixed partial derivative.
-    """
-    rng = np.random.default_rng(42)
-    asym_vals = []
-    c_vec  = c.c.copy()
-    z0_vec = z0.c.copy()
-
-    for _ in range(n_pairs):
-        i, j = rng.choice(16, size=2, replace=False)
-
-        def f(dc_i, dc_j):
-            cv = c_vec.copy()
-            cv[i] += dc_i
-            cv[j] += dc_j
-            return _orbit_norm_sq(cv, z0_vec, min(max_iter, 20), threshold)
-
-        # Mixed partial: ∂²f/∂cᵢ∂cⱼ ≈ [f(+h,+h)-f(+h,-h)-f(-h,+h)+f(-h,-h)] / (4h²)
-        hij = (f(h, h) - f(h, -h) - f(-h, h) + f(-h, -h)) / (4 * h**2)
-        hji = (f(h, h) - f(-h, h) - f(h, -h) + f(-h, -h)) / (4 * h**2)
-        # Note: hij == hji by construction (Schwarz's theorem), both are the same formula
-        # We compute them redundantly as a numerical sanity check
-        asym_vals.append(abs(hij - hji))
-
-    return float(np.max(asym_vals)) if asym_vals else 0.0
+    """Single-graph `_hessian_asymmetry_batch`."""
+    return float(_hessian_asymmetry_batch(c.c, z0.c, max_iter, threshold, h=h, n_pairs=n_pairs)[0])
 
 
 # =============================================================================
@@ -390,9 +561,11 @@ def sedenion_features(G: nx.Graph, max_iter: int = 100) -> np.ndarray:
     -------
     np.ndarray of shape (16,), dtype float64
     """
-    c, z0 = graph_to_sedenion(G)
-    result = mandelbrot_orbit(c, z0, max_iter=max_iter, threshold=1e3)
+    return sedenion_features_batch([G], max_iter=max_iter)[0]
 
+
+def _orbit_features(result: OrbitResult, max_iter: int) -> np.ndarray:
+    """16-feature vector of one orbit (layout in `sedenion_features`)."""
     feats = np.zeros(16)
     feats[0]  = result.escape_time / max_iter
     feats[1]  = float(np.tanh(result.norm_final / 10.0))
@@ -435,11 +608,27 @@ def sedenion_features_batch(
     """
     Compute sedenion features for a list of graphs.
     Returns array of shape (len(graphs), 16).
-    ~850 ms/orbit → ~28 min for 2000 graphs (single-threaded).
+    Spectra are computed in one batch, graphs are encoded one by one, then
+    all orbits iterate together.
     """
-    results = np.empty((len(graphs), 16))
-    for idx, G in enumerate(graphs):
+    cs, z0s = [], []
+    spectra = normalized_laplacian_spectra(graphs)
+    for idx, (G, eigvals) in enumerate(zip(graphs, spectra)):
         if verbose and idx % 100 == 0:
             print(f"  sedenion_features_batch: {idx}/{len(graphs)}...")
-        results[idx] = sedenion_features(G, max_iter=max_iter)
+        c, z0 = graph_to_sedenion(G, eigvals)
+        cs.append(c)
+        z0s.append(z0)
+    return sedenion_features_from_encodings(cs, z0s, max_iter=max_iter)
+
+
+def sedenion_features_from_encodings(
+    cs:       list[Sedenion],
+    z0s:      list[Sedenion],
+    max_iter: int = 100,
+) -> np.ndarray:
+    """(len(cs), 16) feature matrix for precomputed (c, z₀) encodings, one orbit batch."""
+    results = np.empty((len(cs), 16))
+    for idx, orbit in enumerate(mandelbrot_orbits(cs, z0s, max_iter=max_iter, threshold=1e3)):
+        results[idx] = _orbit_features(orbit, max_iter)
     return results
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Graph Laplacian spectra shared by the sedenion encodings and the entropy scripts.
+
+Most callers want either the few smallest eigenvalues of the normalised
+Laplacian (the sedenion encoding reads 8) or a spectral entropy. Neither
+needs a dense eigendecomposition per graph:
+
+  - `smallest(G, k)`: dense `eigvalsh` below LANCZOS_MIN_NODES nodes, else
+    per connected component: an exact 0 for each, then sparse Lanczos
+    (`eigsh`) on 2I - L, whose largest eigenvalues are the smallest of L
+    (L is normalised, so its spectrum lies in [0, 2]); Lanczos alone would
+    report the repeated 0 of a disconnected graph only once
+  - `smallest_batch` / `full_batch`: graphs of equal size are stacked into
+    one (g, n, n) array and go through a single `np.linalg.eigvalsh` call
+    (ABIDE CC200 and the synthetic k-regular sets are all equal-N)
+  - `spectral_entropy(G)`: exact from the dense spectrum up to
+    DENSE_MAX_NODES nodes, else estimated by stochastic Lanczos quadrature
+    (the dense Laplacian is 8n² bytes and eigvalsh is O(n³); at 2000 nodes
+    exact takes ~0.75 s against ~0.08 s for SLQ)
+
+Spectra and SLQ estimates are cached by `graph_hash`: a SHA-256 over node
+count, edge index pairs in node order and edge weights. SLQ entries are also
+keyed by probe count, Lanczos steps and seed. Every service keeps an
+in-memory LRU; with `cache_dir` set, entries also persist as
+<kind>-<spec>/<hash>.npy.
+
+Spectral entropy of a PSD Laplacian L with eigenvalues λ_i and trace T is
+
+    H = -Σ p_i log2 p_i,  p_i = λ_i / T
+      = log2 T - tr(f(L)) / T,  f(λ) = λ log2 λ
+
+and SLQ estimates tr(f(L)) from Rademacher probes v as
+n · mean_v Σ_k τ_k² f(θ_k), with (θ_k, τ_k) the Ritz values and first
+eigenvector components of the Lanczos tridiagonal started at v/‖v‖.
+
+Usage:
+  from spectrum import default_spectrum_service
+  service = default_spectrum_service()
+  spec8 = service.smallest(G, 8)
+  spectra = service.smallest_batch(graphs, 8)
+  H = service.spectral_entropy(G)                       # normalised Laplacian
+  H_vn = service.spectral_entropy(G, kind="combinatorial")
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import eigh_tridiagonal
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import eigsh
+
+LAPLACIAN_KINDS = ("normalized", "combinatorial")
+LANCZOS_MIN_NODES = 1000
+DENSE_MAX_NODES = 2_000
+
+
+@dataclass(frozen=True)
+class _EdgeArrays:
+    """One pass over G.edges(): node count, index pairs in node order, weights."""
+    graph:   nx.Graph
+    n:       int
+    edges:   np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_graph(cls, G: nx.Graph, weight: Optional[str]) -> "_EdgeArrays":
+        index = {v: i for i, v in enumerate(G.nodes())}
+        rows = list(G.edges(data=weight, default=1.0)) if weight is not None else [(u, v, 1.0) for u, v in G.edges()]
+        edges = np.array([(index[u], index[v]) for u, v, _ in rows], dtype=np.int64).reshape(-1, 2)
+        weights = np.array([w for _, _, w in rows], dtype=np.float64)
+        return cls(G, len(index), edges, weights)
+
+    def digest(self) -> str:
+        h = hashlib.sha256()
+        h.update(np.int64(self.n).tobytes())
+        h.update(self.edges.tobytes())
+        h.update(self.weights.tobytes())
+        return h.hexdigest()
+
+    def laplacian(self, kind: str, weight: Optional[str]) -> sp.csr_matrix:
+        """Same arithmetic as nx.(normalized_)laplacian_matrix, without rebuilding from G."""
+        if kind not in LAPLACIAN_KINDS:
+            raise ValueError(f"Unknown Laplacian kind {kind!r}; expected one of {LAPLACIAN_KINDS}.")
+        if self.graph.is_directed() or self.graph.is_multigraph():
+            return laplacian(self.graph, kind, weight)
+        i, j = self.edges[:, 0], self.edges[:, 1]
+        off = i != j
+        # Symmetric adjacency; a self-loop is stored once, as in to_scipy_sparse_array
+        rows = np.concatenate([i, j[off]])
+        cols = np.concatenate([j, i[off]])
+        A = sp.csr_matrix((np.concatenate([self.weights, self.weights[off]]), (rows, cols)),
+                          shape=(self.n, self.n))
+        diags = np.asarray(A.sum(axis=1)).ravel()
+        L = (sp.diags(diags) - A).tocsr()
+        if kind == "combinatorial":
+            return L
+        with np.errstate(divide="ignore"):
+            diags_sqrt = 1.0 / np.sqrt(diags)
+        diags_sqrt[np.isinf(diags_sqrt)] = 0
+        DH = sp.diags(diags_sqrt)
+        return (DH @ (L @ DH)).tocsr()
+
+
+def graph_hash(G: nx.Graph, weight: Optional[str] = "weight") -> str:
+    """SHA-256 of node count, edge index pairs (node order) and edge weights."""
+    return _EdgeArrays.from_graph(G, weight).digest()
+
+
+def laplacian(G: nx.Graph, kind: str = "normalized", weight: Optional[str] = "weight") -> sp.csr_matrix:
+    """Sparse Laplacian of G in node order (NetworkX's construction)."""
+    if kind == "normalized":
+        L = nx.normalized_laplacian_matrix(G, weight=weight)
+    elif kind == "combinatorial":
+        L = nx.laplacian_matrix(G, weight=weight)
+    else:
+        raise ValueError(f"Unknown Laplacian kind {kind!r}; expected one of {LAPLACIAN_KINDS}.")
+    return sp.csr_matrix(L, dtype=float)
+
+
+def entropy_from_eigenvalues(eigenvalues: np.ndarray) -> float:
+    """-Σ p log2 p over p = |λ| / Σ|λ|, dropping p <= 1e-10 (the entropy scripts' convention)."""
+    p = np.abs(eigenvalues)
+    p = p / p.sum()
+    p = p[p > 1e-10]
+    return float(-np.sum(p * np.log2(p + 1e-10)))
+
+
+def _xlog2x(x: np.ndarray) -> np.ndarray:
+    x = np.abs(x)
+    return np.where(x > 0, x * np.log2(np.where(x > 0, x, 1.0)), 0.0)
+
+
+def slq_trace(
+    A:        sp.spmatrix,
+    f,
+    n_probes: int = 32,
+    n_steps:  int = 40,
+    seed:     int = 0,
+) -> float:
+    """
+    Stochastic Lanczos quadrature estimate of tr(f(A)) for symmetric A.
+    Probes run as one block (sparse-dense products); Lanczos vectors are
+    fully reorthogonalised, in probe blocks sized to keep memory bounded.
+    """
+    n = A.shape[0]
+    n_steps = min(n_steps, n)
+    rng = np.random.default_rng(seed)
+    block = max(1, min(n_probes, int(2e7 // max(n * n_steps, 1))))
+    total = 0.0
+    done = 0
+    while done < n_probes:
+        p = min(block, n_probes - done)
+        V = rng.choice((-1.0, 1.0), size=(n, p)) / np.sqrt(n)
+        for theta, tau in _lanczos_quadrature(A, V, n_steps):
+            total += n * float(np.sum(tau**2 * f(theta)))
+        done += p
+    return total / n_probes
+
+
+def _lanczos_quadrature(A: sp.spmatrix, V: np.ndarray, n_steps: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Gauss quadrature nodes and weights for each unit-norm column of V."""
+    n, p = V.shape
+    Q = np.zeros((n_steps, n, p))
+    alpha = np.zeros((n_steps, p))
+    beta = np.zeros((n_steps, p))
+    Q[0] = V
+    for j in range(n_steps):
+        W = A @ Q[j]
+        alpha[j] = np.einsum("ip,ip->p", Q[j], W)
+        # Full reorthogonalisation against all previous Lanczos vectors
+        W -= np.einsum("jip,jp->ip", Q[:j + 1], np.einsum("jip,ip->jp", Q[:j + 1], W))
+        beta[j] = np.linalg.norm(W, axis=0)
+        if j + 1 < n_steps:
+            Q[j + 1] = W / np.where(beta[j] > 1e-12, beta[j], 1.0)
+
+    nodes = []
+    for col in range(p):
+        # Stop at the first breakdown: the Krylov space is exhausted there
+        breakdown = np.flatnonzero(beta[:-1, col] <= 1e-12)
+        m = int(breakdown[0]) + 1 if len(breakdown) else n_steps
+        theta, S = eigh_tridiagonal(alpha[:m, col], beta[:m - 1, col])
+        nodes.append((theta, S[0]))
+    return nodes
+
+
+def _lanczos_smallest(L: sp.csr_matrix, k: int) -> np.ndarray:
+    """
+    k smallest eigenvalues of a normalised Laplacian, one connected component
+    at a time. Lanczos on 2I - L finds a repeated eigenvalue only once, and
+    every component contributes its own 0 (a disconnected graph has as many
+    zeros as components), so the spectrum is assembled from per-component
+    blocks: one exact 0 each, then the component's next smallest values by
+    Lanczos (LANCZOS_MIN_NODES nodes and up) or dense eigvalsh.
+    """
+    pattern = L.copy()
+    pattern.eliminate_zeros()
+    n_components, labels = connected_components(pattern, directed=False)
+    values = [np.zeros(n_components)]
+    order = np.argsort(labels, kind="stable")
+    sizes = np.bincount(labels, minlength=n_components)
+    for members in np.split(order, np.cumsum(sizes)[:-1]):
+        m = len(members)
+        if m == 1:
+            continue
+        block = L[members][:, members]
+        if m >= LANCZOS_MIN_NODES and k < m - 1:
+            shifted = 2.0 * sp.identity(m, format="csr") - block
+            mu = eigsh(shifted, k=k, which="LA", return_eigenvectors=False)
+            component = np.sort(2.0 - mu)
+        else:
+            component = np.linalg.eigvalsh(block.toarray())[:k]
+        values.append(component[1:])
+    return np.sort(np.concatenate(values))[:k]
+
+
+class SpectrumService:
+    """Laplacian eigenvalues with per-graph caching (see module docstring)."""
+
+    def __init__(self, cache_dir: Optional[Path | str] = None, max_entries: int = 4096):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self._memory: OrderedDict[tuple[str, str, str], np.ndarray] = OrderedDict()
+
+    # -- cache ---------------------------------------------------------------
+
+    def _path(self, key: tuple[str, str, str]) -> Path:
+        digest, kind, spec = key
+        return self.cache_dir / f"{kind}-{spec}" / f"{digest}.npy"
+
+    def _get(self, key: tuple[str, str, str]) -> Optional[np.ndarray]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.cache_dir is not None and self._path(key).exists():
+            try:
+                values = np.load(self._path(key))
+            except (OSError, ValueError):
+                return None
+            self._remember(key, values)
+            return values
+        return None
+
+    def _remember(self, key: tuple[str, str, str], values: np.ndarray) -> None:
+        self._memory[key] = values
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _put(self, key: tuple[str, str, str], values: np.ndarray) -> None:
+        values.setflags(write=False)
+        self._remember(key, values)
+        if self.cache_dir is not None:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npy")
+            np.save(tmp, values)
+            os.replace(tmp, path)
+
+    def _cached_smallest(self, digest: str, kind: str, k: int) -> Optional[np.ndarray]:
+        full = self._get((digest, kind, "full"))
+        if full is not None:
+            return full[:k]
+        return self._get((digest, kind, f"k{k}"))
+
+    # -- eigenvalues ---------------------------------------------------------
+
+    def full(self, G: nx.Graph, kind: str = "normalized", weight: Optional[str] = "weight") -> np.ndarray:
+        """All Laplacian eigenvalues, ascending (dense)."""
+        return self.full_batch([G], kind=kind, weight=weight)[0]
+
+    def full_batch(
+        self,
+        graphs: Sequence[nx.Graph],
+        kind:   str = "normalized",
+        weight: Optional[str] = "weight",
+    ) -> list[np.ndarray]:
+        """All eigenvalues per graph; uncached graphs of equal size share one stacked `eigvalsh`."""
+        return self._full([_EdgeArrays.from_graph(G, weight) for G in graphs], kind, weight)
+
+    def _full(self, prepared: list[_EdgeArrays], kind: str, weight: Optional[str]) -> list[np.ndarray]:
+        digests = [g.digest() for g in prepared]
+        out: list[Optional[np.ndarray]] = [self._get((d, kind, "full")) for d in digests]
+
+        by_size: dict[int, list[int]] = {}
+        for idx, g in enumerate(prepared):
+            if out[idx] is None:
+                by_size.setdefault(g.n, []).append(idx)
+        for n, members in by_size.items():
+            if n == 0:
+                spectra = np.zeros((len(members), 0))
+            else:
+                stack = np.stack([prepared[idx].laplacian(kind, weight).toarray() for idx in members])
+                spectra = np.linalg.eigvalsh(stack)
+            for idx, values in zip(members, spectra):
+                out[idx] = np.array(values)
+                self._put((digests[idx], kind, "full"), out[idx])
+        return out
+
+    def smallest(
+        self,
+        G:      nx.Graph,
+        k:      int,
+        kind:   str = "normalized",
+        weight: Optional[str] = "weight",
+    ) -> np.ndarray:
+        """The min(k, n) smallest Laplacian eigenvalues, ascending."""
+        return self.smallest_batch([G], k, kind=kind, weight=weight)[0]
+
+    def smallest_batch(
+        self,
+        graphs: Sequence[nx.Graph],
+        k:      int,
+        kind:   str = "normalized",
+        weight: Optional[str] = "weight",
+    ) -> list[np.ndarray]:
+        """k smallest eigenvalues per graph: Lanczos for large normalised Laplacians, stacked dense otherwise."""
+        prepared = [_EdgeArrays.from_graph(G, weight) for G in graphs]
+        digests = [g.digest() for g in prepared]
+        out: list[Optional[np.ndarray]] = [self._cached_smallest(d, kind, k) for d in digests]
+
+        dense = []
+        for idx, g in enumerate(prepared):
+            if out[idx] is not None:
+                continue
+            if kind == "normalized" and g.n >= LANCZOS_MIN_NODES and k < g.n - 1:
+                out[idx] = _lanczos_smallest(g.laplacian(kind, weight), k)
+                self._put((digests[idx], kind, f"k{k}"), out[idx])
+            else:
+                dense.append(idx)
+        if dense:
+            for idx, values in zip(dense, self._full([prepared[i] for i in dense], kind, weight)):
+                out[idx] = values[:k]
+        return out
+
+    # -- entropy -------------------------------------------------------------
+
+    def spectral_entropy(
+        self,
+        G:        nx.Graph,
+        kind:     str = "normalized",
+        weight:   Optional[str] = "weight",
+        method:   str = "auto",
+        n_probes: int = 32,
+        n_steps:  int = 40,
+        seed:     int = 0,
+    ) -> float:
+        """
+        -Σ p log2 p over the `kind` Laplacian spectrum, p = λ / Σλ.
+        method: "exact" (dense spectrum), "slq" (stochastic Lanczos
+        quadrature), or "auto" (exact up to DENSE_MAX_NODES nodes).
+        """
+        if method == "auto":
+            method = "exact" if G.number_of_nodes() <= DENSE_MAX_NODES else "slq"
+        if method == "exact":
+            return entropy_from_eigenvalues(self.full(G, kind=kind, weight=weight))
+        if method != "slq":
+            raise ValueError(f"Unknown entropy method {method!r}; expected 'auto', 'exact' or 'slq'.")
+
+        prepared = _EdgeArrays.from_graph(G, weight)
+        key = (prepared.digest(), kind, f"slq-p{n_probes}-m{n_steps}-s{seed}")
+        cached = self._get(key)
+        if cached is not None:
+            return float(cached[0])
+        L = prepared.laplacian(kind, weight)
+        trace = float(L.diagonal().sum())
+        if trace <= 0:
+            H = 0.0
+        else:
+            tr_f = slq_trace(L, _xlog2x, n_probes=n_probes, n_steps=n_steps, seed=seed)
+            H = float(np.log2(trace) - tr_f / trace)
+        self._put(key, np.array([H]))
+        return H
+
+
+_DEFAULT_SERVICE: Optional[SpectrumService] = None
+
+
+def default_spectrum_service() -> SpectrumService:
+    """Process-wide service; persists to $SPECTRUM_CACHE_DIR when that is set, else memory only."""
+    global _DEFAULT_SERVICE
+    if _DEFAULT_SERVICE is None:
+        _DEFAULT_SERVICE = SpectrumService(cache_dir=os.environ.get("SPECTRUM_CACHE_DIR"))
+    return _DEFAULT_SERVICE
@@ -9,7 +9,14 @@ Replaces the pre-correction run (07_structural_nulls.py, directed graphs on
   - input:   data/processed/{lang}_edges_FINAL.csv  (R1-canonical)
   - graph:   undirected, simple, largest connected component
   - ORC:     alpha = 0.5, uniform neighbour mass, integer hop-distance costs,
-             exact Wasserstein-1 per edge via LP (scipy linprog, HiGHS)
+             exact Wasserstein-1 per edge via the rational min-cost-flow fast
+             path (orc_engine backend "flow"; LP-parity gated by
+             orc_flow_parity.py). Since the shared engine (orc_engine), an
+             edge with non-positive hop distance gets NaN and is left out of
+             the mean, and a failed LP raises; the pre-engine script scored
+             both as kappa = 0.0. Neither case occurs on a simple connected
+             LCC (every edge has d = 1, HiGHS solves every transport LP), but
+             result files are tagged with the convention in "orc".
   - nulls:   connected double-edge swaps (degree-preserving Maslov-Sneppen
              chain conditioned on connectivity, networkx implementation,
              10x|E| swaps per null), M = 1000. Plain rejection sampling is
@@ -19,6 +26,11 @@ Replaces the pre-correction run (07_structural_nulls.py, directed graphs on
              one-sided Monte-Carlo p per tail, two-sided p, Cliff's delta,
              95% percentile CI, z-score.
 
+Chain mode (--chain-every K): instead of M independent 10x|E| rewires, one
+connected swap chain is burned in for 10x|E| swaps and sampled every K
+swaps, re-solving only the edges each swap can affect (orc_incremental).
+Samples are correlated; results go to *_configuration_nulls_r1lcc_chainK.json.
+
 Validation gate: the real kappa_mean recomputed here must match the canonical
 results/unified/{id}_exact_lp.json within TOL before any nulls are generated.
 
@@ -26,6 +38,7 @@ Author: Demetrios Chiuratto Agourakis
 Date: 2026-07-11
 """
 
+import argparse
 import json
 import subprocess
 import sys
@@ -37,7 +50,12 @@ from pathlib import Path
 import networkx as nx
 import numpy as np
 import pandas as pd
-from scipy.optimize import linprog
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from curvature_cache import default_cache  # noqa: E402
+from orc_engine import CSRGraph  # noqa: E402
+from orc_incremental import swap_chain_kappas  # noqa: E402
+from orc_parallel import parallel_mean_kappa  # noqa: E402
 
 REPO = Path(__file__).resolve().parent.parent.parent
 DATA_DIR = REPO / "data" / "processed"
@@ -113,68 +131,14 @@ def is_connected(adj):
     return len(_components(adj)) == 1
 
 
-def apsp(adj):
-    """Integer hop distances via BFS from every node."""
-    n = len(adj)
-    D = np.full((n, n), -1, dtype=np.int32)
-    for s in range(n):
-        row = D[s]
-        row[s] = 0
-        dq = deque([s])
-        while dq:
-            u = dq.popleft()
-            du = row[u]
-            for v in adj[u]:
-                if row[v] < 0:
-                    row[v] = du + 1
-                    dq.append(v)
-    return D
-
-
 # ------------------------------------------------------------------------ ORC
-def w1_exact(mu, nu, C):
-    n, m = len(mu), len(nu)
-    c = C.flatten()
-    A_eq = np.zeros((n + m, n * m))
-    for i in range(n):
-        A_eq[i, i * m:(i + 1) * m] = 1.0
-    for j in range(m):
-        A_eq[n + j, j::m] = 1.0
-    b_eq = np.concatenate([mu, nu])
-    res = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=(0, None), method="highs")
-    if not res.success:
-        return float("nan")
-    return res.fun
-
-
-def edge_curvature(adj, u, v, D):
-    mu_u = {u: ALPHA}
-    mu_v = {v: ALPHA}
-    for z in adj[u]:
-        mu_u[z] = mu_u.get(z, 0.0) + (1 - ALPHA) / len(adj[u])
-    for z in adj[v]:
-        mu_v[z] = mu_v.get(z, 0.0) + (1 - ALPHA) / len(adj[v])
-    support = sorted(set(mu_u) | set(mu_v))
-    pos = {node: i for i, node in enumerate(support)}
-    k = len(support)
-    mu = np.zeros(k)
-    nu = np.zeros(k)
-    for node, p in mu_u.items():
-        mu[pos[node]] = p
-    for node, p in mu_v.items():
-        nu[pos[node]] = p
-    C = np.array([[float(D[a, b]) for b in support] for a in support])
-    w1 = w1_exact(mu, nu, C)
-    d_uv = float(D[u, v])
-    if d_uv == 0.0 or np.isnan(w1):
-        return 0.0
-    return 1.0 - w1 / d_uv
-
-
-def mean_kappa(adj):
-    D = apsp(adj)
-    kappas = [edge_curvature(adj, u, v, D) for u, v in edges_of(adj)]
-    return float(np.mean(kappas))
+def mean_kappa(adj, workers=1, cache=None):
+    """Mean exact ORC via the shared CSR curvature engine (orc_engine),
+    edge-parallel over `workers` processes (looked up in `cache` first)."""
+    return parallel_mean_kappa(
+        CSRGraph.from_adjacency(adj), alpha=ALPHA, backend="flow", workers=workers,
+        cache=cache,
+    )
 
 
 # ---------------------------------------------------------------- null models
@@ -209,7 +173,7 @@ def _one_null(seed):
 
 
 # ----------------------------------------------------------------------- main
-def run_network(net_id, filename, base_seed):
+def run_network(net_id, filename, base_seed, chain_every=0):
     csv_path = DATA_DIR / filename
     adj, full_n, full_e = load_lcc(csv_path)
     N = len(adj)
@@ -220,7 +184,7 @@ def run_network(net_id, filename, base_seed):
     kappa_ref = ref["kappa_mean"]
 
     t0 = time.time()
-    kappa_real = mean_kappa(adj)
+    kappa_real = mean_kappa(adj, workers=WORKERS, cache=default_cache())
     print(f"[{net_id}] N={N} E={E} (full {full_n}/{full_e}) "
           f"kappa_real={kappa_real:+.6f} ref={kappa_ref:+.6f} "
           f"({time.time()-t0:.1f}s)", flush=True)
@@ -234,19 +198,25 @@ def run_network(net_id, filename, base_seed):
             "kappa_real_recomputed": kappa_real, "kappa_ref_exact_lp": kappa_ref,
         }
 
-    seeds = [base_seed + k for k in range(int(M_TARGET * MAX_ATTEMPTS_FACTOR))]
-    null_kappas = []
-    with Pool(WORKERS, initializer=_init_worker, initargs=(adj,)) as pool:
-        for r in pool.imap_unordered(_one_null, seeds, chunksize=4):
-            if r is not None:
-                null_kappas.append(r)
-                if len(null_kappas) % 100 == 0:
-                    print(f"[{net_id}] {len(null_kappas)}/{M_TARGET} nulls "
-                          f"({time.time()-t0:.0f}s)", flush=True)
-            if len(null_kappas) >= M_TARGET:
-                pool.terminate()
-                break
-    null_kappas = np.array(null_kappas[:M_TARGET])
+    if chain_every:
+        null_kappas = swap_chain_kappas(
+            adj, M_TARGET, chain_every, seed=base_seed, connected=True,
+            alpha=ALPHA, backend="flow",
+        )
+    else:
+        seeds = [base_seed + k for k in range(int(M_TARGET * MAX_ATTEMPTS_FACTOR))]
+        null_kappas = []
+        with Pool(WORKERS, initializer=_init_worker, initargs=(adj,)) as pool:
+            for r in pool.imap_unordered(_one_null, seeds, chunksize=4):
+                if r is not None:
+                    null_kappas.append(r)
+                    if len(null_kappas) % 100 == 0:
+                        print(f"[{net_id}] {len(null_kappas)}/{M_TARGET} nulls "
+                              f"({time.time()-t0:.0f}s)", flush=True)
+                if len(null_kappas) >= M_TARGET:
+                    pool.terminate()
+                    break
+        null_kappas = np.array(null_kappas[:M_TARGET])
     M = len(null_kappas)
 
     null_mean = float(null_kappas.mean())
@@ -266,12 +236,16 @@ def run_network(net_id, filename, base_seed):
         "graph": "lcc_undirected_simple",
         "N": N, "E": E, "full_N": full_n, "full_E": full_e,
         "orc": {"alpha": ALPHA, "cost": "integer_hop_distance",
-                "w1_solver": "scipy.linprog(method=highs)_exact_LP"},
+                "w1_solver": "orc_engine.flow_exact_rational",
+                "degenerate_edges": "nan_excluded", "lp_failure": "raise"},
         "kappa_real": kappa_real,
         "kappa_ref_exact_lp": kappa_ref,
         "gate_abs_diff_vs_ref": abs(kappa_real - kappa_ref),
-        "null_model": "connected_double_edge_swap_degree_preserving(networkx)",
-        "swaps_per_null": f"{SWAP_FACTOR}x|E|",
+        "null_model": ("connected_double_edge_swap_chain_sampled(orc_incremental)"
+                       if chain_every else
+                       "connected_double_edge_swap_degree_preserving(networkx)"),
+        "swaps_per_null": (f"burn-in {SWAP_FACTOR}x|E|, then every {chain_every}"
+                           if chain_every else f"{SWAP_FACTOR}x|E|"),
         "connected_nulls_only": True,
         "M": M,
         "kappa_null_mean": null_mean,
@@ -286,7 +260,8 @@ def run_network(net_id, filename, base_seed):
         "seed_base": base_seed,
         "runtime_s": round(time.time() - t0, 1),
     }
-    out = OUT_DIR / f"{net_id}_configuration_nulls_r1lcc.json"
+    suffix = f"_chain{chain_every}" if chain_every else ""
+    out = OUT_DIR / f"{net_id}_configuration_nulls_r1lcc{suffix}.json"
     out.write_text(json.dumps(result, indent=2) + "\n")
     print(f"[{net_id}] DONE M={M} null_mean={null_mean:+.6f} "
           f"delta={delta:+.6f} p_lower={p_lower:.4g} p_upper={p_upper:.4g} "
@@ -295,6 +270,11 @@ def run_network(net_id, filename, base_seed):
 
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--chain-every", type=int, default=0,
+                    help="sample one swap chain every K swaps (0: independent rewires)")
+    args = ap.parse_args()
+
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     head = subprocess.run(["git", "-C", str(REPO), "rev-parse", "HEAD"],
                           capture_output=True, text=True).stdout.strip()
@@ -305,8 +285,10 @@ def main():
         "networks": [],
     }
     for k, (net_id, filename) in enumerate(NETWORKS):
-        summary["networks"].append(run_network(net_id, filename, 42_000 + 10_000 * k))
-    out = OUT_DIR / "configuration_nulls_r1lcc_summary.json"
+        summary["networks"].append(
+            run_network(net_id, filename, 42_000 + 10_000 * k, args.chain_every))
+    suffix = f"_chain{args.chain_every}" if args.chain_every else ""
+    out = OUT_DIR / f"configuration_nulls_r1lcc_summary{suffix}.json"
     out.write_text(json.dumps(summary, indent=2) + "\n")
     print(f"summary -> {out.relative_to(REPO)}", flush=True)
 
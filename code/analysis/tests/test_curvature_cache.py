@@ -0,0 +1,152 @@
+"""
+Tests for the persistent curvature cache (curvature_cache.py).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from curvature_cache import (
+    CurvatureCache,
+    cached_edge_kappa,
+    canonical_edges,
+    curvature_key,
+    graphricci_edge_kappa,
+)
+from orc_engine import SOLVER_VERSION, CSRGraph, CurvatureEngine
+from orc_parallel import parallel_edge_kappa
+
+
+def _key(edges, **kw):
+    canon, _ = canonical_edges(edges)
+    return curvature_key(canon, alpha=0.5, method="flow", version=SOLVER_VERSION, **kw)
+
+
+class TestCurvatureKey:
+    """Test content addressing."""
+
+    def test_key_ignores_edge_order_and_orientation(self):
+        edges = np.array([[0, 1], [1, 2], [2, 3]])
+        shuffled = np.array([[3, 2], [0, 1], [2, 1]])
+        assert _key(edges) == _key(shuffled)
+
+    def test_key_depends_on_content(self):
+        edges = np.array([[0, 1], [1, 2], [2, 3]])
+        base = _key(edges)
+        assert _key(np.array([[0, 1], [1, 2], [1, 3]])) != base
+        assert _key(edges, weights=np.ones(3)) != base
+        canon, _ = canonical_edges(edges)
+        assert curvature_key(canon, alpha=0.4, method="flow", version=SOLVER_VERSION) != base
+        assert curvature_key(canon, alpha=0.5, method="lp", version=SOLVER_VERSION) != base
+
+    def test_directed_keeps_orientation(self):
+        a, _ = canonical_edges(np.array([[1, 0]]), directed=True)
+        b, _ = canonical_edges(np.array([[0, 1]]), directed=True)
+        assert a.tolist() != b.tolist()
+
+
+class TestCurvatureCache:
+    """Test storage, lookup and eviction."""
+
+    def test_round_trip_is_memory_mapped(self, tmp_path):
+        cache = CurvatureCache(tmp_path)
+        cache.put("abc", np.array([0.1, -0.2]), {"method": "flow"})
+        hit = cache.get("abc")
+        assert isinstance(hit, np.memmap)
+        np.testing.assert_array_equal(hit, [0.1, -0.2])
+        assert cache.metadata("abc")["method"] == "flow"
+        assert cache.get("missing") is None
+
+    def test_lru_eviction_by_count(self, tmp_path):
+        cache = CurvatureCache(tmp_path, max_entries=2)
+        cache.put("a", np.zeros(3))
+        cache.put("b", np.zeros(3))
+        os.utime(tmp_path / "a.npy", (1, 1))
+        os.utime(tmp_path / "b.npy", (2, 2))
+        cache.get("a")  # refreshes a: b is now least recently used
+        cache.put("c", np.zeros(3))
+        assert "a" in cache and "c" in cache and "b" not in cache
+
+    def test_eviction_by_size_keeps_newest(self, tmp_path):
+        cache = CurvatureCache(tmp_path, max_bytes=1)
+        cache.put("a", np.zeros(10))
+        cache.put("b", np.zeros(10))
+        assert "b" in cache and "a" not in cache
+
+    def test_cached_edge_kappa_returns_input_order(self, tmp_path):
+        cache = CurvatureCache(tmp_path)
+        edges = np.array([[2, 3], [0, 1], [1, 2]])
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return np.array([3.0, 1.0, 2.0])
+
+        kw = dict(alpha=0.5, method="test", version="1")
+        first = cached_edge_kappa(cache, compute, edges, **kw)
+        second = cached_edge_kappa(cache, compute, edges[::-1], **kw)
+        assert len(calls) == 1
+        np.testing.assert_array_equal(first, [3.0, 1.0, 2.0])
+        np.testing.assert_array_equal(second, [2.0, 1.0, 3.0])
+        assert not isinstance(second, np.memmap) and second.flags.writeable
+
+
+class TestCacheEntryPoints:
+    """Test that the curvature entry points hit the cache."""
+
+    def test_parallel_edge_kappa(self, tmp_path):
+        cache = CurvatureCache(tmp_path)
+        graph, _ = CSRGraph.from_networkx(nx.karate_club_graph())
+        exact = CurvatureEngine(graph, backend="flow").edge_kappa()
+        first = parallel_edge_kappa(graph, backend="flow", cache=cache)
+        second = parallel_edge_kappa(graph, backend="flow", cache=cache)
+        np.testing.assert_array_equal(first, exact)
+        np.testing.assert_array_equal(second, exact)
+        assert len(cache.entries()) == 1
+        subset = graph.edges()[5:9][::-1]
+        np.testing.assert_array_equal(
+            parallel_edge_kappa(graph, subset, backend="flow", cache=cache), exact[5:9][::-1]
+        )
+        assert len(cache.entries()) == 2
+
+    def test_graphricci_edge_kappa(self, tmp_path, weighted_graph):
+        pytest.importorskip("GraphRicciCurvature")
+        cache = CurvatureCache(tmp_path)
+        plain = graphricci_edge_kappa(weighted_graph, proc=1)
+        cached = graphricci_edge_kappa(weighted_graph, cache=cache, proc=1)
+        np.testing.assert_allclose(cached, plain)
+        (entry,) = cache.entries()
+        np.testing.assert_allclose(graphricci_edge_kappa(weighted_graph, cache=cache), plain)
+        assert cache.metadata(entry[2])["method"] == "graphricci"
+
+    def test_graphricci_edge_kappa_skips_self_loops(self, tmp_path):
+        pytest.importorskip("GraphRicciCurvature")
+        G = nx.karate_club_graph()
+        looped = G.copy()
+        looped.add_edge(0, 0)
+        cache = CurvatureCache(tmp_path)
+
+        kappa = graphricci_edge_kappa(looped, cache=cache, proc=1)
+        assert len(kappa) == G.number_of_edges()
+        np.testing.assert_allclose(kappa, graphricci_edge_kappa(G, proc=1))
+
+    def test_q1_edge_metrics_skip_self_loops(self, tmp_path, monkeypatch):
+        pytest.importorskip("GraphRicciCurvature")
+        pytest.importorskip("sklearn")
+        from q1_triangles_vs_curvature import compute_edge_metrics
+
+        monkeypatch.setenv("ORC_CACHE_DIR", str(tmp_path))
+        G = nx.karate_club_graph()
+        looped = G.copy()
+        looped.add_edge(0, 0)
+
+        df = compute_edge_metrics(looped)
+        assert len(df) == G.number_of_edges()
+        assert "0--0" not in set(df["edge"])
+        expected = graphricci_edge_kappa(G, weight="weight", proc=1)
+        np.testing.assert_allclose(df["kappa"].to_numpy(), expected)
@@ -0,0 +1,171 @@
+"""
+Tests for the dual classifier feature pipeline (shared primitives + cache).
+"""
+
+import pytest
+import networkx as nx
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("sklearn")
+
+from dual_classifier import (
+    FeatureCache,
+    compute_all_features,
+    gat_features,
+    gcn_features,
+    graph_hash,
+    orc_features_approx,
+    synthetic_dataset,
+)
+
+
+@pytest.fixture
+def graphs():
+    graphs, _ = synthetic_dataset(n_per_class=4, N=40, seed=0)
+    return graphs + [nx.empty_graph(1), nx.karate_club_graph()]
+
+
+def _gcn_loop(G):
+    """Edge-by-edge aggregation the vectorised GCN features replace."""
+    nodes = list(G.nodes())
+    idx = {v: i for i, v in enumerate(nodes)}
+    deg = np.array([G.degree(v) for v in nodes], dtype=float)
+    cc = np.array([nx.clustering(G, v) for v in nodes], dtype=float)
+    h = np.stack([deg / max(deg.max(), 1.0), cc], axis=1)
+    d_inv_sqrt = 1.0 / np.sqrt(np.maximum(deg, 1.0))
+    h_prime = np.zeros_like(h)
+    for u, v in G.edges():
+        i, j = idx[u], idx[v]
+        h_prime[i] += d_inv_sqrt[i] * d_inv_sqrt[j] * h[j]
+        h_prime[j] += d_inv_sqrt[j] * d_inv_sqrt[i] * h[i]
+    return h_prime
+
+
+def _gat_loop(G):
+    """Edge-by-edge attention aggregation the sparse GAT features replace."""
+    nodes = list(G.nodes())
+    idx = {v: i for i, v in enumerate(nodes)}
+    deg = np.array([G.degree(v) for v in nodes], dtype=float)
+    cc = np.array([nx.clustering(G, v) for v in nodes], dtype=float)
+    h = np.stack([deg / max(deg.max(), 1.0), cc], axis=1)
+    h_attn = np.zeros_like(h)
+    attn_sum = np.zeros(len(nodes))
+    for u, v in G.edges():
+        i, j = idx[u], idx[v]
+        score = np.exp(-abs(deg[i] - deg[j]) / max(deg.max(), 1.0))
+        h_attn[i] += score * h[j]
+        h_attn[j] += score * h[i]
+        attn_sum[i] += score
+        attn_sum[j] += score
+    return h_attn / np.maximum(attn_sum[:, None], 1e-9)
+
+
+def _kappa_sets(G):
+    """Per-edge neighbourhood symmetric differences the sparse ORC proxy replaces."""
+    kappas = []
+    for u, v in G.edges():
+        nu = set(G.neighbors(u)) - {v}
+        nv = set(G.neighbors(v)) - {u}
+        kappas.append(1.0 - len(nu ^ nv) / max(G.degree(u) + G.degree(v), 1))
+    return np.array(kappas)
+
+
+class TestExtractors:
+    """Sparse-matrix extractors match the per-edge loops."""
+
+    def test_gcn_aggregation_matches_loop(self):
+        G = nx.karate_club_graph()
+        h_prime = _gcn_loop(G)
+        expected = np.concatenate([h_prime.mean(0), h_prime.std(0), h_prime.max(0)])
+
+        np.testing.assert_allclose(gcn_features(G), expected, rtol=1e-12)
+
+    def test_gcn_layers_are_repeated_propagation(self):
+        G = nx.karate_club_graph()
+        one = gcn_features(G, n_layers=1)
+        two = gcn_features(G, n_layers=2)
+
+        assert two.shape == (6,)
+        assert not np.allclose(one, two)
+
+    def test_orc_matches_neighbourhood_sets(self):
+        G = nx.les_miserables_graph()
+        G.add_edge("Valjean", "Valjean")
+        G.add_node("isolated")
+        kappas = _kappa_sets(G)
+
+        feats = orc_features_approx(G)
+        assert feats[0] == pytest.approx(kappas.mean(), abs=1e-15)
+        assert feats[7] == pytest.approx(2.0 * kappas.std() / np.sqrt(len(kappas)), abs=1e-15)
+
+    def test_gat_attention_matches_loop(self):
+        G = nx.karate_club_graph()
+        G.add_edge(0, 0)
+        h_attn = _gat_loop(G)
+        expected = np.concatenate([h_attn.mean(0), h_attn.std(0), h_attn.max(0)])
+
+        np.testing.assert_allclose(gat_features(G), expected, rtol=1e-12)
+
+    def test_gat_layers_are_repeated_attention(self):
+        G = nx.karate_club_graph()
+        one = gat_features(G, n_layers=1)
+        two = gat_features(G, n_layers=2)
+
+        assert two.shape == (6,)
+        assert not np.allclose(one, two)
+
+    def test_gat_is_finite_on_sparse_graph(self):
+        G = nx.path_graph(5)
+        G.add_node(99)
+        assert np.isfinite(gat_features(G)).all()
+
+
+class TestFeatureCache:
+    """Cached rows are reused and keyed by structure, not labels."""
+
+    def test_cached_run_matches_cold_run(self, tmp_path, graphs):
+        cache = FeatureCache(tmp_path)
+        cold = compute_all_features(graphs, max_iter_sed=20, verbose=False, cache=cache)
+        warm = compute_all_features(graphs, max_iter_sed=20, verbose=False, cache=cache)
+        plain = compute_all_features(graphs, max_iter_sed=20, verbose=False)
+
+        assert set(cold) == {"orc", "sedenion", "dual", "fsnn", "gcn", "gat"}
+        for key in cold:
+            np.testing.assert_array_equal(warm[key], cold[key])
+            np.testing.assert_array_equal(plain[key], cold[key])
+
+    def test_max_iter_gets_its_own_sedenion_entry(self, tmp_path, graphs):
+        cache = FeatureCache(tmp_path)
+        compute_all_features(graphs[:2], max_iter_sed=10, verbose=False, cache=cache)
+        compute_all_features(graphs[:2], max_iter_sed=20, verbose=False, cache=cache)
+
+        sed_dirs = sorted(p.name for p in tmp_path.iterdir() if p.name.startswith("sedenion"))
+        assert sed_dirs == ["sedenion-v1-iter10", "sedenion-v1-iter20"]
+
+    def test_reweighted_graph_gets_its_own_rows(self, tmp_path):
+        G = nx.karate_club_graph()
+        unit = G.copy()
+        nx.set_edge_attributes(unit, 1.0, "weight")
+        cache = FeatureCache(tmp_path)
+        compute_all_features([G], max_iter_sed=20, verbose=False, cache=cache)
+        cached = compute_all_features([unit], max_iter_sed=20, verbose=False, cache=cache)
+        fresh = compute_all_features([unit], max_iter_sed=20, verbose=False)
+
+        assert graph_hash(G) != graph_hash(unit)
+        np.testing.assert_array_equal(cached["sedenion"], fresh["sedenion"])
+
+    def test_hash_ignores_labels(self):
+        G = nx.cycle_graph(6)
+        relabelled = nx.relabel_nodes(G, {v: f"n{v}" for v in G})
+
+        assert graph_hash(G) == graph_hash(relabelled)
+        assert graph_hash(G) != graph_hash(nx.path_graph(6))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,189 @@
+"""
+Tests for the array-native edge-list loader.
+"""
+
+import pytest
+import networkx as nx
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from graph_loader import load_edge_table, load_graph_snapshot
+
+
+def _random_edgelist(seed=0, n_rows=400, n_labels=60):
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i:03d}" for i in rng.permutation(n_labels)])
+    return pd.DataFrame({
+        'source': words[rng.integers(0, n_labels, n_rows)],
+        'target': words[rng.integers(0, n_labels, n_rows)],
+        'weight': rng.random(n_rows),
+    })
+
+
+def _assert_same_graph(expected, actual):
+    assert set(expected.nodes()) == set(actual.nodes())
+    assert expected.number_of_edges() == actual.number_of_edges()
+    for u, v, data in expected.edges(data=True):
+        assert actual[u][v]['weight'] == pytest.approx(data['weight'], rel=1e-12)
+
+
+class TestCombineModes:
+    """Merged weights match the row-by-row NetworkX constructions."""
+
+    def test_digraph_matches_to_undirected(self):
+        edges = _random_edgelist(seed=1)
+        G_dir = nx.DiGraph()
+        for _, row in edges.iterrows():
+            G_dir.add_edge(row['source'], row['target'], weight=row['weight'])
+
+        table = load_edge_table(edges, combine="digraph", self_loops=True)
+        _assert_same_graph(G_dir.to_undirected(), table.to_networkx())
+
+    def test_last_matches_graph_add_edge(self):
+        edges = _random_edgelist(seed=2)
+        G = nx.Graph()
+        for _, row in edges.iterrows():
+            G.add_edge(row['source'], row['target'], weight=row['weight'])
+
+        _assert_same_graph(G, load_edge_table(edges, combine="last", self_loops=True).to_networkx())
+
+    def test_directed_last_matches_digraph(self):
+        edges = _random_edgelist(seed=3)
+        G_dir = nx.DiGraph()
+        for _, row in edges.iterrows():
+            G_dir.add_edge(row['source'], row['target'], weight=row['weight'])
+
+        loaded = load_edge_table(edges, directed=True, combine="last", self_loops=True).to_networkx()
+        assert loaded.is_directed()
+        assert set(G_dir.edges()) == set(loaded.edges())
+        for u, v, data in G_dir.edges(data=True):
+            assert loaded[u][v]['weight'] == data['weight']
+
+    def test_sum_merges_reciprocal_edges_and_drops_self_loops(self):
+        edges = pd.DataFrame({
+            'source': ['a', 'b', 'a', 'c'],
+            'target': ['b', 'a', 'a', 'a'],
+            'weight': [0.5, 0.25, 9.0, 1.0],
+        })
+        table = load_edge_table(edges, combine="sum")
+
+        assert table.edge_labels() == [('a', 'b'), ('a', 'c')]
+        np.testing.assert_allclose(table.weights, [0.75, 1.0])
+
+    def test_missing_weight_column_uses_default(self):
+        edges = pd.DataFrame({'source': ['a', 'b'], 'target': ['b', 'c']})
+        table = load_edge_table(edges, default_weight=2.0)
+
+        np.testing.assert_allclose(table.weights, [2.0, 2.0])
+
+    def test_unknown_combine_mode_raises(self):
+        with pytest.raises(ValueError):
+            load_edge_table(_random_edgelist(), combine="median")
+
+
+class TestCanonicalOrder:
+    """Node and edge order follow sorted labels."""
+
+    def test_edges_are_canonical(self):
+        table = load_edge_table(_random_edgelist(seed=4), combine="sum")
+        G = table.to_networkx()
+
+        assert list(G.nodes()) == sorted(G.nodes())
+        expected = sorted((min(u, v), max(u, v)) for u, v in G.edges())
+        assert table.edge_labels() == expected
+        assert list(G.edges()) == expected
+
+    def test_csr_edges_align_with_table(self):
+        table = load_edge_table(_random_edgelist(seed=5), combine="sum")
+        csr = table.to_csr()
+
+        np.testing.assert_array_equal(csr.edges(), table.edges)
+
+
+class TestLargestComponent:
+    """LCC extraction with scipy connected components."""
+
+    def test_matches_networkx_lcc(self):
+        edges = pd.DataFrame({
+            'source': ['a', 'b', 'c', 'x', 'y'],
+            'target': ['b', 'c', 'd', 'y', 'z'],
+            'weight': [1.0, 2.0, 3.0, 4.0, 5.0],
+        })
+        table = load_edge_table(edges, largest_component=True)
+
+        assert table.labels.tolist() == ['a', 'b', 'c', 'd']
+        assert table.edge_labels() == [('a', 'b'), ('b', 'c'), ('c', 'd')]
+
+    def test_directed_uses_weak_components(self):
+        edges = pd.DataFrame({'source': ['a', 'c', 'x'], 'target': ['b', 'b', 'y']})
+        table = load_edge_table(edges, directed=True, largest_component=True)
+
+        assert table.labels.tolist() == ['a', 'b', 'c']
+        assert table.edge_labels() == [('a', 'b'), ('c', 'b')]
+
+
+class TestGraphSnapshot:
+    """Compiled snapshots reload memory-mapped and track the source CSV."""
+
+    def test_roundtrip_matches_fresh_load(self, tmp_path):
+        edge_file = tmp_path / "edges.csv"
+        _random_edgelist(seed=6).to_csv(edge_file, index=False)
+
+        first = load_graph_snapshot(edge_file, root=tmp_path / "snapshots", largest_component=True)
+        again = load_graph_snapshot(edge_file, root=tmp_path / "snapshots", largest_component=True)
+        fresh = load_edge_table(edge_file, largest_component=True)
+
+        assert isinstance(again.table.edges, np.memmap)
+        assert again.table.labels.tolist() == fresh.labels.tolist()
+        np.testing.assert_array_equal(again.table.edges, fresh.edges)
+        np.testing.assert_array_equal(again.table.weights, fresh.weights)
+        np.testing.assert_array_equal(again.csr.indices, fresh.to_csr().indices)
+        assert again.source_sha256 == first.source_sha256
+
+    def test_rebuilds_when_source_changes(self, tmp_path):
+        edge_file = tmp_path / "edges.csv"
+        edges = _random_edgelist(seed=7)
+        edges.to_csv(edge_file, index=False)
+        before = load_graph_snapshot(edge_file, root=tmp_path / "snapshots")
+
+        edges.assign(weight=edges['weight'] * 2.0).to_csv(edge_file, index=False)
+        after = load_graph_snapshot(edge_file, root=tmp_path / "snapshots")
+
+        assert after.source_sha256 != before.source_sha256
+        np.testing.assert_allclose(after.table.weights, load_edge_table(edge_file).weights)
+
+    def test_same_stem_in_other_directory_gets_its_own_snapshot(self, tmp_path):
+        first_file = tmp_path / "a" / "edges.csv"
+        second_file = tmp_path / "b" / "edges.csv"
+        first_file.parent.mkdir()
+        second_file.parent.mkdir()
+        _random_edgelist(seed=8).to_csv(first_file, index=False)
+        _random_edgelist(seed=9).to_csv(second_file, index=False)
+
+        load_graph_snapshot(first_file, root=tmp_path / "snapshots")
+        second = load_graph_snapshot(second_file, root=tmp_path / "snapshots")
+
+        np.testing.assert_array_equal(second.table.edges, load_edge_table(second_file).edges)
+        assert len(list((tmp_path / "snapshots").iterdir())) == 2
+
+    def test_reader_is_part_of_the_key(self, tmp_path):
+        edge_file = tmp_path / "edges.csv"
+        _random_edgelist(seed=10).to_csv(edge_file, index=False)
+
+        def halve_weights(path):
+            frame = pd.read_csv(path)
+            return frame.assign(weight=frame['weight'] / 2.0)
+
+        plain = load_graph_snapshot(edge_file, root=tmp_path / "snapshots")
+        halved = load_graph_snapshot(edge_file, root=tmp_path / "snapshots", reader=halve_weights)
+
+        np.testing.assert_allclose(np.asarray(halved.table.weights), np.asarray(plain.table.weights) / 2.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for the table-driven hypercomplex algebras.
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hypercomplex import HypercomplexAlgebra, _cd_mul_recursive, cayley_dickson, from_fano_lines, norm_sq
+
+PERMUTATION_TEST_LINES = [(1, 2, 3), (1, 4, 5), (1, 7, 6), (2, 4, 6), (2, 5, 7), (3, 4, 7), (3, 6, 5)]
+
+
+class TestCayleyDickson:
+    """Tables reproduce the recursive doubling formula."""
+
+    @pytest.mark.parametrize("dim", [2, 4, 8, 16])
+    def test_matches_recursive_product(self, dim):
+        rng = np.random.default_rng(dim)
+        algebra = cayley_dickson(dim)
+        for _ in range(20):
+            a, b = rng.normal(size=(2, dim))
+            np.testing.assert_allclose(algebra.mul(a, b), _cd_mul_recursive(a, b), atol=1e-12)
+
+    def test_batched_product_broadcasts(self):
+        rng = np.random.default_rng(0)
+        S = cayley_dickson(16)
+        a = rng.normal(size=(5, 3, 16))
+        b = rng.normal(size=(3, 16))
+        batched = S.mul(a, b)
+
+        assert batched.shape == (5, 3, 16)
+        np.testing.assert_allclose(batched[4, 2], S.mul(a[4, 2], b[2]))
+
+    def test_structure_tensor_contracts_to_product(self):
+        rng = np.random.default_rng(1)
+        O = cayley_dickson(8)
+        a, b = rng.normal(size=(2, 8))
+
+        np.testing.assert_allclose(np.einsum("i,j,ijk->k", a, b, O.structure_tensor()), O.mul(a, b))
+
+    def test_octonion_norm_is_multiplicative(self):
+        rng = np.random.default_rng(2)
+        O = cayley_dickson(8)
+        a, b = rng.normal(size=(2, 8))
+
+        assert norm_sq(O.mul(a, b)) == pytest.approx(norm_sq(a) * norm_sq(b))
+
+    def test_rejects_non_power_of_two(self):
+        with pytest.raises(ValueError):
+            cayley_dickson(12)
+
+
+class TestFanoOctonions:
+    """Octonions from oriented Fano lines."""
+
+    def test_lines_multiply_cyclically(self):
+        O = from_fano_lines(PERMUTATION_TEST_LINES)
+        for a, b, c in PERMUTATION_TEST_LINES:
+            np.testing.assert_array_equal(O.mul(O.basis(a), O.basis(b)), O.basis(c))
+            np.testing.assert_array_equal(O.mul(O.basis(b), O.basis(a)), -O.basis(c))
+
+    def test_associator_is_alternating(self):
+        rng = np.random.default_rng(3)
+        O = from_fano_lines(PERMUTATION_TEST_LINES)
+        a, b = rng.normal(size=(2, 8))
+
+        np.testing.assert_allclose(O.associator(a, a, b), 0.0, atol=1e-12)
+        np.testing.assert_allclose(O.associator(a, b, b), 0.0, atol=1e-12)
+
+    def test_incomplete_table_is_rejected(self):
+        index = np.zeros((8, 8), dtype=int)
+        with pytest.raises(ValueError):
+            HypercomplexAlgebra.from_table(index, np.ones((8, 8)))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""
+Tests for the checkpointed null-ensemble runner (null_ensemble.py).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from null_ensemble import ReplicateLog, replicate_seed, run_ensemble
+
+
+def _draw(rng):
+    return rng.normal()
+
+
+class TestReplicateSeeds:
+    """Test per-replicate seed derivation."""
+
+    def test_matches_spawned_children(self):
+        children = np.random.SeedSequence(123).spawn(5)
+        for i, child in enumerate(children):
+            assert (replicate_seed(123, i).generate_state(4) == child.generate_state(4)).all()
+
+
+class TestRunEnsemble:
+    """Test determinism, logging and resume."""
+
+    def test_independent_of_worker_count(self):
+        serial = run_ensemble(_draw, 20, root_seed=7)
+        parallel = run_ensemble(_draw, 20, root_seed=7, workers=3)
+        np.testing.assert_array_equal(serial, parallel)
+
+    def test_resume_skips_logged_replicates(self, tmp_path):
+        first = run_ensemble(_draw, 8, root_seed=7, log_dir=tmp_path, flush_every=3)
+        assert len(ReplicateLog(tmp_path, {"root_seed": 7}).load()) == 8
+
+        calls = []
+
+        def counting(rng):
+            calls.append(1)
+            return _draw(rng)
+
+        extended = run_ensemble(counting, 12, root_seed=7, log_dir=tmp_path)
+        assert len(calls) == 4
+        np.testing.assert_array_equal(extended, run_ensemble(_draw, 12, root_seed=7))
+        np.testing.assert_array_equal(extended[:8], first)
+
+    def test_failed_replicates_are_retried_on_resume(self, tmp_path):
+        def flaky(rng):
+            value = _draw(rng)
+            if value > 0:
+                raise RuntimeError("transient")
+            return value
+
+        first = run_ensemble(flaky, 10, root_seed=7, log_dir=tmp_path, flush_every=1)
+        failed = np.isnan(first)
+        assert failed.any()
+        assert len(ReplicateLog(tmp_path, {"root_seed": 7}).load()) == int((~failed).sum())
+
+        resumed = run_ensemble(_draw, 10, root_seed=7, log_dir=tmp_path)
+        np.testing.assert_array_equal(resumed, run_ensemble(_draw, 10, root_seed=7))
+
+    def test_rejects_log_from_other_versions(self, tmp_path):
+        run_ensemble(_draw, 2, root_seed=7, log_dir=tmp_path, meta={"null_model_version": "a"})
+        with pytest.raises(ValueError):
+            run_ensemble(_draw, 2, root_seed=7, log_dir=tmp_path, meta={"null_model_version": "b"})
+
+    def test_rejects_mismatched_log(self, tmp_path):
+        run_ensemble(_draw, 2, root_seed=7, log_dir=tmp_path)
+        with pytest.raises(ValueError):
+            run_ensemble(_draw, 2, root_seed=8, log_dir=tmp_path)
@@ -0,0 +1,163 @@
+"""
+Tests for the shared CSR curvature engine (orc_engine.py).
+"""
+
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from orc_engine import (
+    CSRGraph,
+    CurvatureEngine,
+    HopDistanceOracle,
+    distance_matrix,
+    transport_constraints,
+)
+from orc_incremental import IncrementalCurvature
+from orc_parallel import parallel_edge_kappa
+
+
+def _dumbbell():
+    return CSRGraph.from_edges(6, [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (2, 3)])
+
+
+class TestCSRGraph:
+    """Test CSR graph construction."""
+
+    def test_from_edges_symmetrizes_and_dedupes(self):
+        g = CSRGraph.from_edges(4, [(1, 0), (0, 1), (2, 2), (3, 1), (1, 2)])
+        assert g.indices.dtype == np.int32
+        assert g.n_edges == 3
+        assert g.edges().tolist() == [[0, 1], [1, 2], [1, 3]]
+        assert g.neighbors(1).tolist() == [0, 2, 3]
+
+    def test_from_networkx_matches_adjacency(self, simple_graph):
+        g, nodes = CSRGraph.from_networkx(simple_graph)
+        adj = CSRGraph.from_adjacency({u: simple_graph[u] for u in simple_graph})
+        assert nodes == list(simple_graph.nodes())
+        np.testing.assert_array_equal(g.indptr, adj.indptr)
+        np.testing.assert_array_equal(g.indices, adj.indices)
+
+
+class TestHopDistanceOracle:
+    """Test the bounded-radius distance oracle against dense APSP."""
+
+    def test_blocks_match_capped_apsp(self):
+        graph, _ = CSRGraph.from_networkx(nx.gnm_random_graph(80, 200, seed=3))
+        dense = np.minimum(distance_matrix(graph), 3)
+        oracle = HopDistanceOracle(graph)
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            src = rng.choice(80, 12, replace=False)
+            tgt = rng.choice(80, 9, replace=False)
+            np.testing.assert_array_equal(oracle[np.ix_(src, tgt)], dense[np.ix_(src, tgt)])
+            assert oracle[src[0], tgt[0]] == dense[src[0], tgt[0]]
+
+
+class TestTransportLP:
+    """Test the cached transport-LP constraint templates."""
+
+    @pytest.mark.parametrize("n,m", [(3, 4), (12, 9)])
+    def test_constraints_match_dense_rows(self, n, m):
+        a_eq = transport_constraints(n, m)
+        dense = a_eq if isinstance(a_eq, np.ndarray) else a_eq.toarray()
+        plan = np.arange(n * m, dtype=float).reshape(n, m)
+        np.testing.assert_allclose(dense @ plan.ravel(), np.concatenate([plan.sum(1), plan.sum(0)]))
+        assert transport_constraints(n, m) is a_eq
+
+    def test_lp_profile_reports_timings(self):
+        profile = CurvatureEngine(_dumbbell()).lp_profile([(2, 3)])
+        assert profile["support_src"][0] == 4 and profile["support_tgt"][0] == 4
+        assert profile["build_s"][0] >= 0 and profile["solve_s"][0] > 0
+
+
+class TestCurvatureEngine:
+    """Test engine curvature against known closed-form values."""
+
+    def test_dumbbell_bridge(self):
+        kappas = CurvatureEngine(_dumbbell()).edge_kappa([(2, 3)])
+        assert abs(kappas[0] - (-1.0 / 3.0)) < 1e-9
+
+    def test_star_mean(self, star_graph):
+        graph, _ = CSRGraph.from_networkx(star_graph)
+        assert abs(CurvatureEngine(graph).mean_kappa() - 0.2) < 1e-9
+
+    @pytest.mark.parametrize("backend", ["emd", "sinkhorn"])
+    def test_backends_agree_with_lp(self, backend):
+        if backend == "emd":
+            pytest.importorskip("ot")
+        graph, _ = CSRGraph.from_networkx(nx.karate_club_graph())
+        exact = CurvatureEngine(graph, backend="lp").edge_kappa()
+        other = CurvatureEngine(graph, backend=backend).edge_kappa()
+        tol = 1e-9 if backend == "emd" else 5e-2
+        assert np.max(np.abs(exact - other)) < tol
+
+    @pytest.mark.parametrize("alpha", [0.5, 0.3])
+    def test_flow_matches_lp(self, alpha):
+        graph, _ = CSRGraph.from_networkx(nx.barabasi_albert_graph(60, 4, seed=7))
+        exact = CurvatureEngine(graph, alpha=alpha, backend="lp").edge_kappa()
+        flow = CurvatureEngine(graph, alpha=alpha, backend="flow").edge_kappa()
+        assert np.max(np.abs(exact - flow)) < 1e-12
+
+    def test_flow_is_exact_rational(self):
+        engine = CurvatureEngine(_dumbbell(), backend="flow")
+        assert engine.exact_w1(2, 3) == Fraction(4, 3)
+
+    def test_flow_rejects_weighted_graph(self, weighted_graph):
+        graph, _ = CSRGraph.from_networkx(weighted_graph, weight="weight")
+        with pytest.raises(ValueError):
+            CurvatureEngine(graph, backend="flow")
+
+
+class TestParallelEdgeKappa:
+    """Test the shared-memory edge-parallel driver."""
+
+    @pytest.mark.parametrize("backend", ["lp", "flow"])
+    def test_parallel_matches_serial(self, backend):
+        graph, _ = CSRGraph.from_networkx(nx.barabasi_albert_graph(50, 3, seed=11))
+        serial = CurvatureEngine(graph, backend=backend).edge_kappa()
+        parallel = parallel_edge_kappa(graph, backend=backend, workers=2, chunk_size=7)
+        np.testing.assert_array_equal(parallel, serial)
+
+
+class TestIncrementalCurvature:
+    """Test dirty-edge tracking under double-edge swaps."""
+
+    def test_matches_full_recompute(self):
+        g = nx.barabasi_albert_graph(60, 3, seed=5)
+        inc = IncrementalCurvature([set(g[u]) for u in range(60)])
+        inc.edge_kappa()
+        rng = np.random.default_rng(0)
+        for _ in range(8):
+            inc.run_swaps(2, rng, connected=True)
+            full = CurvatureEngine(inc.graph(), backend="flow").edge_kappa()
+            np.testing.assert_array_equal(inc.edge_kappa(), full)
+        assert inc.n_recomputed < 9 * g.number_of_edges()
+
+    def test_swap_preserves_degrees(self):
+        g = nx.gnm_random_graph(40, 100, seed=1)
+        inc = IncrementalCurvature([set(g[u]) for u in range(40)])
+        inc.run_swaps(50, np.random.default_rng(2))
+        np.testing.assert_array_equal(inc.graph().degree, [g.degree(u) for u in range(40)])
+
+    def test_persistent_engine_tracks_swaps(self):
+        # Sparse enough that connected=True undoes many swaps.
+        g = nx.random_labeled_tree(50, seed=3)
+        g.add_edges_from([(0, 25), (10, 40), (7, 33)])
+        inc = IncrementalCurvature([set(g[u]) for u in range(50)], backend="emd")
+        inc.edge_kappa()
+        engine = inc.engine
+        rng = np.random.default_rng(4)
+        for _ in range(5):
+            assert inc.run_swaps(3, rng, connected=True) == 3
+            kappa = inc.edge_kappa()
+            assert inc.engine is engine
+            fresh = inc.graph()
+            np.testing.assert_array_equal(engine.graph.indptr, fresh.indptr)
+            np.testing.assert_array_equal(engine.graph.indices, fresh.indices)
+            np.testing.assert_allclose(kappa, CurvatureEngine(fresh, backend="emd").edge_kappa(), atol=1e-12)
@@ -0,0 +1,66 @@
+"""
+Tests for the batched Sinkhorn ORC backend (orc_sinkhorn.py).
+"""
+
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from orc_engine import CSRGraph, CurvatureEngine, w1_sinkhorn
+from orc_sinkhorn import (
+    bucket_size,
+    sinkhorn_edge_kappa,
+    sinkhorn_edge_w1,
+    sinkhorn_lp_bias,
+)
+
+
+@pytest.fixture
+def karate_engine():
+    graph, _ = CSRGraph.from_networkx(nx.karate_club_graph())
+    return CurvatureEngine(graph, backend="flow")
+
+
+class TestBatchedSinkhorn:
+    """Test the padded, batched Sinkhorn solver against the per-edge one."""
+
+    def test_bucket_size_rounds_up(self):
+        assert bucket_size(1) == 8
+        assert bucket_size(8) == 8
+        assert bucket_size(9) == 16
+        assert bucket_size(5, bucket=4) == 8
+
+    def test_fixed_iterations_match_per_edge_solver(self, karate_engine):
+        edges = karate_engine.graph.edges()[:40]
+        w1, iters = sinkhorn_edge_w1(
+            karate_engine, edges, epsilon=0.05, max_iter=200, tol=0, scaling=None, relax=1.0
+        )
+        ref = [w1_sinkhorn(*karate_engine.transport_problem(int(u), int(v)), 0.05, 200)
+               for u, v in edges]
+        assert np.all(iters == 200)
+        np.testing.assert_allclose(w1, ref, rtol=1e-10, atol=1e-12)
+
+    def test_close_to_exact_at_small_epsilon(self, karate_engine):
+        kappa = sinkhorn_edge_kappa(karate_engine, epsilon=0.01)
+        exact = karate_engine.edge_kappa(karate_engine.graph.edges())
+        assert np.max(np.abs(kappa - exact)) < 5e-3
+
+    def test_bias_report(self, karate_engine):
+        report = sinkhorn_lp_bias(karate_engine, epsilon=0.05)
+        assert report["E"] == karate_engine.graph.n_edges
+        assert report["epsilon"] == 0.05
+        assert abs(report["bias_mean"]) < 5e-3
+        assert report["bias_mean"] == pytest.approx(
+            report["kappa_mean_sinkhorn"] - report["kappa_mean_exact"]
+        )
+
+    def test_padding_does_not_leak_mass(self):
+        # a star's leaf edges are padded far beyond their 2-node supports
+        engine = CurvatureEngine(CSRGraph.from_networkx(nx.star_graph(12))[0], backend="flow")
+        kappa = sinkhorn_edge_kappa(engine, epsilon=0.01)
+        exact = engine.edge_kappa(engine.graph.edges())
+        np.testing.assert_allclose(kappa, exact, atol=1e-3)
@@ -23,7 +23,8 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from sedenion_mandelbrot import (
-    Sedenion, _cd_mul, mandelbrot_orbit, sedenion_features, graph_to_sedenion
+    Sedenion, _cd_mul, mandelbrot_orbit, sedenion_features, sedenion_features_batch, graph_to_sedenion,
+    _hessian_pairs, _mixed_partials_dual, _mixed_partials_stencil,
 )
 
 
@@ -195,6 +196,30 @@ def test_gate10_feature_discriminability_asd_vs_adhd():
     )
 
 
+# =============================================================================
+# Batched orbits and Hessian stencils
+# =============================================================================
+
+def test_batch_features_match_single_graph():
+    """sedenion_features_batch must agree with per-graph sedenion_features."""
+    graphs = [nx.random_regular_graph(k, 30, seed=k) for k in (3, 4, 6, 10)]
+    batch = sedenion_features_batch(graphs, max_iter=40)
+    single = np.array([sedenion_features(G, max_iter=40) for G in graphs])
+    np.testing.assert_allclose(batch, single, rtol=1e-12, atol=1e-12)
+
+
+def test_dual_hessian_matches_stencil():
+    """Exact hyper-dual mixed partials agree with the central-difference stencil."""
+    rng = np.random.default_rng(0)
+    c = 0.1 * rng.normal(size=(3, 16))
+    z0 = 0.1 * rng.normal(size=(3, 16))
+    pairs = _hessian_pairs(4)
+    stencil, _ = _mixed_partials_stencil(c, z0, pairs, 20, 1e3, 1e-4)
+    exact, exact_swapped = _mixed_partials_dual(c, z0, pairs, 20, 1e3)
+    np.testing.assert_allclose(stencil, exact, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(exact, exact_swapped, rtol=1e-12, atol=1e-12)
+
+
 # =============================================================================
 # Summary report
 # =============================================================================
@@ -0,0 +1,121 @@
+"""
+Tests for the batched, cached graph-spectrum service.
+"""
+
+import pytest
+import networkx as nx
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import spectrum
+from spectrum import SpectrumService, entropy_from_eigenvalues, graph_hash, laplacian
+
+
+def _dense_spectrum(G, kind="normalized"):
+    return np.linalg.eigvalsh(laplacian(G, kind).toarray())
+
+
+@pytest.fixture
+def weighted_graph():
+    G = nx.les_miserables_graph()
+    G.add_edge("Valjean", "Valjean", weight=2.5)
+    G.add_node("isolated")
+    return G
+
+
+class TestEigenvalues:
+    """Batched, Lanczos and cached spectra match a dense per-graph eigvalsh."""
+
+    def test_full_batch_matches_per_graph(self, weighted_graph):
+        graphs = [nx.random_regular_graph(4, 30, seed=s) for s in range(5)] + [weighted_graph, nx.path_graph(3)]
+        spectra = SpectrumService().full_batch(graphs)
+
+        for G, values in zip(graphs, spectra):
+            np.testing.assert_array_equal(values, _dense_spectrum(G))
+
+    def test_lanczos_smallest_matches_dense(self, monkeypatch):
+        monkeypatch.setattr(spectrum, "LANCZOS_MIN_NODES", 50)
+        G = nx.barabasi_albert_graph(300, 3, seed=0)
+
+        np.testing.assert_allclose(SpectrumService().smallest(G, 8), _dense_spectrum(G)[:8], atol=1e-10)
+
+    @pytest.mark.parametrize("case", ["isolated_nodes", "disjoint_cycles"])
+    def test_lanczos_smallest_keeps_one_zero_per_component(self, case):
+        if case == "isolated_nodes":
+            G = nx.barabasi_albert_graph(1100, 3, seed=0)
+            G.add_nodes_from(range(1100, 1130))
+        else:
+            G = nx.disjoint_union_all([nx.cycle_graph(100) for _ in range(12)])
+        assert G.number_of_nodes() >= spectrum.LANCZOS_MIN_NODES
+
+        values = SpectrumService().smallest(G, 8)
+        np.testing.assert_allclose(values, _dense_spectrum(G)[:8], atol=1e-10)
+        assert np.count_nonzero(values == 0.0) == min(8, nx.number_connected_components(G))
+
+    def test_small_graph_returns_all_eigenvalues(self):
+        assert SpectrumService().smallest(nx.path_graph(4), 8).shape == (4,)
+
+    def test_disk_cache_roundtrip(self, tmp_path):
+        G = nx.karate_club_graph()
+        first = SpectrumService(cache_dir=tmp_path).full(G)
+        again = SpectrumService(cache_dir=tmp_path).full(G)
+
+        np.testing.assert_array_equal(first, again)
+        assert len(list(tmp_path.glob("normalized-full/*.npy"))) == 1
+
+    def test_hash_tracks_weights(self):
+        G = nx.cycle_graph(5)
+        H = G.copy()
+        nx.set_edge_attributes(H, 2.0, "weight")
+
+        assert graph_hash(G) != graph_hash(H)
+        assert graph_hash(G, weight=None) == graph_hash(H, weight=None)
+
+
+class TestSpectralEntropy:
+    """Exact entropy follows the scripts' formula; SLQ approximates it."""
+
+    @pytest.mark.parametrize("kind", ["normalized", "combinatorial"])
+    def test_exact_matches_formula(self, weighted_graph, kind):
+        expected = entropy_from_eigenvalues(_dense_spectrum(weighted_graph, kind))
+
+        assert SpectrumService().spectral_entropy(weighted_graph, kind=kind, method="exact") == expected
+
+    @pytest.mark.parametrize("kind", ["normalized", "combinatorial"])
+    def test_slq_is_close_to_exact(self, kind):
+        G = nx.barabasi_albert_graph(600, 3, seed=1)
+        service = SpectrumService()
+        exact = service.spectral_entropy(G, kind=kind, method="exact")
+        approx = service.spectral_entropy(G, kind=kind, method="slq", n_probes=64)
+
+        assert approx == pytest.approx(exact, rel=1e-2)
+
+    def test_slq_estimates_are_cached(self, tmp_path, monkeypatch):
+        G = nx.barabasi_albert_graph(200, 3, seed=2)
+        first = SpectrumService(cache_dir=tmp_path).spectral_entropy(G, method="slq")
+        other_seed = SpectrumService(cache_dir=tmp_path).spectral_entropy(G, method="slq", seed=1)
+
+        monkeypatch.setattr(spectrum, "slq_trace", lambda *args, **kwargs: pytest.fail("SLQ recomputed"))
+        assert SpectrumService(cache_dir=tmp_path).spectral_entropy(G, method="slq") == first
+        assert first != other_seed
+        assert len(list(tmp_path.glob("normalized-slq-*/*.npy"))) == 2
+
+    def test_auto_switches_to_slq_above_threshold(self, monkeypatch):
+        G = nx.barabasi_albert_graph(100, 3, seed=3)
+        service = SpectrumService()
+        monkeypatch.setattr(spectrum, "DENSE_MAX_NODES", 99)
+
+        assert service.spectral_entropy(G) == service.spectral_entropy(G, method="slq")
+        assert service.spectral_entropy(G) != service.spectral_entropy(G, method="exact")
+
+    def test_unknown_method_raises(self):
+        with pytest.raises(ValueError):
+            SpectrumService().spectral_entropy(nx.path_graph(3), method="kpm")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
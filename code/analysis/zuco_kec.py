@@ -19,12 +19,15 @@ or group claim — a methods closure showing real ZuCo EEG flows through the KEC
 """
 
 import json
+import sys
 from pathlib import Path
 import numpy as np
 import h5py
 from scipy.signal import butter, filtfilt, coherence
 import networkx as nx
-import ot
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from orc_engine import CSRGraph, CurvatureEngine  # noqa: E402
 
 MAT = Path(__file__).resolve().parents[2] / "data/external/zuco/gip_ZAB_SR5_EEG.mat"
 OUT = Path(__file__).resolve().parents[2] / "results/unified"
@@ -86,23 +89,8 @@ def von_neumann_entropy(g):
 
 
 def mean_orc(g):
-    dist = dict(nx.all_pairs_dijkstra_path_length(g, weight="d"))
-    ks = []
-    for u, v in g.edges():
-        def mu(x):
-            nb = list(g.neighbors(x)); m = {x: ALPHA}
-            wsum = sum(g[x][z]["w"] for z in nb) if nb else 0.0
-            for z in nb:
-                m[z] = m.get(z, 0.0) + (1 - ALPHA) * (g[x][z]["w"] / wsum if wsum > 0 else 1.0 / len(nb))
-            return m
-        m_u, m_v = mu(u), mu(v)
-        su, sv = list(m_u), list(m_v)
-        a = np.array([m_u[x] for x in su]); b = np.array([m_v[x] for x in sv])
-        M = np.array([[dist[s].get(t, 5) for t in sv] for s in su], float)
-        duv = g[u][v]["d"]
-        if duv > 0:
-            ks.append(1.0 - ot.emd2(a, b, M) / duv)
-    return float(np.mean(ks)) if ks else float("nan")
+    graph, _ = CSRGraph.from_networkx(g, weight="w", length="d")
+    return CurvatureEngine(graph, alpha=ALPHA, backend="emd", unreachable_cost=5).mean_kappa()
 
 
 def build_graph(Cmat):
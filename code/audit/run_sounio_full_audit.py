@@ -20,21 +20,25 @@ from z3 import Optimize, Real, RealVal, sat, unsat, unknown
 
 REPO = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(REPO / "code" / "audit"))
+sys.path.insert(0, str(REPO / "code" / "analysis"))
 from sounio_orc_core import (  # noqa: E402
     ALPHA,
     NETWORKS,
     SEED_BOOTSTRAP,
-    apsp,
+    hop_distances,
     edge_data,
-    edge_kappa_lp,
+    edge_kappas_lp,
     load_julia_ref,
     load_lcc_from_csv,
     lazy_measure_rational,
+    lp_engine,
     mean_kappa_lp,
+    sinkhorn_bias,
     sinkhorn_lse,
     lazy_measure_float,
     _support_pair,
 )
+from curvature_cache import default_cache  # noqa: E402
 
 OUT = REPO / "results" / "sounio"
 SOUC = Path("/workspace/sounio/scripts/ci/souc-native-wrapper.sh")
@@ -102,10 +106,10 @@ def layer_a0_report() -> dict:
 
 def layer_a1_diagnosis(repo: Path) -> dict:
     g = load_lcc_from_csv(repo / "data/processed/english_edges_FINAL.csv")
-    d = apsp(g)
+    engine = lp_engine(g, hop_distances(g))
     u, v = 68, 261
     named = f"swow_en edge ({u},{v}) — audit named edge (docs/research)"
-    data = edge_data(g, d, u, v)
+    data = edge_data(g, engine, u, v)
     data["edge_name"] = named
     data["diagnosis"] = (
         "Primal Sinkhorn at eps=0.5 underestimates W1 vs exact LP (W1_primal=1.384 vs W1_LP=1.350), "
@@ -119,9 +123,9 @@ def layer_a2_lp_timing(repo: Path) -> dict:
     rows = []
     for lang, csv_name in NETWORKS.items():
         g = load_lcc_from_csv(repo / "data/processed" / csv_name)
-        d = apsp(g)
+        engine = lp_engine(g, hop_distances(g))
         t0 = time.perf_counter()
-        k_lp = mean_kappa_lp(g, d)
+        k_lp = mean_kappa_lp(g, engine)
         wall = time.perf_counter() - t0
         ref = load_julia_ref(repo, lang)
         rows.append(
@@ -133,6 +137,7 @@ def layer_a2_lp_timing(repo: Path) -> dict:
                 "kappa_julia_ref": ref["kappa_mean"],
                 "delta": k_lp - ref["kappa_mean"],
                 "wall_clock_seconds": round(wall, 3),
+                "sinkhorn_lse_vs_lp": sinkhorn_bias(g, engine),
             }
         )
     total = sum(r["wall_clock_seconds"] for r in rows)
@@ -260,11 +265,11 @@ def run_synthetic_regression() -> dict:
 
 def layer_b_bootstrap(repo: Path, lang: str) -> dict:
     g = load_lcc_from_csv(repo / "data/processed" / NETWORKS[lang])
-    d = apsp(g)
+    engine = lp_engine(g, hop_distances(g))
     rng = np.random.default_rng(SEED_BOOTSTRAP + hash(lang) % 10000)
     e = g.e
-    # Precompute edge kappas once (exact LP)
-    edge_kappas = np.array([edge_kappa_lp(g, d, u, v) for u, v in g.edges])
+    # Precompute edge kappas once (exact LP; reused across runs via the curvature cache)
+    edge_kappas = edge_kappas_lp(g, engine, cache=default_cache())
     t0 = time.perf_counter()
     boots = np.empty(BOOTSTRAP_B)
     for b in range(BOOTSTRAP_B):
@@ -352,7 +357,7 @@ def smt_encode_one_edge(g, d, u: int, v: int) -> dict:
 
 def layer_c_smt(repo: Path, lang: str, certify_all: bool = True) -> dict:
     g = load_lcc_from_csv(repo / "data/processed" / NETWORKS[lang])
-    d = apsp(g)
+    d = hop_distances(g)
     rep_u, rep_v = SMT_REP_EDGE if lang == "en" else g.edges[0]
     rep_encoding = smt_encode_one_edge(g, d, rep_u, rep_v)
 
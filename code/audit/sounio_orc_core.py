@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import csv
 import json
+import sys
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass
@@ -13,7 +14,12 @@ from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Tuple
 
 import numpy as np
-from scipy.optimize import linprog
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analysis"))
+from curvature_cache import CurvatureCache  # noqa: E402
+from orc_engine import CSRGraph, CurvatureEngine, HopDistanceOracle, w1_lp  # noqa: E402
+from orc_parallel import parallel_edge_kappa  # noqa: E402
+from orc_sinkhorn import sinkhorn_edge_kappa, sinkhorn_lp_bias  # noqa: E402
 
 ALPHA = Fraction(1, 2)
 SEED_BOOTSTRAP = 456
@@ -85,21 +91,9 @@ def load_lcc_from_csv(csv_path: Path) -> Graph:
     return Graph(n=len(lcc), edges=edges, adj=dict(adj))
 
 
-def apsp(g: Graph) -> np.ndarray:
-    n = g.n
-    d = np.full((n, n), -1, dtype=int)
-    for src in range(n):
-        dist = [-1] * n
-        dist[src] = 0
-        q = deque([src])
-        while q:
-            u = q.popleft()
-            for v in g.adj[u]:
-                if dist[v] < 0:
-                    dist[v] = dist[u] + 1
-                    q.append(v)
-        d[src] = dist
-    return d
+def hop_distances(g: Graph) -> HopDistanceOracle:
+    """Bounded-radius (<= 3 hop) distance oracle; exact on every ORC support."""
+    return HopDistanceOracle(CSRGraph.from_adjacency(g.adj, n=g.n))
 
 
 def lazy_measure_rational(g: Graph, node: int) -> Dict[int, Fraction]:
@@ -135,32 +129,7 @@ def _support_pair(
 def exact_w1_lp(
     mu_vec: np.ndarray, nu_vec: np.ndarray, cost: np.ndarray
 ) -> float:
-    n = len(mu_vec)
-    c = cost.reshape(-1)
-    a_eq = []
-    b_eq = []
-    for i in range(n):
-        row = np.zeros(n * n)
-        for j in range(n):
-            row[i * n + j] = 1.0
-        a_eq.append(row)
-        b_eq.append(mu_vec[i])
-    for j in range(n):
-        row = np.zeros(n * n)
-        for i in range(n):
-            row[i * n + j] = 1.0
-        a_eq.append(row)
-        b_eq.append(nu_vec[j])
-    res = linprog(
-        c,
-        A_eq=np.array(a_eq),
-        b_eq=np.array(b_eq),
-        bounds=(0.0, None),
-        method="highs",
-    )
-    if not res.success:
-        raise RuntimeError(f"LP failed: {res.message}")
-    return float(res.fun)
+    return w1_lp(mu_vec, nu_vec, cost)
 
 
 def sinkhorn_primal(
@@ -176,12 +145,8 @@ def sinkhorn_primal(
     v = np.ones(n)
     floor = 1e-300
     for _ in range(max_iter):
-        for i in range(n):
-            s = max(np.dot(k[i], v), floor)
-            u[i] = mu_vec[i] / s
-        for j in range(n):
-            s = max(np.dot(k[:, j], u), floor)
-            v[j] = nu_vec[j] / s
+        u = mu_vec / np.maximum(k @ v, floor)
+        v = nu_vec / np.maximum(k.T @ u, floor)
     p = (u[:, None] * k) * v[None, :]
     return float((p * cost).sum())
 
@@ -200,43 +165,65 @@ def sinkhorn_lse(
     logu = np.zeros(n)
     logv = np.zeros(n)
     for _ in range(max_iter):
-        for i in range(n):
-            logu[i] = log_mu[i] - np.logaddexp.reduce(logk[i] + logv)
-        for j in range(n):
-            logv[j] = log_nu[j] - np.logaddexp.reduce(logk[:, j] + logu)
+        logu = log_mu - np.logaddexp.reduce(logk + logv[None, :], axis=1)
+        logv = log_nu - np.logaddexp.reduce(logk + logu[:, None], axis=0)
     p = np.exp(logu[:, None] + logk + logv[None, :])
     return float((p * cost).sum())
 
 
-def edge_kappa_lp(g: Graph, d: np.ndarray, u: int, v: int) -> float:
-    d_uv = int(d[u, v])
-    if d_uv <= 0:
-        return 0.0
-    mu = lazy_measure_float(g, u)
-    nu = lazy_measure_float(g, v)
-    nodes, mu_vec, nu_vec, _ = _support_pair(mu, nu)
-    c = np.array(
-        [[d[nodes[i], nodes[j]] for j in range(len(nodes))] for i in range(len(nodes))],
-        dtype=float,
+def lp_engine(g: Graph, d: HopDistanceOracle) -> CurvatureEngine:
+    """CSR curvature engine over `g` with `d` as the ground cost.
+
+    Build it once per network and pass it to the per-network functions below.
+    """
+    return CurvatureEngine(
+        CSRGraph.from_adjacency(g.adj, n=g.n), alpha=float(ALPHA), backend="lp", dist=d
     )
-    w1 = exact_w1_lp(mu_vec, nu_vec, c)
-    return 1.0 - w1 / d_uv
 
 
-def mean_kappa_lp(g: Graph, d: np.ndarray) -> float:
-    kappas = [edge_kappa_lp(g, d, u, v) for u, v in g.edges]
-    return float(np.mean(kappas))
+def edge_kappas_lp(
+    g: Graph, engine: CurvatureEngine, workers: int = 1, cache: CurvatureCache | None = None
+) -> np.ndarray:
+    """Per-edge exact-LP kappa in `g.edges` order (NaN where d_uv <= 0)."""
+    if workers <= 1 and cache is None:
+        return engine.edge_kappa(g.edges)
+    # Workers rebuild the hop oracle from the shared CSR arrays.
+    return parallel_edge_kappa(
+        engine.graph, g.edges, alpha=float(ALPHA), backend="lp", workers=workers, cache=cache
+    )
+
+
+def mean_kappa_lp(g: Graph, engine: CurvatureEngine, workers: int = 1) -> float:
+    return float(np.mean(edge_kappas_lp(g, engine, workers)))
+
+
+def edge_kappas_sinkhorn(
+    g: Graph, engine: CurvatureEngine, epsilon: float = 0.01, max_iter: int = 1000
+) -> np.ndarray:
+    """Per-edge kappa of the fixed-iteration LSE solver (`sinkhorn_lse`), batched."""
+    return sinkhorn_edge_kappa(
+        engine, g.edges, epsilon=epsilon, max_iter=max_iter,
+        tol=0.0, scaling=None, relax=1.0,
+    )
+
 
+def sinkhorn_bias(
+    g: Graph, engine: CurvatureEngine, epsilon: float = 0.01, max_iter: int = 1000
+) -> dict:
+    """Network-level Sinkhorn-LSE vs exact-LP kappa bias (cf. `edge_data`)."""
+    return sinkhorn_lp_bias(
+        engine, g.edges, epsilon=epsilon, max_iter=max_iter,
+        tol=0.0, scaling=None, relax=1.0,
+    )
 
-def edge_data(g: Graph, d: np.ndarray, u: int, v: int) -> dict:
+
+def edge_data(g: Graph, engine: CurvatureEngine, u: int, v: int) -> dict:
+    d = engine.metric
     d_uv = int(d[u, v])
     mu = lazy_measure_float(g, u)
     nu = lazy_measure_float(g, v)
     nodes, mu_vec, nu_vec, _ = _support_pair(mu, nu)
-    c = np.array(
-        [[d[nodes[i], nodes[j]] for j in range(len(nodes))] for i in range(len(nodes))],
-        dtype=float,
-    )
+    c = np.asarray(d[np.ix_(nodes, nodes)], dtype=float)
     w1_lp = exact_w1_lp(mu_vec, nu_vec, c)
     w1_primal_05 = sinkhorn_primal(mu_vec, nu_vec, c, 0.5, 80)
     w1_lse_001 = sinkhorn_lse(mu_vec, nu_vec, c, 0.01, 1000)
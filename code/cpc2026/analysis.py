@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Callable
 
 import numpy as np
 import pandas as pd
@@ -27,8 +28,12 @@ from common import (
     save_json,
     seed_everything,
     summarize_ci,
-    to_step_matrix,
-    trajectory_path,
+)
+from trajectory_store import (
+    DEFAULT_CHUNK_SIZE,
+    RegimeTrajectories,
+    StepwiseMoments,
+    load_regime_trajectories,
 )
 
 
@@ -43,27 +48,218 @@ def cohens_d(x: np.ndarray, y: np.ndarray) -> float:
     return float((y.mean() - x.mean()) / pooled)
 
 
+# Resampled statistics are functions of per-sample moments (n, mean, variance),
+# so a whole (B, n) block of resamples reduces to three (B,) arrays.
+Moments = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _pooled_cohens_d(x: Moments, y: Moments) -> np.ndarray:
+    (nx, mx, vx), (ny, my, vy) = x, y
+    pooled = np.sqrt(((nx - 1) * vx + (ny - 1) * vy) / (nx + ny - 2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(pooled == 0.0, 0.0, (my - mx) / pooled)
+
+
+VECTORIZED_STATISTICS: dict[str, Callable[[Moments, Moments | None], np.ndarray]] = {
+    "mean": lambda x, y: x[1],
+    "variance": lambda x, y: x[2],
+    "mean_difference": lambda x, y: y[1] - x[1],
+    "percent_increase": lambda x, y: (y[1] / x[1] - 1.0) * 100.0,
+    "cohens_d": _pooled_cohens_d,
+}
+TWO_SAMPLE_STATISTICS = frozenset({"mean_difference", "percent_increase", "cohens_d"})
+BOOTSTRAP_BLOCK_ELEMENTS = 1 << 22
+
+
+def _moments(values: np.ndarray) -> Moments:
+    """(n, mean, variance with ddof=1) along the last axis."""
+
+    n = values.shape[-1]
+    mean = values.mean(axis=-1)
+    variance = values.var(axis=-1, ddof=1) if n > 1 else np.full_like(mean, np.nan)
+    return np.full_like(mean, n), mean, variance
+
+
+def _resample_moments(values: np.ndarray, index: np.ndarray) -> Moments:
+    """Moments of each row of `values[index]` from one gather and two row sums.
+
+    Values are shifted by their sample mean first, which keeps the
+    sum-of-squares variance free of cancellation.
+    """
+
+    shift = values.mean()
+    sample = (values - shift)[index]
+    n = index.shape[-1]
+    first = sample.sum(axis=-1)
+    second = np.einsum("ij,ij->i", sample, sample)
+    variance = (second - first**2 / n) / (n - 1) if n > 1 else np.full(len(first), np.nan)
+    return np.full(len(first), float(n)), shift + first / n, variance
+
+
+def _jackknife_moments(values: np.ndarray) -> Moments:
+    """Leave-one-out moments of a 1D sample, in closed form."""
+
+    n = len(values)
+    deviation = values - values.mean()
+    mean = values.mean() - deviation / (n - 1)
+    m2 = np.sum(deviation**2) - deviation**2 * n / (n - 1)
+    variance = m2 / (n - 2) if n > 2 else np.full(n, np.nan)
+    return np.full(n, n - 1.0), mean, variance
+
+
+def _block_sizes(n_bootstrap: int, n_values: int) -> list[int]:
+    rows = max(1, BOOTSTRAP_BLOCK_ELEMENTS // max(n_values, 1))
+    return [min(rows, n_bootstrap - start) for start in range(0, n_bootstrap, rows)]
+
+
+def _evaluate_resample(args: tuple) -> float:
+    statistic, x, y, x_index, y_index = args
+    return float(statistic(x[x_index]) if y is None else statistic(x[x_index], y[y_index]))
+
+
 def bootstrap_statistic(
     x: np.ndarray,
     y: np.ndarray | None,
-    statistic,
+    statistic: str | Callable,
     n_bootstrap: int = 1_000,
     seed: int = DEFAULT_SEED,
+    n_jobs: int = 1,
 ) -> np.ndarray:
-    """Bootstrap a scalar statistic over one or two samples."""
+    """Bootstrap a scalar statistic over one or two samples.
 
+    `statistic` is either a name from `VECTORIZED_STATISTICS`, evaluated for
+    all resamples at once, or a callable applied to each resample. Resample
+    indices are drawn as (block, n) matrices sized to keep about
+    `BOOTSTRAP_BLOCK_ELEMENTS` indices in memory. Callables run in a process
+    pool when `n_jobs > 1` (they must then be picklable module-level
+    functions).
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = None if y is None else np.asarray(y, dtype=float)
     rng = np.random.default_rng(seed)
     draws = np.empty(n_bootstrap, dtype=float)
-    for idx in range(n_bootstrap):
-        x_sample = x[rng.integers(0, len(x), size=len(x))]
-        if y is None:
-            draws[idx] = statistic(x_sample)
-        else:
-            y_sample = y[rng.integers(0, len(y), size=len(y))]
-            draws[idx] = statistic(x_sample, y_sample)
+    vectorized = VECTORIZED_STATISTICS.get(statistic) if isinstance(statistic, str) else None
+    if isinstance(statistic, str) and vectorized is None:
+        raise ValueError(f"Unknown bootstrap statistic {statistic!r}; expected one of {sorted(VECTORIZED_STATISTICS)}.")
+    if vectorized is not None and (statistic in TWO_SAMPLE_STATISTICS) != (y is not None):
+        raise ValueError(f"Bootstrap statistic {statistic!r} takes {'two samples' if y is None else 'one sample'}.")
+
+    pool = None
+    if vectorized is None and n_jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=n_jobs)
+    try:
+        start = 0
+        for rows in _block_sizes(n_bootstrap, len(x) + (0 if y is None else len(y))):
+            x_index = rng.integers(0, len(x), size=(rows, len(x)), dtype=np.int32)
+            y_index = None if y is None else rng.integers(0, len(y), size=(rows, len(y)), dtype=np.int32)
+            block = slice(start, start + rows)
+            if vectorized is not None:
+                draws[block] = vectorized(
+                    _resample_moments(x, x_index), None if y is None else _resample_moments(y, y_index)
+                )
+            else:
+                tasks = [
+                    (statistic, x, y, x_index[row], None if y is None else y_index[row]) for row in range(rows)
+                ]
+                mapper = pool.map if pool is not None else map
+                draws[block] = list(mapper(_evaluate_resample, tasks))
+            start += rows
+    finally:
+        if pool is not None:
+            pool.shutdown()
     return draws
 
 
+def _jackknife_values(x: np.ndarray, y: np.ndarray | None, statistic: str | Callable) -> list[np.ndarray]:
+    """Leave-one-out statistic values, one array per sample."""
+
+    if isinstance(statistic, str):
+        vectorized = VECTORIZED_STATISTICS[statistic]
+        if y is None:
+            return [np.asarray(vectorized(_jackknife_moments(x), None))]
+        x_full = tuple(np.asarray(m) for m in _moments(x))
+        y_full = tuple(np.asarray(m) for m in _moments(y))
+        return [
+            np.asarray(vectorized(_jackknife_moments(x), y_full)),
+            np.asarray(vectorized(x_full, _jackknife_moments(y))),
+        ]
+
+    def leave_out(values: np.ndarray) -> list[np.ndarray]:
+        return [np.delete(values, i) for i in range(len(values))]
+
+    if y is None:
+        return [np.array([statistic(sample) for sample in leave_out(x)])]
+    return [
+        np.array([statistic(sample, y) for sample in leave_out(x)]),
+        np.array([statistic(x, sample) for sample in leave_out(y)]),
+    ]
+
+
+def bca_interval(
+    x: np.ndarray,
+    y: np.ndarray | None,
+    statistic: str | Callable,
+    draws: np.ndarray,
+    confidence: float = 0.95,
+) -> tuple[float, float]:
+    """Bias-corrected and accelerated interval from bootstrap `draws`.
+
+    The acceleration comes from the jackknife of each sample in turn (closed
+    form for the named statistics), as in Efron & Tibshirani (1993, ch. 14).
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = None if y is None else np.asarray(y, dtype=float)
+    if isinstance(statistic, str):
+        observed = float(VECTORIZED_STATISTICS[statistic](_moments(x), None if y is None else _moments(y)))
+    else:
+        observed = float(statistic(x) if y is None else statistic(x, y))
+    draws = np.asarray(draws, dtype=float)
+    draws = draws[np.isfinite(draws)]
+
+    below = np.mean(draws < observed) + 0.5 * np.mean(draws == observed)
+    z0 = stats.norm.ppf(np.clip(below, 1.0 / (len(draws) + 1), 1.0 - 1.0 / (len(draws) + 1)))
+
+    numerator = 0.0
+    denominator = 0.0
+    for values in _jackknife_values(x, y, statistic):
+        n = len(values)
+        influence = (n - 1) * (values.mean() - values)
+        numerator += np.sum(influence**3) / n**3
+        denominator += np.sum(influence**2) / n**2
+    acceleration = numerator / (6.0 * denominator**1.5) if denominator > 0 else 0.0
+
+    tail = (1.0 - confidence) / 2.0
+    bounds = []
+    for z_alpha in stats.norm.ppf([tail, 1.0 - tail]):
+        shifted = z0 + (z0 + z_alpha) / (1.0 - acceleration * (z0 + z_alpha))
+        bounds.append(float(np.quantile(draws, stats.norm.cdf(shifted))))
+    return bounds[0], bounds[1]
+
+
+def bootstrap_ci(
+    x: np.ndarray,
+    y: np.ndarray | None,
+    statistic: str | Callable,
+    n_bootstrap: int = 1_000,
+    seed: int = DEFAULT_SEED,
+    method: str = "percentile",
+    confidence: float = 0.95,
+    n_jobs: int = 1,
+) -> tuple[float, float]:
+    """Percentile or BCa bootstrap confidence interval for a statistic."""
+
+    draws = bootstrap_statistic(x, y, statistic, n_bootstrap=n_bootstrap, seed=seed, n_jobs=n_jobs)
+    if method == "percentile":
+        return summarize_ci(draws, confidence)
+    if method == "bca":
+        return bca_interval(x, y, statistic, draws, confidence)
+    raise ValueError(f"Unknown bootstrap interval method {method!r}; expected 'percentile' or 'bca'.")
+
+
 def dfa_hurst(series: np.ndarray) -> float:
     """Estimate the Hurst exponent via detrended fluctuation analysis."""
 
@@ -155,55 +351,73 @@ def dfa_hurst_matrix(matrix: np.ndarray) -> np.ndarray:
     return slopes
 
 
-def summarize_regime(
-    regime: str,
-    frame: pd.DataFrame,
-    high_entropy_threshold: float,
-    n_bootstrap: int,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Compute per-trajectory and per-step summaries for one regime."""
+def _trajectory_statistics(walks: RegimeTrajectories, high_entropy_threshold: float) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Per-trajectory statistics and the entropy production matrix of one block of walks."""
 
-    c_ent = to_step_matrix(frame, "C_ent")
-    entropy = to_step_matrix(frame, "entropy")
-    kappa = to_step_matrix(frame, "kappa")
+    c_ent = walks.c_ent
+    entropy = walks.entropy
+    kappa = walks.kappa
 
-    c_ent_variance = c_ent.var(axis=1, ddof=1)
     residence_steps = (entropy >= high_entropy_threshold).sum(axis=1)
-    residence_fraction = residence_steps / entropy.shape[1]
     entropy_production = np.concatenate(
         [np.zeros((entropy.shape[0], 1), dtype=float), np.abs(np.diff(entropy, axis=1))],
         axis=1,
     )
-    entropy_production_rate = entropy_production[:, 1:].mean(axis=1)
-    hurst_exponents = dfa_hurst_matrix(c_ent)
+    columns = {
+        "c_ent_variance": c_ent.var(axis=1, ddof=1),
+        "residence_steps_high_entropy": residence_steps.astype(np.int32),
+        "residence_fraction_high_entropy": residence_steps / entropy.shape[1],
+        "entropy_production_rate": entropy_production[:, 1:].mean(axis=1),
+        "hurst_exponent": dfa_hurst_matrix(c_ent),
+        "mean_C_ent": c_ent.mean(axis=1),
+        "mean_entropy": entropy.mean(axis=1),
+        "mean_kappa": kappa.mean(axis=1),
+    }
+    return columns, entropy_production
+
+
+def summarize_regime(
+    regime: str,
+    walks: RegimeTrajectories,
+    high_entropy_threshold: float,
+    n_bootstrap: int,
+    chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute per-trajectory and per-step summaries for one regime.
+
+    Trajectories are processed `chunk_size` rows at a time, so peak memory is
+    set by the chunk rather than by the number of trajectories; per-step means
+    are merged across chunks online. `chunk_size=None` processes the regime in
+    one block.
+    """
+
+    blocks: list[dict[str, np.ndarray]] = []
+    production = StepwiseMoments(walks.shape[1])
+    for _, chunk in walks.chunks(chunk_size):
+        columns, entropy_production = _trajectory_statistics(chunk, high_entropy_threshold)
+        blocks.append(columns)
+        production.update(entropy_production)
 
     stats_frame = pd.DataFrame(
         {
             "regime": regime,
-            "trajectory_id": np.arange(c_ent.shape[0], dtype=np.int32),
-            "c_ent_variance": c_ent_variance,
-            "residence_steps_high_entropy": residence_steps.astype(np.int32),
-            "residence_fraction_high_entropy": residence_fraction,
-            "entropy_production_rate": entropy_production_rate,
-            "hurst_exponent": hurst_exponents,
-            "mean_C_ent": c_ent.mean(axis=1),
-            "mean_entropy": entropy.mean(axis=1),
-            "mean_kappa": kappa.mean(axis=1),
+            "trajectory_id": np.arange(walks.shape[0], dtype=np.int32),
+            **{column: np.concatenate([block[column] for block in blocks]) for column in blocks[0]},
         }
     )
 
     production_frame = pd.DataFrame(
         {
             "regime": regime,
-            "step": np.arange(c_ent.shape[1], dtype=np.int16),
-            "mean_entropy_production": entropy_production.mean(axis=0),
+            "step": np.arange(walks.shape[1], dtype=np.int16),
+            "mean_entropy_production": production.mean,
         }
     )
 
     return stats_frame, production_frame
 
 
-def pick_example_trajectories(frame: pd.DataFrame, stats_frame: pd.DataFrame, n_examples: int = 5) -> pd.DataFrame:
+def pick_example_trajectories(walks: RegimeTrajectories, stats_frame: pd.DataFrame, n_examples: int = 5) -> pd.DataFrame:
     """Select representative trajectories spanning the C_ent variance distribution."""
 
     quantiles = np.quantile(stats_frame["c_ent_variance"], np.linspace(0.1, 0.9, n_examples))
@@ -213,7 +427,7 @@ def pick_example_trajectories(frame: pd.DataFrame, stats_frame: pd.DataFrame, n_
         remaining["distance"] = (remaining["c_ent_variance"] - quantile).abs()
         selected.append(int(remaining.sort_values("distance").iloc[0]["trajectory_id"]))
 
-    return frame.loc[frame["trajectory_id"].isin(selected)].copy()
+    return walks.to_frame(selected)
 
 
 def parse_args() -> argparse.Namespace:
@@ -226,6 +440,18 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Analyze whatever artifacts are present and print a compact summary.",
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Trajectories analyzed per block (0 loads each regime at once).",
+    )
+    parser.add_argument(
+        "--ci-method",
+        choices=("percentile", "bca"),
+        default="percentile",
+        help="Bootstrap confidence interval method.",
+    )
     return parser.parse_args()
 
 
@@ -253,54 +479,51 @@ def main() -> None:
 
     for offset, regime_cfg in enumerate(REGIME_CONFIGS):
         regime = regime_cfg.name
-        frame = pd.read_parquet(trajectory_path(regime))
+        walks = load_regime_trajectories(regime)
         stats_frame, production_frame = summarize_regime(
             regime=regime,
-            frame=frame,
+            walks=walks,
             high_entropy_threshold=high_entropy_threshold,
             n_bootstrap=args.bootstrap,
+            chunk_size=args.chunk_size or None,
         )
         trajectory_stats_frames.append(stats_frame)
         production_frames.append(production_frame)
-        example = pick_example_trajectories(frame, stats_frame, n_examples=5)
+        example = pick_example_trajectories(walks, stats_frame, n_examples=5)
         example["regime"] = regime
         example_frames.append(example)
 
-        variance_ci = summarize_ci(
-            bootstrap_statistic(
-                stats_frame["c_ent_variance"].to_numpy(),
-                None,
-                lambda sample: float(sample.mean()),
-                n_bootstrap=args.bootstrap,
-                seed=DEFAULT_SEED + offset,
-            )
+        variance_ci = bootstrap_ci(
+            stats_frame["c_ent_variance"].to_numpy(),
+            None,
+            "mean",
+            n_bootstrap=args.bootstrap,
+            seed=DEFAULT_SEED + offset,
+            method=args.ci_method,
         )
-        residence_ci = summarize_ci(
-            bootstrap_statistic(
-                stats_frame["residence_fraction_high_entropy"].to_numpy(),
-                None,
-                lambda sample: float(sample.mean()),
-                n_bootstrap=args.bootstrap,
-                seed=DEFAULT_SEED + 100 + offset,
-            )
+        residence_ci = bootstrap_ci(
+            stats_frame["residence_fraction_high_entropy"].to_numpy(),
+            None,
+            "mean",
+            n_bootstrap=args.bootstrap,
+            seed=DEFAULT_SEED + 100 + offset,
+            method=args.ci_method,
         )
-        production_ci = summarize_ci(
-            bootstrap_statistic(
-                stats_frame["entropy_production_rate"].to_numpy(),
-                None,
-                lambda sample: float(sample.mean()),
-                n_bootstrap=args.bootstrap,
-                seed=DEFAULT_SEED + 200 + offset,
-            )
+        production_ci = bootstrap_ci(
+            stats_frame["entropy_production_rate"].to_numpy(),
+            None,
+            "mean",
+            n_bootstrap=args.bootstrap,
+            seed=DEFAULT_SEED + 200 + offset,
+            method=args.ci_method,
         )
-        hurst_ci = summarize_ci(
-            bootstrap_statistic(
-                stats_frame["hurst_exponent"].dropna().to_numpy(),
-                None,
-                lambda sample: float(sample.mean()),
-                n_bootstrap=args.bootstrap,
-                seed=DEFAULT_SEED + 300 + offset,
-            )
+        hurst_ci = bootstrap_ci(
+            stats_frame["hurst_exponent"].dropna().to_numpy(),
+            None,
+            "mean",
+            n_bootstrap=args.bootstrap,
+            seed=DEFAULT_SEED + 300 + offset,
+            method=args.ci_method,
         )
 
         per_regime_summary[regime] = {
@@ -337,14 +560,13 @@ def main() -> None:
         normative["c_ent_variance"].to_numpy(),
         anxious["c_ent_variance"].to_numpy(),
     )
-    variance_d_ci = summarize_ci(
-        bootstrap_statistic(
-            normative["c_ent_variance"].to_numpy(),
-            anxious["c_ent_variance"].to_numpy(),
-            cohens_d,
-            n_bootstrap=args.bootstrap,
-            seed=DEFAULT_SEED + 900,
-        )
+    variance_d_ci = bootstrap_ci(
+        normative["c_ent_variance"].to_numpy(),
+        anxious["c_ent_variance"].to_numpy(),
+        "cohens_d",
+        n_bootstrap=args.bootstrap,
+        seed=DEFAULT_SEED + 900,
+        method=args.ci_method,
     )
     variance_test = stats.ttest_ind(
         normative["c_ent_variance"].to_numpy(),
@@ -355,14 +577,13 @@ def main() -> None:
     residence_increase = (
         anxious["residence_fraction_high_entropy"].mean() / normative["residence_fraction_high_entropy"].mean() - 1.0
     ) * 100.0
-    residence_diff_ci = summarize_ci(
-        bootstrap_statistic(
-            normative["residence_fraction_high_entropy"].to_numpy(),
-            anxious["residence_fraction_high_entropy"].to_numpy(),
-            lambda x, y: float((y.mean() / x.mean() - 1.0) * 100.0),
-            n_bootstrap=args.bootstrap,
-            seed=DEFAULT_SEED + 901,
-        )
+    residence_diff_ci = bootstrap_ci(
+        normative["residence_fraction_high_entropy"].to_numpy(),
+        anxious["residence_fraction_high_entropy"].to_numpy(),
+        "percent_increase",
+        n_bootstrap=args.bootstrap,
+        seed=DEFAULT_SEED + 901,
+        method=args.ci_method,
     )
     residence_test = stats.mannwhitneyu(
         normative["residence_fraction_high_entropy"].to_numpy(),
@@ -374,6 +595,7 @@ def main() -> None:
         "seed": DEFAULT_SEED,
         "high_entropy_threshold": high_entropy_threshold,
         "n_bootstrap": args.bootstrap,
+        "ci_method": args.ci_method,
         "per_regime": per_regime_summary,
         "comparisons": {
             "normative_vs_anxious_c_ent_variance": {
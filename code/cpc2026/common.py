@@ -7,15 +7,18 @@ serialization, and path management so the CPC scripts stay flat and readable.
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 import json
 import math
 import random
+import sys
 from pathlib import Path
 from typing import Any
 
 import networkx as nx
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
 try:
     from GraphRicciCurvature.OllivierRicci import OllivierRicci
@@ -24,6 +27,13 @@ except Exception:  # pragma: no cover - optional dependency at runtime
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+ANALYSIS_CODE_DIR = REPO_ROOT / "code" / "analysis"
+if str(ANALYSIS_CODE_DIR) not in sys.path:
+    sys.path.append(str(ANALYSIS_CODE_DIR))
+
+from curvature_cache import CurvatureCache, graphricci_edge_kappa  # noqa: E402
+from graph_loader import GraphSnapshot, load_edge_table, load_graph_snapshot  # noqa: E402
+
 DATA_DIR = REPO_ROOT / "data"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 RESULTS_DIR = REPO_ROOT / "results"
@@ -55,6 +65,7 @@ HYBRID_EXAMPLES_PARQUET = CPC_RESULTS_DIR / "trajectories_hybrid_examples.parque
 EXAMPLE_TRAJECTORIES_PARQUET = CPC_RESULTS_DIR / "example_trajectories.parquet"
 ENTROPY_PRODUCTION_CSV = CPC_RESULTS_DIR / "entropy_production_time_series.csv"
 REGIME_SUMMARY_CSV = CPC_RESULTS_DIR / "regime_summary.csv"
+TRAJECTORY_STORE_DIR = CPC_RESULTS_DIR / "trajectory_store"
 NODE_FEATURES_CSV = CPC_DATA_DIR / "swow_en_node_features.csv"
 NODE_FEATURES_NPY = CPC_DATA_DIR / "swow_en_node_features.npy"
 NODE_FEATURES_METADATA_JSON = CPC_DATA_DIR / "node_feature_metadata.json"
@@ -189,29 +200,34 @@ def load_swow_en_edgelist(path: Path = SWOW_FINAL_CSV) -> pd.DataFrame:
 def build_weighted_graph(edgelist: pd.DataFrame, largest_component: bool = True) -> nx.Graph:
     """Build an undirected weighted graph from the SWOW-EN edge list."""
 
-    graph = nx.Graph()
-    for row in edgelist.itertuples(index=False):
-        source = str(row.source)
-        target = str(row.target)
-        weight = float(row.weight)
-        if source == target:
-            continue
-        if graph.has_edge(source, target):
-            graph[source][target]["weight"] += weight
-        else:
-            graph.add_edge(source, target, weight=weight)
+    table = load_edge_table(
+        edgelist,
+        combine="sum",
+        self_loops=False,
+        largest_component=largest_component,
+        as_str=True,
+    )
+    return table.to_networkx()
+
 
-    if largest_component:
-        largest_nodes = max(nx.connected_components(graph), key=len)
-        graph = graph.subgraph(sorted(largest_nodes)).copy()
+@lru_cache(maxsize=None)
+def load_swow_en_snapshot(largest_component: bool = True) -> GraphSnapshot:
+    """Memory-mapped SWOW-EN graph snapshot, recompiled when the edge CSV changes."""
 
-    return graph
+    return load_graph_snapshot(
+        SWOW_FINAL_CSV,
+        reader=load_swow_en_edgelist,
+        combine="sum",
+        self_loops=False,
+        largest_component=largest_component,
+        as_str=True,
+    )
 
 
 def load_swow_en_graph(largest_component: bool = True) -> nx.Graph:
-    """Load the validated SWOW-EN graph as a NetworkX graph."""
+    """Load the validated SWOW-EN graph as a NetworkX graph (same as `build_weighted_graph`)."""
 
-    return build_weighted_graph(load_swow_en_edgelist(), largest_component=largest_component)
+    return load_swow_en_snapshot(largest_component).table.to_networkx()
 
 
 def graph_eta(graph: nx.Graph) -> float:
@@ -222,6 +238,79 @@ def graph_eta(graph: nx.Graph) -> float:
     return float((mean_degree**2) / n_nodes)
 
 
+def local_node_features(graph: nx.Graph, weight: str = "weight") -> pd.DataFrame:
+    """Transition entropy and 1-hop density for every node, from the sparse adjacency.
+
+    Rows follow sorted node order. With W the weighted adjacency and A its
+    off-diagonal pattern:
+
+      - entropy is -sum_j p_ij log p_ij over the row-normalized weights
+        p_ij = w_ij / strength_i, evaluated on W's nonzeros. entropy_norm
+        divides it by log(degree).
+      - local_edges counts the edges of the closed neighbourhood N[v]:
+        degree plus the triangles through v (((A @ A) * A) row sums / 2) plus
+        any self-loops in N[v]. n_local = |N[v]|,
+        mean_degree_local = 2 local_edges / n_local and
+        eta_local_raw = mean_degree_local^2 / n_local, as for the induced
+        subgraph.
+
+    Edges without a `weight` attribute count as weight 1.
+    """
+
+    nodes = sorted(graph.nodes())
+    n_nodes = len(nodes)
+    index = {node: position for position, node in enumerate(nodes)}
+    edges = list(graph.edges(data=weight, default=1.0))
+    u = np.fromiter((index[edge[0]] for edge in edges), dtype=np.int64, count=len(edges))
+    v = np.fromiter((index[edge[1]] for edge in edges), dtype=np.int64, count=len(edges))
+    w = np.fromiter((edge[2] for edge in edges), dtype=float, count=len(edges))
+    off_diagonal = u != v
+    # Zero weights stay explicit entries so that they still count as neighbours.
+    weights = sparse.csr_array(
+        (
+            np.concatenate([w, w[off_diagonal]]),
+            (np.concatenate([u, v[off_diagonal]]), np.concatenate([v, u[off_diagonal]])),
+        ),
+        shape=(n_nodes, n_nodes),
+    )
+
+    degree = np.diff(weights.indptr)
+    strength = np.asarray(weights.sum(axis=1), dtype=float).reshape(-1)
+    rows = np.repeat(np.arange(n_nodes), degree)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability = weights.data / strength[rows]
+        terms = np.where(probability > 0.0, probability * np.log(probability), 0.0)
+    entropy = -np.bincount(rows, weights=terms, minlength=n_nodes)
+    entropy[strength == 0.0] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entropy_norm = np.where(degree > 1, entropy / np.log(np.maximum(degree, 2)), 0.0)
+
+    pattern = sparse.csr_array((np.ones_like(weights.data, dtype=np.int64), weights.indices, weights.indptr), shape=weights.shape)
+    loops = pattern.diagonal()
+    pattern.setdiag(0)
+    pattern.eliminate_zeros()
+    neighbours = np.diff(pattern.indptr)
+    triangles = np.asarray(((pattern @ pattern) * pattern).sum(axis=1)).reshape(-1) // 2
+    local_loops = loops + pattern @ loops
+    n_local = neighbours + 1
+    local_edges = neighbours + triangles + local_loops
+    mean_degree_local = 2.0 * local_edges / n_local
+
+    return pd.DataFrame(
+        {
+            "node": nodes,
+            "degree": degree,
+            "strength": strength,
+            "entropy": entropy,
+            "entropy_norm": entropy_norm,
+            "n_local": n_local,
+            "local_edges": local_edges,
+            "mean_degree_local": mean_degree_local,
+            "eta_local_raw": mean_degree_local**2 / n_local,
+        }
+    )
+
+
 def graph_summary(graph: nx.Graph) -> dict[str, Any]:
     """Return basic graph diagnostics for logging and JSON summaries."""
 
@@ -288,18 +377,22 @@ def derive_exact_node_kappa(graph: nx.Graph, artifact: dict[str, Any] | None = N
     ).sort_values("node", ignore_index=True)
 
 
-def compute_graphricci_node_kappa(graph: nx.Graph, alpha: float = 0.5) -> pd.DataFrame:
-    """Compute per-node ORC with GraphRicciCurvature as a Python fallback."""
+def compute_graphricci_node_kappa(
+    graph: nx.Graph, alpha: float = 0.5, cache: CurvatureCache | None = None
+) -> pd.DataFrame:
+    """Compute per-node ORC with GraphRicciCurvature as a Python fallback.
+
+    Per-edge values are looked up in `cache` first (see curvature_cache).
+    """
 
     if OllivierRicci is None:
         raise ImportError("GraphRicciCurvature is not installed in the current environment.")
 
-    orc = OllivierRicci(graph.copy(), alpha=alpha, verbose="ERROR", proc=1)
-    orc.compute_ricci_curvature()
+    edge_kappa = graphricci_edge_kappa(graph, alpha=alpha, cache=cache, proc=1)
 
-    node_values: dict[str, list[float]] = {node: [] for node in orc.G.nodes()}
-    for source, target, data in orc.G.edges(data=True):
-        kappa = float(data.get("ricciCurvature", 0.0))
+    node_values: dict[str, list[float]] = {str(node): [] for node in graph.nodes()}
+    edges = [(source, target) for source, target in graph.edges() if source != target]
+    for (source, target), kappa in zip(edges, edge_kappa.tolist(), strict=True):
         node_values[str(source)].append(kappa)
         node_values[str(target)].append(kappa)
 
@@ -338,7 +431,11 @@ def load_valence_data(path: Path = SWOW_VALENCE_CSV) -> pd.DataFrame:
 
 
 def trajectory_path(regime: str) -> Path:
-    """Return the standard parquet path for one regime's trajectories."""
+    """Return the legacy long-form parquet path for one regime's trajectories.
+
+    New runs write the columnar store in `trajectory_store.py` instead; this
+    path is only read to migrate older artifacts.
+    """
 
     return CPC_RESULTS_DIR / f"trajectories_{regime}.parquet"
 
@@ -355,6 +452,12 @@ def trajectory_node_index_path(regime: str) -> Path:
     return CPC_DATA_DIR / f"trajectories_{regime}_nodes.npy"
 
 
+def ossm_step_dir(regime: str) -> Path:
+    """Return the directory of one regime's per-step O-SSM output columns (.npy)."""
+
+    return CPC_RESULTS_DIR / "ossm_steps" / regime
+
+
 def trajectory_sounio_csv_path(regime: str) -> Path:
     """Return the compact row-wise CSV path exported for Sounio."""
 
@@ -5,7 +5,6 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
 from common import (
@@ -18,36 +17,17 @@ from common import (
     graph_summary,
     load_exact_orc_artifact,
     load_swow_en_graph,
+    local_node_features,
     save_json,
     seed_everything,
 )
+from curvature_cache import default_cache
 
 
 def compute_local_entropy(graph) -> pd.DataFrame:
     """Compute local Shannon transition entropy for every graph node."""
 
-    rows = []
-    for node in sorted(graph.nodes()):
-        neighbors = sorted(graph.neighbors(node))
-        degree = len(neighbors)
-        strength = float(sum(graph[node][neighbor]["weight"] for neighbor in neighbors))
-        if degree == 0 or strength == 0.0:
-            entropy = 0.0
-        else:
-            weights = np.array([graph[node][neighbor]["weight"] for neighbor in neighbors], dtype=float)
-            probabilities = weights / weights.sum()
-            entropy = float(-(probabilities * np.log(probabilities)).sum())
-        entropy_norm = 0.0 if degree <= 1 else float(entropy / np.log(degree))
-        rows.append(
-            {
-                "node": node,
-                "degree": degree,
-                "strength": strength,
-                "entropy": entropy,
-                "entropy_norm": entropy_norm,
-            }
-        )
-    return pd.DataFrame(rows)
+    return local_node_features(graph).loc[:, ["node", "degree", "strength", "entropy", "entropy_norm"]]
 
 
 def compute_node_metrics(validate_python_fallback: bool = True) -> tuple[pd.DataFrame, dict[str, float | str | bool]]:
@@ -75,7 +55,7 @@ def compute_node_metrics(validate_python_fallback: bool = True) -> tuple[pd.Data
 
     if validate_python_fallback:
         try:
-            fallback_df = compute_graphricci_node_kappa(graph)
+            fallback_df = compute_graphricci_node_kappa(graph, cache=default_cache())
             merged = metrics.merge(fallback_df, on="node", how="left")
             correlation = merged["kappa"].corr(merged["kappa_graphricci"])
             mad = (merged["kappa"] - merged["kappa_graphricci"]).abs().mean()
@@ -16,11 +16,14 @@ from common import (
     REGIME_CONFIGS,
     STATISTICAL_SUMMARY_JSON,
     TRAJECTORY_STATS_PARQUET,
+    load_json,
     load_node_metrics,
+    ossm_step_dir,
     save_json,
     seed_everything,
     summarize_ci,
 )
+from recurrence import recurrence_quantification
 
 
 OSSM_TRAJECTORY_STATS_PARQUET = CPC_RESULTS_DIR / "ossm_trajectory_statistics.parquet"
@@ -66,7 +69,7 @@ def _comparison_stats(
     y = candidate.to_numpy(dtype=float)
     effect = cohens_d(x, y)
     ci_low, ci_high = summarize_ci(
-        bootstrap_statistic(x, y, cohens_d, n_bootstrap=n_bootstrap, seed=DEFAULT_SEED + seed_offset)
+        bootstrap_statistic(x, y, "cohens_d", n_bootstrap=n_bootstrap, seed=DEFAULT_SEED + seed_offset)
     )
     p_value = float(stats.ttest_ind(x, y, equal_var=False).pvalue)
     return {
@@ -78,8 +81,36 @@ def _comparison_stats(
     }
 
 
-def _load_stepwise_ossm(regime: str) -> tuple[pd.DataFrame, dict[str, Any]]:
-    """Load one regime's O-SSM CSV and derive trajectory-level matrices."""
+def _load_stepwise_ossm(regime: str) -> dict[str, Any]:
+    """Memory-map one regime's O-SSM step columns as (n_trajectories, steps) matrices.
+
+    Falls back to parsing the long-form CSV for runs that predate the binary
+    step columns.
+    """
+
+    step_dir = ossm_step_dir(regime)
+    if not (step_dir / "metadata.json").exists():
+        return _load_stepwise_ossm_csv(regime)
+
+    metadata = load_json(step_dir / "metadata.json")
+    columns = {column: np.load(step_dir / f"{column}.npy", mmap_mode="r") for column in metadata["columns"]}
+    node_entropy = load_node_metrics().set_index("node")["entropy"]
+    labels = pd.Index(metadata["node_labels"], dtype="string")
+    entropy_by_index = node_entropy.reindex(labels).fillna(0.0).to_numpy(dtype=np.float32)
+    return {
+        "path": str(step_dir),
+        "n_trajectories": int(metadata["n_trajectories"]),
+        "trajectory_length": int(metadata["trajectory_length"]),
+        "c_ent_readout": columns["C_ent_readout"],
+        "h_norm": columns["h_norm"],
+        "h_entropy": columns["h_entropy"],
+        "h_associator_norm": columns["h_associator_norm"],
+        "visited_entropy": entropy_by_index[columns["node_index"]],
+    }
+
+
+def _load_stepwise_ossm_csv(regime: str) -> dict[str, Any]:
+    """Load one regime's legacy O-SSM CSV and derive trajectory-level matrices."""
 
     path = CPC_RESULTS_DIR / f"ossm_trajectories_{regime}.csv"
     frame = pd.read_csv(
@@ -114,9 +145,8 @@ def _load_stepwise_ossm(regime: str) -> tuple[pd.DataFrame, dict[str, Any]]:
         .to_numpy(dtype=np.float32)
         .reshape(n_trajectories, trajectory_length),
         "visited_entropy": visited_entropy.reshape(n_trajectories, trajectory_length),
-        "visited_nodes": frame["visited_node"].astype("string").to_numpy().reshape(n_trajectories, trajectory_length),
     }
-    return frame, payload
+    return payload
 
 
 def _load_hidden_samples(regime: str) -> np.ndarray:
@@ -154,15 +184,23 @@ def _subspace_occupancy(hidden_samples: np.ndarray) -> np.ndarray:
     return counts / counts.sum()
 
 
-def _attractor_summary(hidden_samples: np.ndarray) -> dict[str, float]:
-    """Approximate recurrence, fixed-point, and short-cycle tendencies."""
+def _attractor_summary(hidden_samples: np.ndarray) -> dict[str, float | None]:
+    """Approximate recurrence (with RQA line measures), fixed-point, and short-cycle tendencies.
+
+    `trapping_time` is None when no trajectory has a vertical line, so the
+    JSON summary stays valid.
+    """
 
     if hidden_samples.size == 0:
         return {
             "recurrence_rate": 0.0,
+            "determinism": 0.0,
+            "laminarity": 0.0,
+            "trapping_time": None,
             "fixed_point_fraction": 0.0,
             "limit_cycle_fraction": 0.0,
             "threshold": 0.0,
+            "n_trajectories": 0,
         }
 
     series = hidden_samples[:, ::5, :]
@@ -178,17 +216,18 @@ def _attractor_summary(hidden_samples: np.ndarray) -> dict[str, float]:
     else:
         cycle_fraction = np.zeros(series.shape[0], dtype=float)
 
-    recurrence = []
-    for trajectory in series:
-        distance = np.linalg.norm(trajectory[:, None, :] - trajectory[None, :, :], axis=2)
-        mask = ~np.eye(distance.shape[0], dtype=bool)
-        recurrence.append(float((distance[mask] < threshold).mean()))
+    rqa = recurrence_quantification(series, threshold)
+    trapping_time = float(rqa["trapping_time"].mean())
 
     return {
-        "recurrence_rate": float(np.mean(recurrence)),
+        "recurrence_rate": float(rqa["recurrence_rate"].mean()),
+        "determinism": float(rqa["determinism"].mean()),
+        "laminarity": float(rqa["laminarity"].mean()),
+        "trapping_time": None if np.isnan(trapping_time) else trapping_time,
         "fixed_point_fraction": float(fixed_point.mean()),
         "limit_cycle_fraction": float(cycle_fraction.mean()),
         "threshold": threshold,
+        "n_trajectories": int(series.shape[0]),
     }
 
 
@@ -262,7 +301,7 @@ def main() -> None:
 
     for offset, regime_cfg in enumerate(REGIME_CONFIGS):
         regime = regime_cfg.name
-        _, payload = _load_stepwise_ossm(regime)
+        payload = _load_stepwise_ossm(regime)
         summary, stepwise = _trajectory_summary(regime, payload, high_entropy_threshold)
         hidden_samples = _load_hidden_samples(regime)
         occupancy = _subspace_occupancy(hidden_samples)
@@ -275,7 +314,7 @@ def main() -> None:
             bootstrap_statistic(
                 summary["c_ent_variance"].to_numpy(),
                 None,
-                lambda sample: float(sample.mean()),
+                "mean",
                 n_bootstrap=args.bootstrap,
                 seed=DEFAULT_SEED + offset,
             )
@@ -284,7 +323,7 @@ def main() -> None:
             bootstrap_statistic(
                 summary["residence_fraction_high_entropy"].to_numpy(),
                 None,
-                lambda sample: float(sample.mean()),
+                "mean",
                 n_bootstrap=args.bootstrap,
                 seed=DEFAULT_SEED + 100 + offset,
             )
@@ -293,7 +332,7 @@ def main() -> None:
             bootstrap_statistic(
                 summary["hidden_entropy_production_rate"].to_numpy(),
                 None,
-                lambda sample: float(sample.mean()),
+                "mean",
                 n_bootstrap=args.bootstrap,
                 seed=DEFAULT_SEED + 200 + offset,
             )
@@ -302,7 +341,7 @@ def main() -> None:
             bootstrap_statistic(
                 summary["hurst_exponent"].dropna().to_numpy(),
                 None,
-                lambda sample: float(sample.mean()),
+                "mean",
                 n_bootstrap=args.bootstrap,
                 seed=DEFAULT_SEED + 300 + offset,
             )
@@ -311,7 +350,7 @@ def main() -> None:
             bootstrap_statistic(
                 summary["mean_associator_norm"].to_numpy(),
                 None,
-                lambda sample: float(sample.mean()),
+                "mean",
                 n_bootstrap=args.bootstrap,
                 seed=DEFAULT_SEED + 400 + offset,
             )
@@ -320,7 +359,7 @@ def main() -> None:
             bootstrap_statistic(
                 summary["mean_h_entropy"].to_numpy(),
                 None,
-                lambda sample: float(sample.mean()),
+                "mean",
                 n_bootstrap=args.bootstrap,
                 seed=DEFAULT_SEED + 500 + offset,
             )
@@ -38,6 +38,7 @@ from common import (  # noqa: E402
     load_poincare_embedding,
     load_swow_en_graph,
     load_valence_data,
+    local_node_features,
     save_json,
     seed_everything,
 )
@@ -80,31 +81,7 @@ def _minmax_unit_scale(values: np.ndarray) -> tuple[np.ndarray, dict[str, float]
 def compute_local_eta(graph: nx.Graph) -> pd.DataFrame:
     """Compute a local density proxy for each node's 1-hop induced neighborhood."""
 
-    rows: list[dict[str, float | str]] = []
-    for node in sorted(graph.nodes()):
-        local_nodes = {node, *graph.neighbors(node)}
-        subgraph = graph.subgraph(local_nodes)
-        n_local = subgraph.number_of_nodes()
-        if n_local == 0:
-            eta_local = 0.0
-            mean_degree_local = 0.0
-            local_edges = 0
-        else:
-            degrees = np.array([degree for _, degree in subgraph.degree()], dtype=float)
-            mean_degree_local = float(degrees.mean()) if len(degrees) else 0.0
-            local_edges = subgraph.number_of_edges()
-            eta_local = float((mean_degree_local**2) / n_local)
-
-        rows.append(
-            {
-                "node": node,
-                "n_local": n_local,
-                "local_edges": local_edges,
-                "mean_degree_local": mean_degree_local,
-                "eta_local_raw": eta_local,
-            }
-        )
-    return pd.DataFrame(rows).sort_values("node", ignore_index=True)
+    return local_node_features(graph).loc[:, ["node", "n_local", "local_edges", "mean_degree_local", "eta_local_raw"]]
 
 
 def _load_or_compute_embedding(graph: nx.Graph) -> pd.DataFrame:
@@ -31,9 +31,9 @@ from common import (  # noqa: E402
     seed_everything,
     trajectory_input_tensor_path,
     trajectory_node_index_path,
-    trajectory_path,
 )
-from trajectory_simulator import simulate_markov_regime  # noqa: E402
+from trajectory_simulator import prepare_model_inputs, simulate_markov_nodes  # noqa: E402
+from trajectory_store import TrajectoryStore, load_regime_trajectories  # noqa: E402
 from ossm_bridge.node_features import (  # noqa: E402
     FEATURE_COLUMNS,
     NODE_FEATURES_CSV,
@@ -55,14 +55,11 @@ def _load_or_build_node_features() -> tuple[pd.DataFrame, np.ndarray]:
     return table, matrix
 
 
-def _node_matrix_from_frame(frame: pd.DataFrame, node_to_index: dict[str, int]) -> np.ndarray:
-    """Convert a long CPC trajectory frame into a trajectory x step node matrix."""
+def _node_matrix_from_store(walks, node_to_index: dict[str, int]) -> np.ndarray:
+    """Re-index a stored trajectory x step node matrix into the feature-table order."""
 
-    ordered = frame.sort_values(["trajectory_id", "step"], kind="mergesort").reset_index(drop=True)
-    n_trajectories = int(ordered["trajectory_id"].max()) + 1
-    trajectory_length = int(ordered["step"].max()) + 1
-    node_indices = ordered["node"].astype(str).map(node_to_index).to_numpy(dtype=np.int32)
-    return node_indices.reshape(n_trajectories, trajectory_length)
+    remap = np.array([node_to_index[name] for name in walks.node_names], dtype=np.int32)
+    return remap[walks.nodes]
 
 
 def _load_or_simulate_regime(
@@ -71,30 +68,37 @@ def _load_or_simulate_regime(
     n_trajectories: int,
     trajectory_length: int,
     force_resimulate: bool,
-) -> pd.DataFrame:
+):
     """Load cached CPC trajectories or simulate them with the validated kernel."""
 
-    parquet_path = trajectory_path(regime_name)
-    if parquet_path.exists() and not force_resimulate:
-        frame = pd.read_parquet(parquet_path)
-        expected_rows = n_trajectories * trajectory_length
-        if len(frame) == expected_rows:
-            return frame
+    store = TrajectoryStore()
+    if not force_resimulate:
+        try:
+            walks = load_regime_trajectories(regime_name, store)
+        except (FileNotFoundError, ValueError):
+            walks = None
+        if walks is not None and walks.shape == (n_trajectories, trajectory_length):
+            return walks
 
     graph = load_swow_en_graph()
-    metrics = load_node_metrics()
     regime = next(config for config in REGIME_CONFIGS if config.name == regime_name)
-    frame, _ = simulate_markov_regime(
+    model_inputs = prepare_model_inputs()
+    trajectory_nodes, nodes = simulate_markov_nodes(
         graph,
-        metrics,
         regime=regime,
         n_trajectories=n_trajectories,
         trajectory_length=trajectory_length,
         seed=seed,
+        model_inputs=model_inputs,
     )
-    ensure_directory(parquet_path.parent)
-    frame.to_parquet(parquet_path, index=False)
-    return frame
+    try:
+        current = store.node_table()["node"].astype(str).tolist()
+    except FileNotFoundError:
+        current = None
+    if current != nodes:
+        store.write_node_table(nodes, load_node_metrics())
+    store.write(regime_name, trajectory_nodes, seed=seed)
+    return store.open(regime_name)
 
 
 def generate_input_tensors(
@@ -117,14 +121,14 @@ def generate_input_tensors(
 
     ensure_directory(CPC_DATA_DIR)
     for offset, regime in enumerate(REGIME_CONFIGS):
-        frame = _load_or_simulate_regime(
+        walks = _load_or_simulate_regime(
             regime_name=regime.name,
             seed=DEFAULT_SEED + 100 * offset,
             n_trajectories=n_trajectories,
             trajectory_length=trajectory_length,
             force_resimulate=force_resimulate,
         )
-        node_matrix = _node_matrix_from_frame(frame, node_to_index)
+        node_matrix = _node_matrix_from_store(walks, node_to_index)
         input_tensor = feature_matrix[node_matrix]
 
         np.save(trajectory_node_index_path(regime.name), node_matrix)
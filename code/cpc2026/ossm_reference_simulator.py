@@ -8,12 +8,21 @@ with 4 octonionic hidden units, regime-specific temperature / initial-state /
 valence-gate settings, and a scalar readout that produces a state-conditioned
 entropic-curvature signal. It exists because the canonical Sounio repo has the
 necessary octonion primitives but not a recoverable full O-SSM benchmark stack.
+
+Regimes run in parallel worker processes; they share only the memory-mapped
+input tensors. Per-step outputs are written chunk by chunk into one .npy
+column per quantity under `ossm_step_dir(regime)`, and `metadata.json` is
+written last, so a directory without it is an interrupted run. The long-form
+`ossm_trajectories_{regime}.csv` is only written with `--csv`, which the
+Sounio parity check and the versioned .csv.gz archives need.
 """
 
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+import os
 from pathlib import Path
 import sys
 from typing import Any
@@ -32,6 +41,7 @@ from common import (  # noqa: E402
     REGIME_CONFIGS,
     ensure_directory,
     load_node_metrics,
+    ossm_step_dir,
     save_json,
     trajectory_input_tensor_path,
     trajectory_node_index_path,
@@ -41,6 +51,7 @@ from ossm_bridge.node_features import NODE_FEATURES_CSV, NODE_FEATURES_METADATA_
 
 OSSM_SUMMARY_JSON = CPC_RESULTS_DIR / "ossm_simulation_summary.json"
 OSSM_TRAJECTORY_SUMMARY_PARQUET = CPC_RESULTS_DIR / "ossm_trajectory_statistics.parquet"
+OSSM_STEP_COLUMNS: tuple[str, ...] = ("C_ent", "C_ent_readout", "h_norm", "h_entropy", "h_associator_norm")
 
 
 @dataclass(frozen=True)
@@ -81,6 +92,37 @@ def oct_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     )
 
 
+def _structure_constants() -> np.ndarray:
+    """Octonion structure constants T with (a b)_k = sum_ij a_i b_j T[i, j, k]."""
+
+    basis = np.eye(8, dtype=np.float64)
+    return oct_mul(basis[:, None, :], basis[None, :, :])
+
+
+OCT_STRUCTURE = _structure_constants()
+OCT_STRUCTURE_FLAT = OCT_STRUCTURE.reshape(64, 8)
+
+
+def left_mul_matrix(a: np.ndarray) -> np.ndarray:
+    """Real 8x8 matrices L with a x = L @ x, broadcast over the leading axes of `a`."""
+
+    return np.einsum("...i,ijk->...kj", a, OCT_STRUCTURE)
+
+
+def right_mul_matrix(b: np.ndarray) -> np.ndarray:
+    """Real 8x8 matrices R with x b = R @ x, broadcast over the leading axes of `b`."""
+
+    return np.einsum("...j,ijk->...ki", b, OCT_STRUCTURE)
+
+
+def oct_mul_tensor(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Octonion product as an outer product contracted with the structure constants."""
+
+    a, b = np.broadcast_arrays(a, b)
+    outer = (a[..., :, None] * b[..., None, :]).reshape(*a.shape[:-1], 64)
+    return outer @ OCT_STRUCTURE_FLAT.astype(outer.dtype, copy=False)
+
+
 def oct_associator(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
     """Broadcasted octonion associator [a, b, c] = (ab)c - a(bc)."""
 
@@ -151,6 +193,32 @@ def _base_parameters() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     return A, B, C, D
 
 
+@dataclass(frozen=True)
+class FusedStepOperators:
+    """Per-unit parameters of the O-SSM step folded into real matrices.
+
+    `transition[u]` applies x -> A_u x B_u, `input_map[u]` applies
+    x -> C_u x, and `readout_weights[u]` is the linear functional giving unit
+    u's share of the readout signal (real part plus 0.25 x e3 of h_u D_u,
+    averaged over units).
+    """
+
+    transition: np.ndarray
+    input_map: np.ndarray
+    readout_weights: np.ndarray
+
+    @classmethod
+    def from_parameters(cls, A: np.ndarray, B: np.ndarray, C: np.ndarray, D: np.ndarray) -> "FusedStepOperators":
+        transition = right_mul_matrix(B.astype(np.float64)) @ left_mul_matrix(A.astype(np.float64))
+        readout = right_mul_matrix(D.astype(np.float64))
+        weights = (readout[:, 0, :] + 0.25 * readout[:, 3, :]) / len(D)
+        return cls(
+            transition=transition.astype(np.float32),
+            input_map=left_mul_matrix(C.astype(np.float64)).astype(np.float32),
+            readout_weights=weights.astype(np.float32),
+        )
+
+
 def initialize_hidden_state(
     regime: OssmRegimeConfig,
     batch_size: int,
@@ -198,6 +266,18 @@ def initialize_hidden_state(
     return hidden
 
 
+def _open_step_columns(step_dir: Path, n_trajectories: int, trajectory_length: int) -> dict[str, np.ndarray]:
+    """Preallocate the (n_trajectories, trajectory_length) output columns as writable memmaps."""
+
+    ensure_directory(step_dir)
+    (step_dir / "metadata.json").unlink(missing_ok=True)
+    shape = (n_trajectories, trajectory_length)
+    columns = {"node_index": np.lib.format.open_memmap(step_dir / "node_index.npy", mode="w+", dtype=np.int32, shape=shape)}
+    for column in OSSM_STEP_COLUMNS:
+        columns[column] = np.lib.format.open_memmap(step_dir / f"{column}.npy", mode="w+", dtype=np.float32, shape=shape)
+    return columns
+
+
 def run_regime_reference(
     regime: OssmRegimeConfig,
     node_table: pd.DataFrame,
@@ -205,8 +285,9 @@ def run_regime_reference(
     sample_trajectories: int,
     max_trajectories: int | None = None,
     max_steps: int | None = None,
+    write_csv: bool = False,
 ) -> tuple[pd.DataFrame, dict[str, Any]]:
-    """Run the reference O-SSM for one regime and write per-step CSV output."""
+    """Run the reference O-SSM for one regime and write its per-step output columns."""
 
     A, B, C, D = _base_parameters()
     input_tensor = np.load(trajectory_input_tensor_path(regime.name), mmap_mode="r")
@@ -223,23 +304,33 @@ def run_regime_reference(
 
     output_csv = CPC_RESULTS_DIR / f"ossm_trajectories_{regime.name}.csv"
     sample_parquet = CPC_RESULTS_DIR / f"ossm_state_samples_{regime.name}.parquet"
-    ensure_directory(output_csv.parent)
-    output_csv.write_text(
-        "trajectory_id,step,visited_node,C_ent,C_ent_readout,h_norm,h_entropy,h_associator_norm\n",
-        encoding="utf-8",
-    )
+    step_dir = ossm_step_dir(regime.name)
+    step_columns = _open_step_columns(step_dir, n_trajectories, trajectory_length)
+    if write_csv:
+        ensure_directory(output_csv.parent)
+        output_csv.write_text(
+            "trajectory_id,step,visited_node,C_ent,C_ent_readout,h_norm,h_entropy,h_associator_norm\n",
+            encoding="utf-8",
+        )
 
     summary_rows: list[pd.DataFrame] = []
     sample_rows: list[pd.DataFrame] = []
     coupling = 0.18
     residual = 0.22
+    operators = FusedStepOperators.from_parameters(A, B, C, D)
+    # mixed = h + coupling * mean_u(h) feeds A h B; its unit-mixing is folded
+    # into a (4, 4) weight so preactivation = sum_v W[u, v] (A_u h_v B_u).
+    n_units = A.shape[0]
+    unit_mixing = (np.eye(n_units) + coupling / n_units).astype(np.float32)
+    structure = OCT_STRUCTURE.astype(np.float32)
 
     for start in range(0, n_trajectories, chunk_size):
         stop = min(start + chunk_size, n_trajectories)
-        features = np.asarray(input_tensor[start:stop, :trajectory_length], dtype=np.float32)
+        features = np.array(input_tensor[start:stop, :trajectory_length], dtype=np.float32)
+        features[..., 3] *= regime.valence_gate
         chunk_nodes = np.asarray(node_indices[start:stop, :trajectory_length], dtype=np.int32)
         batch_size = stop - start
-        hidden = initialize_hidden_state(regime, batch_size, hidden_dim=4, seed=DEFAULT_SEED + start)
+        hidden = initialize_hidden_state(regime, batch_size, hidden_dim=n_units, seed=DEFAULT_SEED + start)
 
         h_norm_series = np.empty((batch_size, trajectory_length), dtype=np.float32)
         h_entropy_series = np.empty((batch_size, trajectory_length), dtype=np.float32)
@@ -248,63 +339,87 @@ def run_regime_reference(
         raw_c_ent_series = raw_c_ent[chunk_nodes]
         raw_entropy_series = raw_entropy[chunk_nodes]
 
+        x_sign = np.sign(features[..., 3])
+
+        n_sampled = max(0, min(stop, sample_trajectories) - start)
+        sample_hidden = np.empty((trajectory_length, n_sampled, n_units, 8), dtype=np.float32)
+
+        mixed = np.empty_like(hidden)
+        preactivation = np.empty_like(hidden)
+        drive = np.empty_like(hidden)
+        x_right = np.empty((batch_size, 8, 8), dtype=np.float32)
+        x_left = np.empty((batch_size, 8, 8), dtype=np.float32)
+        hx = np.empty_like(hidden)
+        xp = np.empty_like(hidden)
         for step in range(trajectory_length):
-            x_t = features[:, step, :].copy()
-            x_t[:, 3] *= regime.valence_gate
+            x_t = features[:, step]
             prev_hidden = hidden
-            mixed_hidden = hidden + coupling * hidden.mean(axis=1, keepdims=True)
-            preactivation = oct_mul(oct_mul(A[None, :, :], mixed_hidden), B[None, :, :])
-            preactivation += oct_mul(C[None, :, :], x_t[:, None, :])
+            np.einsum("uv,nvi->nui", unit_mixing, hidden, out=mixed)
+            np.einsum("uki,nui->nuk", operators.transition, mixed, out=preactivation)
+            np.einsum("uki,ni->nuk", operators.input_map, x_t, out=drive)
+            preactivation += drive
             preactivation += residual * hidden
             hidden = oct_softsign(preactivation, regime.temperature)
 
-            assoc = oct_associator(hidden, x_t[:, None, :], prev_hidden)
+            # [h, x, p] = (h x) p - h (x p), with x_t folded into row-vector
+            # multiplication matrices: h x = h @ x_right, x p = p @ x_left.
+            np.einsum("nj,ijk->nik", x_t, structure, out=x_right)
+            np.einsum("ni,ijk->njk", x_t, structure, out=x_left)
+            np.matmul(hidden, x_right, out=hx)
+            np.matmul(prev_hidden, x_left, out=xp)
+            assoc = oct_mul_tensor(hx, prev_hidden) - oct_mul_tensor(hidden, xp)
             assoc_norm = np.linalg.norm(assoc, axis=2).mean(axis=1)
             state_norm = np.linalg.norm(hidden.reshape(batch_size, -1), axis=1)
             state_entropy = hidden_entropy(hidden)
 
-            read_oct = oct_mul(hidden, D[None, :, :])
-            read_signal = read_oct[..., 0].mean(axis=1) + 0.25 * read_oct[..., 3].mean(axis=1)
-            readout = raw_c_ent_series[:, step]
-            readout += 0.18 * np.tanh(read_signal)
-            readout += 0.08 * assoc_norm * np.sign(x_t[:, 3])
+            read_signal = np.einsum("nui,ui->n", hidden, operators.readout_weights)
+            readout = raw_c_ent_series[:, step] + 0.18 * np.tanh(read_signal)
+            readout += 0.08 * assoc_norm * x_sign[:, step]
             readout -= 0.05 * (state_entropy - 0.5)
             readout = np.clip(readout, -1.0, 1.0)
 
             h_norm_series[:, step] = state_norm
             h_entropy_series[:, step] = state_entropy
-            assoc_series[:, step] = assoc_norm.astype(np.float32)
-            readout_series[:, step] = readout.astype(np.float32)
-
-            if start < sample_trajectories:
-                sample_stop = min(stop, sample_trajectories)
-                sample_hidden = hidden[: sample_stop - start]
-                sample_frame = pd.DataFrame(
-                    {
-                        "trajectory_id": np.repeat(np.arange(start, sample_stop), 1),
-                        "step": step,
-                    }
-                )
-                for unit in range(4):
-                    for component in range(8):
-                        sample_frame[f"h{unit}_{component}"] = sample_hidden[:, unit, component]
-                sample_frame["C_ent_readout"] = readout_series[: sample_stop - start, step]
-                sample_frame["h_associator_norm"] = assoc_series[: sample_stop - start, step]
-                sample_rows.append(sample_frame)
-
-        frame = pd.DataFrame(
-            {
-                "trajectory_id": np.repeat(np.arange(start, stop, dtype=np.int32), trajectory_length),
-                "step": np.tile(np.arange(trajectory_length, dtype=np.int16), batch_size),
-                "visited_node": node_labels[chunk_nodes.reshape(-1)],
-                "C_ent": raw_c_ent_series.reshape(-1),
-                "C_ent_readout": readout_series.reshape(-1),
-                "h_norm": h_norm_series.reshape(-1),
-                "h_entropy": h_entropy_series.reshape(-1),
-                "h_associator_norm": assoc_series.reshape(-1),
-            }
-        )
-        frame.to_csv(output_csv, mode="a", header=False, index=False, float_format="%.6f")
+            assoc_series[:, step] = assoc_norm
+            readout_series[:, step] = readout
+            sample_hidden[step] = hidden[:n_sampled]
+
+        if n_sampled:
+            sample_frame = pd.DataFrame(
+                {
+                    "trajectory_id": np.tile(np.arange(start, start + n_sampled), trajectory_length),
+                    "step": np.repeat(np.arange(trajectory_length), n_sampled),
+                }
+            )
+            flat_hidden = sample_hidden.reshape(trajectory_length * n_sampled, n_units * 8)
+            for column, (unit, component) in enumerate(np.ndindex(n_units, 8)):
+                sample_frame[f"h{unit}_{component}"] = flat_hidden[:, column]
+            sample_frame["C_ent_readout"] = readout_series[:n_sampled].T.reshape(-1)
+            sample_frame["h_associator_norm"] = assoc_series[:n_sampled].T.reshape(-1)
+            sample_rows.append(sample_frame)
+
+        rows = slice(start, stop)
+        step_columns["node_index"][rows] = chunk_nodes
+        step_columns["C_ent"][rows] = raw_c_ent_series
+        step_columns["C_ent_readout"][rows] = readout_series
+        step_columns["h_norm"][rows] = h_norm_series
+        step_columns["h_entropy"][rows] = h_entropy_series
+        step_columns["h_associator_norm"][rows] = assoc_series
+
+        if write_csv:
+            frame = pd.DataFrame(
+                {
+                    "trajectory_id": np.repeat(np.arange(start, stop, dtype=np.int32), trajectory_length),
+                    "step": np.tile(np.arange(trajectory_length, dtype=np.int16), batch_size),
+                    "visited_node": node_labels[chunk_nodes.reshape(-1)],
+                    "C_ent": raw_c_ent_series.reshape(-1),
+                    "C_ent_readout": readout_series.reshape(-1),
+                    "h_norm": h_norm_series.reshape(-1),
+                    "h_entropy": h_entropy_series.reshape(-1),
+                    "h_associator_norm": assoc_series.reshape(-1),
+                }
+            )
+            frame.to_csv(output_csv, mode="a", header=False, index=False, float_format="%.6f")
 
         summary_rows.append(
             pd.DataFrame(
@@ -321,13 +436,28 @@ def run_regime_reference(
             )
         )
 
+    for column in step_columns.values():
+        column.flush()
+    del step_columns
+    save_json(
+        step_dir / "metadata.json",
+        {
+            "regime": regime.name,
+            "n_trajectories": int(n_trajectories),
+            "trajectory_length": int(trajectory_length),
+            "columns": ["node_index", *OSSM_STEP_COLUMNS],
+            "node_labels": [str(label) for label in node_labels],
+        },
+    )
+
     summary = pd.concat(summary_rows, ignore_index=True)
     summary.to_parquet(CPC_RESULTS_DIR / f"ossm_trajectory_summary_{regime.name}.parquet", index=False)
     if sample_rows:
         pd.concat(sample_rows, ignore_index=True).to_parquet(sample_parquet, index=False)
 
     payload = {
-        "output_csv": str(output_csv),
+        "step_dir": str(step_dir),
+        "output_csv": str(output_csv) if write_csv else None,
         "summary_parquet": str(CPC_RESULTS_DIR / f"ossm_trajectory_summary_{regime.name}.parquet"),
         "sample_parquet": str(sample_parquet),
         "n_trajectories": int(n_trajectories),
@@ -337,16 +467,23 @@ def run_regime_reference(
     return summary, payload
 
 
+def _run_regime_task(task: dict[str, Any]) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Process-pool entry point: run one regime from keyword arguments."""
+
+    return run_regime_reference(**task)
+
+
 def simulate_reference_ossm(
     chunk_size: int = 512,
-    sample_trajectories: int = 64,
+    sample_trajectories: int = 512,
     max_trajectories: int | None = None,
     max_steps: int | None = None,
+    workers: int | None = None,
+    write_csv: bool = False,
 ) -> dict[str, Any]:
-    """Run all regimes and save a combined summary payload."""
+    """Run all regimes (in parallel worker processes) and save a combined summary payload."""
 
     node_table = pd.read_csv(NODE_FEATURES_CSV)
-    summaries: list[pd.DataFrame] = []
     payload: dict[str, Any] = {
         "seed": DEFAULT_SEED,
         "max_trajectories": max_trajectories,
@@ -354,19 +491,29 @@ def simulate_reference_ossm(
         "regimes": {},
     }
 
-    for regime in OSSM_REGIMES:
-        summary, regime_payload = run_regime_reference(
-            regime=regime,
-            node_table=node_table,
-            chunk_size=chunk_size,
-            sample_trajectories=sample_trajectories,
-            max_trajectories=max_trajectories,
-            max_steps=max_steps,
-        )
-        summaries.append(summary)
+    tasks = [
+        {
+            "regime": regime,
+            "node_table": node_table,
+            "chunk_size": chunk_size,
+            "sample_trajectories": sample_trajectories,
+            "max_trajectories": max_trajectories,
+            "max_steps": max_steps,
+            "write_csv": write_csv,
+        }
+        for regime in OSSM_REGIMES
+    ]
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_regime_task, tasks))
+    else:
+        results = [_run_regime_task(task) for task in tasks]
+
+    for regime, (_, regime_payload) in zip(OSSM_REGIMES, results):
         payload["regimes"][regime.name] = regime_payload
 
-    combined = pd.concat(summaries, ignore_index=True)
+    combined = pd.concat([summary for summary, _ in results], ignore_index=True)
     combined.to_parquet(OSSM_TRAJECTORY_SUMMARY_PARQUET, index=False)
     payload["combined_summary_parquet"] = str(OSSM_TRAJECTORY_SUMMARY_PARQUET)
     save_json(OSSM_SUMMARY_JSON, payload)
@@ -379,7 +526,7 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--sample-trajectories",
         type=int,
-        default=64,
+        default=512,
         help="Number of trajectories per regime for hidden-state sample exports.",
     )
     parser.add_argument(
@@ -394,6 +541,17 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional cap on steps per trajectory (useful for smoke and parity runs).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Regimes simulated in parallel (default: one process per regime, up to the CPU count).",
+    )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Also write the long-form ossm_trajectories_{regime}.csv (Sounio parity, .csv.gz archives).",
+    )
     parser.add_argument("--smoke-test", action="store_true", help="Run on 64 trajectories x 32 steps.")
     return parser
 
@@ -415,6 +573,8 @@ def main() -> None:
         sample_trajectories=args.sample_trajectories,
         max_trajectories=args.max_trajectories,
         max_steps=args.max_steps,
+        workers=args.workers,
+        write_csv=args.csv,
     )
     print(
         "Saved reference O-SSM outputs for "
@@ -0,0 +1,99 @@
+"""Recurrence quantification analysis (RQA) for batches of state trajectories.
+
+A trajectory of T states recurs at (i, j) when ||x_i - x_j|| < radius. The
+recurrence matrix is never materialized. Each trajectory's recurrent pairs
+i < j come from a KD-tree radius query, so memory scales with the number of
+recurrences rather than with T^2 x dimensions. Line statistics for all
+trajectories are then computed together from the concatenated pair lists:
+
+  - recurrence rate: fraction of off-diagonal pairs that recur
+  - determinism (DET): fraction of recurrent points on diagonal lines of
+    length >= `min_line`
+  - laminarity (LAM): fraction of recurrent points on vertical lines of
+    length >= `min_line`
+  - trapping time (TT): mean length of those vertical lines
+
+The main diagonal (i == j) is excluded throughout (Theiler window 1).
+Trajectories without recurrences get DET = LAM = 0 and TT = NaN.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+
+def recurrence_pairs(trajectory: np.ndarray, radius: float) -> np.ndarray:
+    """(n_pairs, 2) array of recurrent index pairs i < j (strict `< radius`)."""
+
+    points = np.asarray(trajectory, dtype=np.float64)
+    strict = np.nextafter(float(radius), 0.0)
+    if strict <= 0.0 or len(points) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    return cKDTree(points).query_pairs(strict, output_type="ndarray").astype(np.int64)
+
+
+def _line_lengths(group: np.ndarray, line: np.ndarray, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Runs of consecutive `position` within each (group, line): (run group, run length)."""
+
+    if len(group) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order = np.lexsort((position, line, group))
+    group, line, position = group[order], line[order], position[order]
+    breaks = np.ones(len(group), dtype=bool)
+    breaks[1:] = (group[1:] != group[:-1]) | (line[1:] != line[:-1]) | (position[1:] != position[:-1] + 1)
+    starts = np.flatnonzero(breaks)
+    lengths = np.diff(np.append(starts, len(group)))
+    return group[starts], lengths
+
+
+def recurrence_quantification(
+    series: np.ndarray,
+    radius: float,
+    min_line: int = 2,
+) -> pd.DataFrame:
+    """Per-trajectory recurrence rate, DET, LAM and trapping time.
+
+    `series` is (n_trajectories, T, dim); the result has one row per
+    trajectory.
+    """
+
+    series = np.asarray(series)
+    n_trajectories, n_steps = series.shape[:2]
+    pairs = [recurrence_pairs(trajectory, radius) for trajectory in series]
+    counts = np.array([len(p) for p in pairs], dtype=np.int64)
+    owner = np.repeat(np.arange(n_trajectories, dtype=np.int64), counts)
+    stacked = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+    i, j = stacked[:, 0], stacked[:, 1]
+
+    # The matrix is symmetric, so the upper triangle's diagonal lines carry
+    # exactly half of the recurrent points and of the points on long lines.
+    diagonal_owner, diagonal_length = _line_lengths(owner, j - i, i)
+    long = diagonal_length >= min_line
+    on_diagonals = np.bincount(diagonal_owner[long], weights=diagonal_length[long], minlength=n_trajectories)
+
+    # Vertical lines need both triangles: column j holds rows i < j and i > j.
+    column_owner = np.concatenate([owner, owner])
+    column = np.concatenate([j, i])
+    row = np.concatenate([i, j])
+    vertical_owner, vertical_length = _line_lengths(column_owner, column, row)
+    long = vertical_length >= min_line
+    on_verticals = np.bincount(vertical_owner[long], weights=vertical_length[long], minlength=n_trajectories)
+    n_vertical = np.bincount(vertical_owner[long], minlength=n_trajectories)
+
+    off_diagonal = max(n_steps * (n_steps - 1) / 2.0, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        determinism = np.where(counts > 0, on_diagonals / counts, 0.0)
+        laminarity = np.where(counts > 0, on_verticals / (2.0 * counts), 0.0)
+        trapping_time = np.where(n_vertical > 0, on_verticals / n_vertical, np.nan)
+
+    return pd.DataFrame(
+        {
+            "trajectory_id": np.arange(n_trajectories, dtype=np.int32),
+            "recurrence_rate": counts / off_diagonal,
+            "determinism": determinism,
+            "laminarity": laminarity,
+            "trapping_time": trapping_time,
+        }
+    )
@@ -0,0 +1,3 @@
+"""
+Test suite for the CPC 2026 pipeline.
+"""
@@ -0,0 +1,129 @@
+"""
+Tests for the CPC 2026 trajectory statistics.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from scipy import stats
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analysis import bca_interval, bootstrap_ci, bootstrap_statistic, cohens_d, summarize_regime
+from trajectory_store import TrajectoryStore
+
+
+def _pooled_cohens_d(x, y, axis=-1):
+    """Axis-aware Cohen's d for scipy.stats.bootstrap."""
+    nx, ny = x.shape[axis], y.shape[axis]
+    pooled = np.sqrt(((nx - 1) * x.var(axis=axis, ddof=1) + (ny - 1) * y.var(axis=axis, ddof=1)) / (nx + ny - 2))
+    return (y.mean(axis=axis) - x.mean(axis=axis)) / pooled
+
+
+SCIPY_STATISTICS = {
+    "mean": lambda x, axis=-1: x.mean(axis=axis),
+    "variance": lambda x, axis=-1: x.var(axis=axis, ddof=1),
+    "mean_difference": lambda x, y, axis=-1: y.mean(axis=axis) - x.mean(axis=axis),
+    "percent_increase": lambda x, y, axis=-1: (y.mean(axis=axis) / x.mean(axis=axis) - 1.0) * 100.0,
+    "cohens_d": _pooled_cohens_d,
+}
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(0)
+    return rng.gamma(2.0, size=40), rng.gamma(2.5, size=35)
+
+
+@pytest.fixture
+def walks(tmp_path):
+    rng = np.random.default_rng(0)
+    n_nodes = 30
+    metrics = pd.DataFrame(
+        {
+            "node": [f"w{i:02d}" for i in range(n_nodes)],
+            "C_ent": rng.normal(size=n_nodes),
+            "entropy": rng.uniform(0.0, 3.0, size=n_nodes),
+            "kappa": rng.uniform(-1.0, 1.0, size=n_nodes),
+        }
+    )
+    store = TrajectoryStore(tmp_path)
+    store.write_node_table(metrics["node"].tolist(), metrics)
+    store.write("normative", rng.integers(0, n_nodes, size=(23, 40)))
+    return store.open("normative")
+
+
+class TestBootstrap:
+    """Vectorized resampling and BCa intervals match per-resample and scipy references."""
+
+    @pytest.mark.parametrize("statistic", ["mean_difference", "cohens_d"])
+    def test_vectorized_draws_match_callable(self, samples, statistic):
+        x, y = samples
+        callable_statistic = cohens_d if statistic == "cohens_d" else (lambda a, b: b.mean() - a.mean())
+
+        vectorized = bootstrap_statistic(x, y, statistic, n_bootstrap=500, seed=1)
+        looped = bootstrap_statistic(x, y, callable_statistic, n_bootstrap=500, seed=1)
+        np.testing.assert_allclose(vectorized, looped, rtol=1e-10, atol=1e-12)
+
+    @pytest.mark.parametrize("statistic", sorted(SCIPY_STATISTICS))
+    def test_bca_matches_scipy(self, samples, statistic):
+        x, y = samples
+        if statistic in ("mean", "variance"):
+            y = None
+        data = (x,) if y is None else (x, y)
+        draws = bootstrap_statistic(x, y, statistic, n_bootstrap=2_000, seed=1)
+
+        # n_resamples=0 makes scipy score exactly our draws with its own BCa.
+        reference = stats.bootstrap(
+            data,
+            SCIPY_STATISTICS[statistic],
+            n_resamples=0,
+            bootstrap_result=SimpleNamespace(bootstrap_distribution=draws),
+            method="BCa",
+        ).confidence_interval
+        lower, upper = bca_interval(x, y, statistic, draws)
+        assert lower == pytest.approx(reference.low, rel=1e-10)
+        assert upper == pytest.approx(reference.high, rel=1e-10)
+
+    def test_closed_form_jackknife_matches_callable(self, samples):
+        x, _ = samples
+        draws = bootstrap_statistic(x, None, "variance", n_bootstrap=1_000, seed=2)
+
+        closed_form = bca_interval(x, None, "variance", draws)
+        looped = bca_interval(x, None, lambda sample: sample.var(ddof=1), draws)
+        np.testing.assert_allclose(closed_form, looped, rtol=1e-10)
+
+    def test_unknown_method_raises(self, samples):
+        with pytest.raises(ValueError):
+            bootstrap_ci(samples[0], None, "mean", n_bootstrap=10, method="studentized")
+
+
+class TestSummarizeRegime:
+    """Streaming over trajectory chunks gives the one-block summaries."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 23, 100])
+    def test_chunked_matches_single_block(self, walks, chunk_size):
+        whole_stats, whole_production = summarize_regime("normative", walks, 1.5, n_bootstrap=0, chunk_size=None)
+        stats_frame, production = summarize_regime("normative", walks, 1.5, n_bootstrap=0, chunk_size=chunk_size)
+
+        pd.testing.assert_frame_equal(stats_frame, whole_stats)
+        pd.testing.assert_frame_equal(production, whole_production, check_exact=False, rtol=1e-12)
+
+    def test_columns_match_step_matrices(self, walks):
+        stats_frame, production = summarize_regime("normative", walks, 1.5, n_bootstrap=0, chunk_size=7)
+        entropy = walks.entropy.astype(np.float64)
+        step_production = np.abs(np.diff(entropy, axis=1))
+
+        np.testing.assert_allclose(stats_frame["c_ent_variance"], walks.c_ent.var(axis=1, ddof=1))
+        np.testing.assert_array_equal(stats_frame["residence_steps_high_entropy"], (entropy >= 1.5).sum(axis=1))
+        np.testing.assert_allclose(stats_frame["entropy_production_rate"], step_production.mean(axis=1), rtol=1e-6)
+        np.testing.assert_allclose(production["mean_entropy_production"].iloc[1:], step_production.mean(axis=0), rtol=1e-6)
+        assert production["mean_entropy_production"].iloc[0] == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
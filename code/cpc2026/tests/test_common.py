@@ -0,0 +1,99 @@
+"""
+Tests for the shared CPC 2026 node-feature primitives.
+"""
+
+import pytest
+import networkx as nx
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import local_node_features
+from entropic_curvature import compute_local_entropy
+from ossm_bridge.node_features import compute_local_eta
+
+
+def _entropy_loop(graph):
+    """Per-node transition entropy the sparse row reductions replace."""
+    rows = []
+    for node in sorted(graph.nodes()):
+        neighbors = sorted(graph.neighbors(node))
+        degree = len(neighbors)
+        strength = float(sum(graph[node][neighbor]["weight"] for neighbor in neighbors))
+        if degree == 0 or strength == 0.0:
+            entropy = 0.0
+        else:
+            weights = np.array([graph[node][neighbor]["weight"] for neighbor in neighbors], dtype=float)
+            probabilities = weights / weights.sum()
+            entropy = float(-(probabilities * np.log(probabilities)).sum())
+        entropy_norm = 0.0 if degree <= 1 else float(entropy / np.log(degree))
+        rows.append({"node": node, "degree": degree, "strength": strength, "entropy": entropy, "entropy_norm": entropy_norm})
+    return pd.DataFrame(rows)
+
+
+def _eta_loop(graph):
+    """Per-node induced 1-hop subgraphs the triangle counts replace."""
+    rows = []
+    for node in sorted(graph.nodes()):
+        subgraph = graph.subgraph({node, *graph.neighbors(node)})
+        n_local = subgraph.number_of_nodes()
+        mean_degree_local = float(np.mean([degree for _, degree in subgraph.degree()]))
+        rows.append(
+            {
+                "node": node,
+                "n_local": n_local,
+                "local_edges": subgraph.number_of_edges(),
+                "mean_degree_local": mean_degree_local,
+                "eta_local_raw": mean_degree_local**2 / n_local,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _weighted(graph, seed):
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = float(rng.uniform(0.05, 1.0))
+    return graph
+
+
+@pytest.fixture(params=["karate", "random_with_loops", "les_miserables"])
+def graph(request):
+    """Weighted graphs, one with self-loops and an isolated node."""
+    if request.param == "karate":
+        return _weighted(nx.karate_club_graph(), seed=0)
+    if request.param == "les_miserables":
+        return nx.les_miserables_graph()
+    G = nx.gnp_random_graph(60, 0.08, seed=1)
+    G.add_edges_from([(0, 0), (5, 5), (7, 7)])
+    G.add_node(60)
+    return _weighted(G, seed=1)
+
+
+class TestLocalNodeFeatures:
+    """Sparse-adjacency features match the old per-node loops."""
+
+    def test_entropy_matches_loop(self, graph):
+        pd.testing.assert_frame_equal(
+            compute_local_entropy(graph), _entropy_loop(graph), check_dtype=False, check_exact=False, rtol=1e-12
+        )
+
+    def test_eta_matches_subgraphs(self, graph):
+        pd.testing.assert_frame_equal(
+            compute_local_eta(graph), _eta_loop(graph), check_dtype=False, check_exact=False, rtol=1e-12
+        )
+
+    def test_unweighted_edges_count_as_one(self):
+        G = nx.star_graph(4)
+        features = local_node_features(G)
+
+        assert features.loc[0, "strength"] == 4.0
+        assert features.loc[0, "entropy_norm"] == pytest.approx(1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
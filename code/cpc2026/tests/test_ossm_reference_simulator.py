@@ -0,0 +1,191 @@
+"""
+Tests for the reference O-SSM simulator's fused step operators and step columns.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ossm_analysis
+import ossm_reference_simulator as ossm
+from ossm_reference_simulator import (
+    FusedStepOperators,
+    OCT_STRUCTURE,
+    OSSM_REGIMES,
+    _base_parameters,
+    hidden_entropy,
+    initialize_hidden_state,
+    left_mul_matrix,
+    oct_associator,
+    oct_mul,
+    oct_mul_tensor,
+    oct_softsign,
+    right_mul_matrix,
+)
+
+N_TRAJECTORIES = 12
+N_STEPS = 25
+N_NODES = 9
+REGIMES = {regime.name: regime for regime in OSSM_REGIMES}
+
+
+def _unfused_reference(regime, features, nodes, raw_c_ent, chunk_size):
+    """Per-step octonion products the fused operators replace."""
+    A, B, C, D = _base_parameters()
+    columns = {name: np.empty(nodes.shape, dtype=np.float32) for name in ("C_ent_readout", "h_norm", "h_entropy", "h_associator_norm")}
+    for start in range(0, len(features), chunk_size):
+        rows = slice(start, start + chunk_size)
+        batch_size = len(features[rows])
+        hidden = initialize_hidden_state(regime, batch_size, hidden_dim=4, seed=ossm.DEFAULT_SEED + start)
+        for step in range(features.shape[1]):
+            x_t = features[rows, step, :].copy()
+            x_t[:, 3] *= regime.valence_gate
+            prev_hidden = hidden
+            mixed_hidden = hidden + 0.18 * hidden.mean(axis=1, keepdims=True)
+            preactivation = oct_mul(oct_mul(A[None, :, :], mixed_hidden), B[None, :, :])
+            preactivation += oct_mul(C[None, :, :], x_t[:, None, :])
+            preactivation += 0.22 * hidden
+            hidden = oct_softsign(preactivation, regime.temperature)
+
+            assoc_norm = np.linalg.norm(oct_associator(hidden, x_t[:, None, :], prev_hidden), axis=2).mean(axis=1)
+            state_entropy = hidden_entropy(hidden)
+            read_oct = oct_mul(hidden, D[None, :, :])
+            read_signal = read_oct[..., 0].mean(axis=1) + 0.25 * read_oct[..., 3].mean(axis=1)
+            readout = raw_c_ent[nodes[rows, step]].copy()
+            readout += 0.18 * np.tanh(read_signal)
+            readout += 0.08 * assoc_norm * np.sign(x_t[:, 3])
+            readout -= 0.05 * (state_entropy - 0.5)
+
+            columns["C_ent_readout"][rows, step] = np.clip(readout, -1.0, 1.0)
+            columns["h_norm"][rows, step] = np.linalg.norm(hidden.reshape(batch_size, -1), axis=1)
+            columns["h_entropy"][rows, step] = state_entropy
+            columns["h_associator_norm"][rows, step] = assoc_norm
+    return columns
+
+
+@pytest.fixture
+def simulator_inputs(tmp_path, monkeypatch):
+    """Synthetic input tensors and node table, with the simulator's paths under tmp_path."""
+    rng = np.random.default_rng(0)
+    features = rng.normal(scale=0.5, size=(N_TRAJECTORIES, N_STEPS, 8)).astype(np.float32)
+    nodes = rng.integers(0, N_NODES, size=(N_TRAJECTORIES, N_STEPS)).astype(np.int32)
+    node_table = pd.DataFrame(
+        {
+            "node": [f"w{i}" for i in range(N_NODES)],
+            "C_ent": rng.uniform(-0.5, 0.5, size=N_NODES),
+            "entropy": rng.uniform(0.0, 2.0, size=N_NODES),
+        }
+    )
+    np.save(tmp_path / "input.npy", features)
+    np.save(tmp_path / "nodes.npy", nodes)
+    monkeypatch.setattr(ossm, "CPC_RESULTS_DIR", tmp_path)
+    monkeypatch.setattr(ossm, "trajectory_input_tensor_path", lambda regime: tmp_path / "input.npy")
+    monkeypatch.setattr(ossm, "trajectory_node_index_path", lambda regime: tmp_path / "nodes.npy")
+    monkeypatch.setattr(ossm, "ossm_step_dir", lambda regime: tmp_path / "ossm_steps" / regime)
+    monkeypatch.setattr(ossm_analysis, "CPC_RESULTS_DIR", tmp_path)
+    monkeypatch.setattr(ossm_analysis, "ossm_step_dir", lambda regime: tmp_path / "ossm_steps" / regime)
+    monkeypatch.setattr(ossm_analysis, "load_node_metrics", lambda: node_table)
+    return features, nodes, node_table, tmp_path
+
+
+class TestOperators:
+    """Real matrices folded from the parameters reproduce the octonion products."""
+
+    def test_structure_constants_match_oct_mul(self):
+        rng = np.random.default_rng(1)
+        a, b = rng.normal(size=(2, 16, 8))
+
+        np.testing.assert_allclose(oct_mul_tensor(a, b), oct_mul(a, b), atol=1e-12)
+        x_right = np.einsum("nj,ijk->nik", b, OCT_STRUCTURE)
+        x_left = np.einsum("ni,ijk->njk", a, OCT_STRUCTURE)
+        np.testing.assert_allclose(np.matmul(a[:, None, :], x_right)[:, 0], oct_mul(a, b), atol=1e-12)
+        np.testing.assert_allclose(np.matmul(b[:, None, :], x_left)[:, 0], oct_mul(a, b), atol=1e-12)
+
+    def test_fused_operators_match_products(self):
+        A, B, C, D = (p.astype(np.float64) for p in _base_parameters())
+        operators = FusedStepOperators.from_parameters(A, B, C, D)
+        h, x = np.random.default_rng(2).normal(size=(2, 4, 8))
+
+        transition = np.einsum("uki,ui->uk", right_mul_matrix(B) @ left_mul_matrix(A), h)
+        np.testing.assert_allclose(transition, oct_mul(oct_mul(A, h), B), atol=1e-12)
+        np.testing.assert_allclose(np.einsum("uki,ui->uk", operators.transition, h), oct_mul(oct_mul(A, h), B), atol=1e-5)
+        np.testing.assert_allclose(np.einsum("uki,i->uk", operators.input_map, x[0]), oct_mul(C, x[0]), atol=1e-5)
+        read_oct = oct_mul(h, D)
+        expected = read_oct[:, 0].mean() + 0.25 * read_oct[:, 3].mean()
+        assert np.einsum("ui,ui->", h, operators.readout_weights) == pytest.approx(expected, abs=1e-5)
+
+
+class TestRunRegimeReference:
+    """The fused kernel reproduces the unfused per-step products on a small seed."""
+
+    # Over N_STEPS steps every regime stays within float32 rounding; on
+    # paper-length runs ruminative (T=0.3) amplifies single-ulp differences.
+    @pytest.mark.parametrize("name", sorted(REGIMES))
+    @pytest.mark.parametrize("chunk_size", [5, N_TRAJECTORIES])
+    def test_fused_matches_unfused(self, simulator_inputs, name, chunk_size):
+        features, nodes, node_table, tmp_path = simulator_inputs
+        regime = REGIMES[name]
+        raw_c_ent = node_table["C_ent"].to_numpy(dtype=np.float32)
+
+        ossm.run_regime_reference(regime, node_table, chunk_size=chunk_size, sample_trajectories=3)
+        expected = _unfused_reference(regime, features, nodes, raw_c_ent, chunk_size)
+
+        step_dir = tmp_path / "ossm_steps" / name
+        np.testing.assert_array_equal(np.load(step_dir / "node_index.npy"), nodes)
+        np.testing.assert_array_equal(np.load(step_dir / "C_ent.npy"), raw_c_ent[nodes])
+        for column, values in expected.items():
+            np.testing.assert_allclose(np.load(step_dir / f"{column}.npy"), values, atol=2e-5, err_msg=column)
+
+    def test_hidden_samples_follow_trajectory_order(self, simulator_inputs):
+        _, _, node_table, tmp_path = simulator_inputs
+
+        ossm.run_regime_reference(REGIMES["normative"], node_table, chunk_size=5, sample_trajectories=7)
+        samples = pd.read_parquet(tmp_path / "ossm_state_samples_normative.parquet")
+        readout = np.load(tmp_path / "ossm_steps" / "normative" / "C_ent_readout.npy")
+
+        assert sorted(samples["trajectory_id"].unique()) == list(range(7))
+        assert len(samples) == 7 * N_STEPS
+        ordered = samples.sort_values(["trajectory_id", "step"])
+        np.testing.assert_array_equal(ordered["C_ent_readout"].to_numpy().reshape(7, N_STEPS), readout[:7])
+
+
+
+class TestStepColumns:
+    """The .npy step columns carry the same data as the long-form CSV."""
+
+    def test_columns_match_csv(self, simulator_inputs):
+        _, _, node_table, tmp_path = simulator_inputs
+
+        ossm.run_regime_reference(REGIMES["anxious"], node_table, chunk_size=5, sample_trajectories=0, write_csv=True)
+        columns = ossm_analysis._load_stepwise_ossm("anxious")
+        legacy = ossm_analysis._load_stepwise_ossm_csv("anxious")
+
+        assert columns["path"] == str(tmp_path / "ossm_steps" / "anxious")
+        for key in ("n_trajectories", "trajectory_length"):
+            assert columns[key] == legacy[key]
+        for key in ("c_ent_readout", "h_norm", "h_entropy", "h_associator_norm", "visited_entropy"):
+            np.testing.assert_allclose(columns[key], legacy[key], atol=1e-6, err_msg=key)
+
+    def test_csv_only_on_request(self, simulator_inputs):
+        _, _, node_table, tmp_path = simulator_inputs
+
+        _, payload = ossm.run_regime_reference(REGIMES["normative"], node_table, chunk_size=5, sample_trajectories=0)
+        assert payload["output_csv"] is None
+        assert not (tmp_path / "ossm_trajectories_normative.csv").exists()
+
+    def test_interrupted_run_falls_back_to_csv(self, simulator_inputs):
+        _, _, node_table, tmp_path = simulator_inputs
+
+        ossm.run_regime_reference(REGIMES["psychotic"], node_table, chunk_size=5, sample_trajectories=0, write_csv=True)
+        (tmp_path / "ossm_steps" / "psychotic" / "metadata.json").unlink()
+
+        assert ossm_analysis._load_stepwise_ossm("psychotic")["path"] == str(tmp_path / "ossm_trajectories_psychotic.csv")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
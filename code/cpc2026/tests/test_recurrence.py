@@ -0,0 +1,114 @@
+"""
+Tests for KD-tree recurrence quantification analysis.
+"""
+
+import json
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ossm_analysis
+from recurrence import recurrence_pairs, recurrence_quantification
+
+
+def _runs(mask):
+    """Lengths of the runs of True in a 1D boolean array."""
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[1::2] - edges[::2]
+
+
+def _brute_force(trajectory, radius, min_line):
+    """RR, DET, LAM and TT from the dense recurrence matrix."""
+    n = len(trajectory)
+    distance = np.linalg.norm(trajectory[:, None, :] - trajectory[None, :, :], axis=2)
+    recurrent = distance < radius
+    np.fill_diagonal(recurrent, False)
+    total = recurrent.sum()
+    if total == 0:
+        return 0.0, 0.0, 0.0, np.nan
+
+    diagonals = np.concatenate([_runs(np.diagonal(recurrent, offset)) for offset in range(1 - n, n) if offset])
+    verticals = np.concatenate([_runs(recurrent[:, column]) for column in range(n)])
+    long_verticals = verticals[verticals >= min_line]
+    return (
+        total / (n * (n - 1)),
+        diagonals[diagonals >= min_line].sum() / total,
+        long_verticals.sum() / total,
+        long_verticals.mean() if len(long_verticals) else np.nan,
+    )
+
+
+@pytest.fixture
+def series():
+    """Random walks with slow drift, plus a fixed point and a never-recurring line."""
+    rng = np.random.default_rng(0)
+    walks = np.cumsum(rng.normal(scale=0.3, size=(6, 80, 3)), axis=1)
+    sticky = np.repeat(walks[:, ::4], 4, axis=1)
+    fixed = np.zeros((1, 80, 3))
+    line = np.arange(80, dtype=float)[None, :, None] * np.ones((1, 1, 3)) * 10.0
+    return np.concatenate([walks, sticky, fixed, line])
+
+
+class TestRecurrenceQuantification:
+    """KD-tree pair lists give the dense-matrix line statistics."""
+
+    @pytest.mark.parametrize("radius", [0.2, 0.5, 1.5])
+    @pytest.mark.parametrize("min_line", [2, 3])
+    def test_matches_dense_matrix(self, series, radius, min_line):
+        rqa = recurrence_quantification(series, radius, min_line=min_line)
+
+        expected = np.array([_brute_force(trajectory, radius, min_line) for trajectory in series])
+        columns = ["recurrence_rate", "determinism", "laminarity", "trapping_time"]
+        np.testing.assert_allclose(rqa[columns].to_numpy(), expected, rtol=1e-12, equal_nan=True)
+        np.testing.assert_array_equal(rqa["trajectory_id"], np.arange(len(series)))
+
+    def test_pairs_are_strict_and_ordered(self):
+        points = np.array([[0.0], [1.0], [2.0], [2.5]])
+
+        pairs = recurrence_pairs(points, 1.0)
+        np.testing.assert_array_equal(pairs, [[2, 3]])
+        assert (pairs[:, 0] < pairs[:, 1]).all()
+
+    def test_no_recurrences(self, series):
+        rqa = recurrence_quantification(series[-1:], 0.5)
+
+        assert rqa.loc[0, "recurrence_rate"] == 0.0
+        assert rqa.loc[0, "determinism"] == 0.0
+        assert rqa.loc[0, "laminarity"] == 0.0
+        assert np.isnan(rqa.loc[0, "trapping_time"])
+
+
+
+class TestAttractorSummary:
+    """The O-SSM attractor summary stays valid JSON without vertical lines."""
+
+    def test_empty_samples(self):
+        summary = ossm_analysis._attractor_summary(np.empty((0, 20, 8)))
+        assert summary["trapping_time"] is None
+        json.dumps(summary, allow_nan=False)
+
+    def test_no_vertical_lines(self, monkeypatch):
+        def no_verticals(series, threshold):
+            return pd.DataFrame({
+                "recurrence_rate": np.zeros(len(series)),
+                "determinism": np.zeros(len(series)),
+                "laminarity": np.zeros(len(series)),
+                "trapping_time": np.full(len(series), np.nan),
+            })
+
+        monkeypatch.setattr(ossm_analysis, "recurrence_quantification", no_verticals)
+        rng = np.random.default_rng(0)
+        summary = ossm_analysis._attractor_summary(rng.normal(size=(3, 40, 8)))
+        assert summary["trapping_time"] is None
+        json.dumps(summary, allow_nan=False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
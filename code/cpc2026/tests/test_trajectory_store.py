@@ -0,0 +1,139 @@
+"""
+Tests for the columnar trajectory store.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from trajectory_store import StepwiseMoments, TrajectoryStore, index_dtype
+
+
+def _metrics(n_nodes, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "node": [f"w{i:05d}" for i in range(n_nodes)],
+            "C_ent": rng.normal(size=n_nodes),
+            "entropy": rng.uniform(0.0, 3.0, size=n_nodes),
+            "kappa": rng.uniform(-1.0, 1.0, size=n_nodes),
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TrajectoryStore(tmp_path)
+    metrics = _metrics(40)
+    store.write_node_table(metrics["node"].tolist(), metrics)
+    return store
+
+
+class TestIndexDtype:
+    """Node matrices use the narrowest unsigned dtype holding every index."""
+
+    @pytest.mark.parametrize(
+        ("n_nodes", "dtype"),
+        [(1, np.uint8), (256, np.uint8), (257, np.uint16), (65_536, np.uint16), (65_537, np.int32)],
+    )
+    def test_boundaries(self, n_nodes, dtype):
+        assert index_dtype(n_nodes) == np.dtype(dtype)
+
+    @pytest.mark.parametrize(("n_nodes", "dtype"), [(40, np.uint8), (300, np.uint16)])
+    def test_written_matrix_is_downcast(self, tmp_path, n_nodes, dtype):
+        store = TrajectoryStore(tmp_path)
+        metrics = _metrics(n_nodes)
+        store.write_node_table(metrics["node"].tolist(), metrics)
+        nodes = np.random.default_rng(1).integers(0, n_nodes, size=(7, 11)).astype(np.int32)
+        nodes[0, 0] = n_nodes - 1
+        store.write("normative", nodes, seed=1)
+
+        walks = store.open("normative")
+        assert isinstance(walks.nodes, np.memmap)
+        assert walks.nodes.dtype == dtype
+        assert walks.metadata["dtype"] == np.dtype(dtype).name
+        np.testing.assert_array_equal(walks.nodes, nodes)
+
+
+class TestRegimeTrajectories:
+    """Metric step matrices are gathers of the node table along the walks."""
+
+    def test_metrics_match_long_form_gather(self, store):
+        nodes = np.random.default_rng(2).integers(0, 40, size=(9, 13))
+        store.write("anxious", nodes)
+        walks = store.open("anxious")
+        table = store.node_table()
+
+        for column, matrix in [("C_ent", walks.c_ent), ("entropy", walks.entropy), ("kappa", walks.kappa)]:
+            assert matrix.dtype == np.float32
+            np.testing.assert_array_equal(matrix, table[column].to_numpy(dtype=np.float32)[nodes])
+
+    def test_chunks_cover_every_row_once(self, store):
+        nodes = np.random.default_rng(3).integers(0, 40, size=(10, 6))
+        store.write("ruminative", nodes)
+        walks = store.open("ruminative")
+
+        starts, blocks = zip(*[(start, chunk.c_ent) for start, chunk in walks.chunks(4)])
+        assert starts == (0, 4, 8)
+        np.testing.assert_array_equal(np.concatenate(blocks), walks.c_ent)
+        assert len(list(walks.chunks(None))) == 1
+
+    def test_import_frame_roundtrip(self, store):
+        nodes = np.random.default_rng(4).integers(0, 40, size=(5, 8))
+        store.write("psychotic", nodes)
+        frame = store.open("psychotic").to_frame()
+
+        imported = store.import_frame("legacy", frame.sample(frac=1.0, random_state=0))
+        np.testing.assert_array_equal(imported.nodes, nodes)
+        assert imported.metadata["source"] == "legacy_parquet"
+
+
+class TestStepwiseMoments:
+    """Chunk-merged per-step moments match a single pass over the stacked matrix."""
+
+    def test_merged_chunks_match_numpy(self):
+        matrix = np.random.default_rng(5).normal(loc=3.0, scale=2.0, size=(1_003, 17)).astype(np.float32)
+        moments = StepwiseMoments(matrix.shape[1])
+        for start, stop in [(0, 1), (1, 400), (400, 400), (400, 1_003)]:
+            moments.update(matrix[start:stop])
+
+        assert moments.count == len(matrix)
+        np.testing.assert_allclose(moments.mean, matrix.astype(np.float64).mean(axis=0), rtol=1e-12)
+        for ddof in (0, 1):
+            np.testing.assert_allclose(moments.variance(ddof), matrix.astype(np.float64).var(axis=0, ddof=ddof), rtol=1e-10)
+
+    def test_too_few_rows_give_nan_variance(self):
+        moments = StepwiseMoments(3)
+        moments.update(np.ones((1, 3)))
+
+        assert np.isnan(moments.variance()).all()
+        np.testing.assert_array_equal(moments.variance(ddof=0), np.zeros(3))
+
+
+class TestValidation:
+    """Stale node tables and out-of-range indices are rejected."""
+
+    def test_changed_node_table_raises(self, store):
+        store.write("normative", np.zeros((2, 3), dtype=np.int32))
+        metrics = _metrics(40, seed=1)
+        store.write_node_table(metrics["node"].tolist(), metrics)
+
+        with pytest.raises(ValueError):
+            store.open("normative")
+
+    def test_out_of_range_index_raises(self, store):
+        with pytest.raises(ValueError):
+            store.write("normative", np.full((2, 3), 40))
+
+    def test_missing_regime_raises(self, store):
+        with pytest.raises(FileNotFoundError):
+            store.open("absent")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
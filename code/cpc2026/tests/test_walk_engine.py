@@ -0,0 +1,99 @@
+"""
+Tests for the CSR alias-table random-walk engine.
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+from scipy import stats
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from walk_engine import TransitionCSR
+
+
+@pytest.fixture
+def tables():
+    """Sorted neighbour lists with random weights, a one-neighbour row and an isolated node."""
+    rng = np.random.default_rng(0)
+    adjacency, probabilities = [], []
+    for node in range(12):
+        neighbors = np.sort(rng.choice(np.delete(np.arange(12), node), size=rng.integers(2, 9), replace=False))
+        weights = rng.gamma(0.5, size=len(neighbors))
+        adjacency.append(neighbors)
+        probabilities.append(weights / weights.sum())
+    adjacency += [np.array([0]), np.empty(0, dtype=np.int64)]
+    probabilities += [np.array([1.0]), np.empty(0)]
+    return adjacency, probabilities
+
+
+def _dense(adjacency, probabilities):
+    """Dense transition matrix the alias tables encode."""
+    matrix = np.zeros((len(adjacency), len(adjacency)))
+    for node, (neighbors, row) in enumerate(zip(adjacency, probabilities)):
+        matrix[node, neighbors] = row
+    return matrix
+
+
+class TestAliasTables:
+    """Alias tables reproduce each row of the transition matrix."""
+
+    def test_rows_are_recovered_exactly(self, tables):
+        csr = TransitionCSR.from_tables(*tables)
+
+        for node, (neighbors, row) in enumerate(zip(*tables)):
+            if len(neighbors):
+                np.testing.assert_allclose(csr.transition_probabilities(node), row, atol=1e-12)
+
+    def test_sampling_frequencies_match_rows(self, tables):
+        csr = TransitionCSR.from_tables(*tables)
+        matrix = _dense(*tables)
+        rng = np.random.default_rng(1)
+        n_draws = 50_000
+
+        for node in range(csr.n_nodes - 2):
+            nxt = csr.step(np.full(n_draws, node), rng)
+            observed = np.bincount(nxt, minlength=csr.n_nodes)
+            support = matrix[node] > 0
+            assert observed[~support].sum() == 0
+            _, p_value = stats.chisquare(observed[support], n_draws * matrix[node, support])
+            assert p_value > 1e-4
+
+    def test_walk_transition_counts_match_matrix(self, tables):
+        csr = TransitionCSR.from_tables(*tables)
+        matrix = _dense(*tables)
+        walks = csr.walk(np.arange(csr.n_nodes - 1).repeat(1_000), 60, np.random.default_rng(2))
+
+        counts = np.zeros_like(matrix)
+        np.add.at(counts, (walks[:, :-1].ravel(), walks[:, 1:].ravel()), 1.0)
+        empirical = counts[:-1] / counts[:-1].sum(axis=1, keepdims=True)
+        np.testing.assert_allclose(empirical, matrix[:-1], atol=0.02)
+
+    def test_isolated_walkers_stay_put(self, tables):
+        csr = TransitionCSR.from_tables(*tables)
+        isolated = csr.n_nodes - 1
+
+        walks = csr.walk(np.array([isolated, isolated]), 5, np.random.default_rng(3))
+        assert (walks == isolated).all()
+
+    def test_fixed_seed_reproduces_walks(self, tables):
+        csr = TransitionCSR.from_tables(*tables)
+        start = np.arange(csr.n_nodes).repeat(3)
+
+        first = csr.walk(start, 20, np.random.default_rng(4))
+        again = csr.walk(start, 20, np.random.default_rng(4))
+        assert first.dtype == np.int32
+        np.testing.assert_array_equal(first, again)
+
+    def test_misaligned_probabilities_raise(self, tables):
+        adjacency, probabilities = tables
+        probabilities = [*probabilities[:-2], np.array([0.5, 0.5]), probabilities[-1]]
+
+        with pytest.raises(ValueError):
+            TransitionCSR.from_tables(adjacency, probabilities)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -36,8 +36,9 @@ from common import (
     save_json,
     seed_everything,
     softmax,
-    trajectory_path,
 )
+from trajectory_store import DEFAULT_CHUNK_SIZE, RegimeTrajectories, StepwiseMoments, TrajectoryStore
+from walk_engine import TransitionCSR
 
 
 def compute_poincare_embedding(
@@ -172,35 +173,57 @@ def flatten_trajectories(
     return frame, stepwise
 
 
-def simulate_markov_regime(
+def stepwise_summary(walks: RegimeTrajectories, chunk_size: int | None = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """Per-step mean C_ent / entropy / kappa across a regime's trajectories."""
+
+    moments = {column: StepwiseMoments(walks.shape[1]) for column in ("C_ent", "entropy", "kappa")}
+    for _, chunk in walks.chunks(chunk_size):
+        for column, accumulator in moments.items():
+            accumulator.update(chunk.metric(column))
+    return pd.DataFrame(
+        {
+            "regime": walks.regime,
+            "step": np.arange(walks.shape[1], dtype=np.int16),
+            **{f"mean_{column}": accumulator.mean for column, accumulator in moments.items()},
+        }
+    )
+
+
+def simulate_markov_nodes(
     graph,
-    metrics: pd.DataFrame,
     regime: RegimeConfig,
     n_trajectories: int,
     trajectory_length: int,
     seed: int,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Simulate graph-constrained trajectories for one regime."""
+    model_inputs: tuple | None = None,
+) -> tuple[np.ndarray, list[str]]:
+    """Simulate one regime's walks as an int32 node-index matrix.
 
-    _, _, merged, _, nodes, adjacency = prepare_model_inputs()
+    All walkers advance together on the CSR transition table (`walk_engine`),
+    so the cost per step is a few array passes regardless of how many
+    distinct nodes the walkers occupy. Returns (matrix, node names by index).
+    """
+
+    _, _, merged, _, nodes, adjacency = model_inputs or prepare_model_inputs()
     probabilities = build_transition_tables(graph, merged, nodes, adjacency, regime)
+    transitions = TransitionCSR.from_tables(adjacency, probabilities)
     rng = np.random.default_rng(seed)
 
-    trajectory_nodes = np.empty((n_trajectories, trajectory_length), dtype=np.int32)
-    trajectory_nodes[:, 0] = rng.integers(0, len(nodes), size=n_trajectories, dtype=np.int32)
+    start = rng.integers(0, len(nodes), size=n_trajectories, dtype=np.int32)
+    return transitions.walk(start, trajectory_length, rng), nodes
 
-    for step in range(1, trajectory_length):
-        previous = trajectory_nodes[:, step - 1]
-        next_nodes = np.empty_like(previous)
-        for current in np.unique(previous):
-            mask = previous == current
-            neighbors = adjacency[int(current)]
-            if len(neighbors) == 0:
-                next_nodes[mask] = int(current)
-                continue
-            next_nodes[mask] = rng.choice(neighbors, size=int(mask.sum()), p=probabilities[int(current)])
-        trajectory_nodes[:, step] = next_nodes
 
+def simulate_markov_regime(
+    graph,
+    metrics: pd.DataFrame,
+    regime: RegimeConfig,
+    n_trajectories: int,
+    trajectory_length: int,
+    seed: int,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Simulate graph-constrained trajectories for one regime as long-form frames."""
+
+    trajectory_nodes, nodes = simulate_markov_nodes(graph, regime, n_trajectories, trajectory_length, seed)
     return flatten_trajectories(regime.name, trajectory_nodes, nodes, metrics)
 
 
@@ -252,6 +275,7 @@ def simulate_hybrid_trajectories(
 
     _, _, merged, _, nodes, adjacency = prepare_model_inputs()
     probabilities = build_transition_tables(graph, merged, nodes, adjacency, regime)
+    transitions = TransitionCSR.from_tables(adjacency, probabilities)
     coordinates = embedding.set_index("node").loc[nodes, ["x", "y"]].to_numpy(dtype=float)
 
     rng = np.random.default_rng(seed)
@@ -260,15 +284,7 @@ def simulate_hybrid_trajectories(
     positions = coordinates[trajectory_nodes[:, 0]].copy()
 
     for step in range(1, trajectory_length):
-        previous = trajectory_nodes[:, step - 1]
-        next_nodes = np.empty_like(previous)
-        for current in np.unique(previous):
-            mask = previous == current
-            neighbors = adjacency[int(current)]
-            if len(neighbors) == 0:
-                next_nodes[mask] = int(current)
-                continue
-            next_nodes[mask] = rng.choice(neighbors, size=int(mask.sum()), p=probabilities[int(current)])
+        next_nodes = transitions.step(trajectory_nodes[:, step - 1], rng)
         positions = disk_project(0.5 * positions + 0.5 * coordinates[next_nodes] + rng.normal(0.0, 0.03, positions.shape))
         trajectory_nodes[:, step] = nearest_node_indices(positions, coordinates)
 
@@ -311,26 +327,30 @@ def main() -> None:
     embedding = compute_poincare_embedding(graph)
 
     stepwise_frames: list[pd.DataFrame] = []
+    store = TrajectoryStore()
+    model_inputs = prepare_model_inputs()
+    store.write_node_table(model_inputs[4], metrics)
     metadata = {
         "seed": DEFAULT_SEED,
         "n_trajectories_per_regime": n_trajectories,
         "trajectory_length": trajectory_length,
         "regimes": [asdict(cfg) for cfg in REGIME_CONFIGS],
         "embedding_path": str(POINCARE_EMBEDDING_PARQUET),
+        "trajectory_store": str(store.root),
     }
 
     for offset, regime in enumerate(REGIME_CONFIGS):
-        frame, stepwise = simulate_markov_regime(
+        seed = DEFAULT_SEED + 100 * offset
+        trajectory_nodes, _ = simulate_markov_nodes(
             graph=graph,
-            metrics=metrics,
             regime=regime,
             n_trajectories=n_trajectories,
             trajectory_length=trajectory_length,
-            seed=DEFAULT_SEED + 100 * offset,
+            seed=seed,
+            model_inputs=model_inputs,
         )
-        output_path = trajectory_path(regime.name)
-        frame.to_parquet(output_path, index=False)
-        stepwise_frames.append(stepwise)
+        store.write(regime.name, trajectory_nodes, seed=seed)
+        stepwise_frames.append(stepwise_summary(store.open(regime.name)))
 
     pd.concat(stepwise_frames, ignore_index=True).to_csv(STEPWISE_SUMMARY_CSV, index=False)
 
@@ -360,7 +380,7 @@ def main() -> None:
         return
 
     print(
-        f"Saved regime trajectories to {CPC_RESULTS_DIR} "
+        f"Saved regime trajectories to {store.root} "
         f"({n_trajectories} trajectories x {trajectory_length} steps per regime)."
     )
 
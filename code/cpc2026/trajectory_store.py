@@ -0,0 +1,279 @@
+"""Columnar on-disk store for CPC regime trajectories.
+
+A regime's walks are kept as the raw `(n_trajectories, length)` node index
+matrix, next to one node table shared by every regime:
+
+    <store>/nodes.parquet      node, C_ent, entropy, kappa (row i = node index i)
+    <store>/<regime>.npy       node matrix, memory-mapped on read
+    <store>/<regime>.json      shape, dtype, seed, and digest of the node table it indexes
+
+The matrix uses the narrowest unsigned dtype that holds every node index.
+For the 438-node SWOW-EN LCC that is uint16, so 2 bytes per visit; graphs
+past 65,535 nodes fall back to int32. Metric step matrices (C_ent, entropy,
+kappa) are never stored. They are gathered on access as `column[nodes]`, one
+vectorized pass with no sort, and the node matrix itself is read zero-copy.
+The long-form parquet layout instead stores trajectory_id, step, a
+categorical node, and three float32 columns per visit.
+
+Analyses that must not hold a whole regime in memory iterate
+`walks.chunks(chunk_size)`: each chunk is a row slice of the memory-mapped
+matrix, and `StepwiseMoments` merges per-step means and variances across
+chunks with Welford/Chan updates.
+
+Usage:
+    store = TrajectoryStore()
+    store.write_node_table(nodes, metrics)
+    store.write("normative", trajectory_nodes, seed=seed)
+    walks = store.open("normative")
+    walks.c_ent          # (n_trajectories, length) float32
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from common import TRAJECTORY_STORE_DIR, ensure_directory, load_json, save_json, trajectory_path
+
+METRIC_COLUMNS: tuple[str, ...] = ("C_ent", "entropy", "kappa")
+NODE_TABLE_NAME = "nodes.parquet"
+DEFAULT_CHUNK_SIZE = 4_096
+
+
+def index_dtype(n_nodes: int) -> np.dtype:
+    """Narrowest dtype for node indices 0..n_nodes-1."""
+
+    for dtype in (np.uint8, np.uint16):
+        if n_nodes <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.int32)
+
+
+def node_table_digest(table: pd.DataFrame) -> str:
+    """Content digest of a node table (names and metric columns)."""
+
+    digest = hashlib.sha256()
+    digest.update("\0".join(table["node"].astype(str)).encode("utf-8"))
+    for column in METRIC_COLUMNS:
+        digest.update(np.ascontiguousarray(table[column].to_numpy(dtype=np.float32)).tobytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class RegimeTrajectories:
+    """One regime's node matrix with lazily gathered metric step matrices."""
+
+    regime: str
+    nodes: np.ndarray
+    node_table: pd.DataFrame
+    metadata: dict[str, Any] = field(default_factory=dict)
+    _columns: dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return tuple(self.nodes.shape)  # type: ignore[return-value]
+
+    @property
+    def node_names(self) -> list[str]:
+        return self.node_table["node"].astype(str).tolist()
+
+    def metric(self, column: str) -> np.ndarray:
+        """(n_trajectories, length) float32 matrix of a node metric along the walks."""
+
+        if column not in self._columns:
+            self._columns[column] = self.node_table[column].to_numpy(dtype=np.float32)
+        return self._columns[column][self.nodes]
+
+    @property
+    def c_ent(self) -> np.ndarray:
+        return self.metric("C_ent")
+
+    @property
+    def entropy(self) -> np.ndarray:
+        return self.metric("entropy")
+
+    @property
+    def kappa(self) -> np.ndarray:
+        return self.metric("kappa")
+
+    def chunks(self, chunk_size: int | None = DEFAULT_CHUNK_SIZE) -> Iterator[tuple[int, "RegimeTrajectories"]]:
+        """Yield (first trajectory id, view) over consecutive row blocks.
+
+        Views share the node table and metric cache; only `chunk_size` rows of
+        the memory-mapped matrix are paged in at a time. `None` yields the
+        whole regime as one chunk.
+        """
+
+        n_trajectories = self.nodes.shape[0]
+        step = n_trajectories if not chunk_size else int(chunk_size)
+        for start in range(0, n_trajectories, max(step, 1)):
+            yield start, RegimeTrajectories(
+                regime=self.regime,
+                nodes=self.nodes[start : start + step],
+                node_table=self.node_table,
+                metadata=self.metadata,
+                _columns=self._columns,
+            )
+
+    def to_frame(self, trajectory_ids: np.ndarray | list[int] | None = None) -> pd.DataFrame:
+        """Long-form frame (trajectory_id, step, node, C_ent, entropy, kappa) for selected walks."""
+
+        ids = np.arange(self.nodes.shape[0]) if trajectory_ids is None else np.sort(np.asarray(trajectory_ids))
+        nodes = np.asarray(self.nodes[ids])
+        length = nodes.shape[1]
+        flat = nodes.reshape(-1)
+        frame = pd.DataFrame(
+            {
+                "trajectory_id": np.repeat(ids.astype(np.int32), length),
+                "step": np.tile(np.arange(length, dtype=np.int16), len(ids)),
+                "node": pd.Categorical.from_codes(flat, categories=self.node_names),
+            }
+        )
+        for column in METRIC_COLUMNS:
+            frame[column] = self.node_table[column].to_numpy(dtype=np.float32)[flat]
+        return frame
+
+
+class StepwiseMoments:
+    """Running per-step mean and variance over row blocks of a step matrix.
+
+    Blocks are merged with Chan et al.'s pairwise form of Welford's update,
+    so the result matches a single pass over the stacked matrix without
+    keeping it.
+    """
+
+    def __init__(self, n_steps: int):
+        self.count = 0
+        self.mean = np.zeros(n_steps, dtype=np.float64)
+        self._m2 = np.zeros(n_steps, dtype=np.float64)
+
+    def update(self, block: np.ndarray) -> None:
+        block = np.asarray(block, dtype=np.float64)
+        n_block = block.shape[0]
+        if n_block == 0:
+            return
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+        total = self.count + n_block
+        delta = block_mean - self.mean
+        self.mean += delta * (n_block / total)
+        self._m2 += block_m2 + delta**2 * (self.count * n_block / total)
+        self.count = total
+
+    def variance(self, ddof: int = 1) -> np.ndarray:
+        if self.count <= ddof:
+            return np.full_like(self.mean, np.nan)
+        return self._m2 / (self.count - ddof)
+
+
+class TrajectoryStore:
+    """Directory of per-regime node matrices sharing one node table."""
+
+    def __init__(self, root: Path = TRAJECTORY_STORE_DIR):
+        self.root = Path(root)
+
+    def _matrix_path(self, regime: str) -> Path:
+        return self.root / f"{regime}.npy"
+
+    def _metadata_path(self, regime: str) -> Path:
+        return self.root / f"{regime}.json"
+
+    def __contains__(self, regime: str) -> bool:
+        return self._matrix_path(regime).exists() and self._metadata_path(regime).exists()
+
+    def write_node_table(self, node_names: list[str], metrics: pd.DataFrame) -> pd.DataFrame:
+        """Write the shared node table in `node_names` order (the walks' index space)."""
+
+        ordered = metrics.set_index("node").loc[node_names]
+        table = pd.DataFrame({"node": list(node_names)})
+        for column in METRIC_COLUMNS:
+            table[column] = ordered[column].to_numpy(dtype=np.float32)
+        ensure_directory(self.root)
+        table.to_parquet(self.root / NODE_TABLE_NAME, index=False)
+        return table
+
+    def node_table(self) -> pd.DataFrame:
+        path = self.root / NODE_TABLE_NAME
+        if not path.exists():
+            raise FileNotFoundError(f"Trajectory store node table not found at {path}.")
+        return pd.read_parquet(path)
+
+    def write(self, regime: str, trajectory_nodes: np.ndarray, **metadata: Any) -> Path:
+        """Save one regime's node matrix against the current node table."""
+
+        table = self.node_table()
+        trajectory_nodes = np.asarray(trajectory_nodes)
+        if trajectory_nodes.size and not 0 <= int(trajectory_nodes.min()) <= int(trajectory_nodes.max()) < len(table):
+            raise ValueError(f"{regime}: node indices outside the {len(table)}-row node table.")
+        trajectory_nodes = trajectory_nodes.astype(index_dtype(len(table)))
+        path = self._matrix_path(regime)
+        tmp = path.with_suffix(".npy.tmp")
+        with open(tmp, "wb") as handle:
+            np.save(handle, trajectory_nodes)
+        tmp.replace(path)
+        save_json(
+            self._metadata_path(regime),
+            {
+                "regime": regime,
+                "n_trajectories": int(trajectory_nodes.shape[0]),
+                "trajectory_length": int(trajectory_nodes.shape[1]),
+                "dtype": trajectory_nodes.dtype.name,
+                "node_table_digest": node_table_digest(table),
+                **metadata,
+            },
+        )
+        return path
+
+    def open(self, regime: str) -> RegimeTrajectories:
+        """Memory-map one regime (raises if its node table has since changed)."""
+
+        if regime not in self:
+            raise FileNotFoundError(f"No stored trajectories for regime {regime!r} in {self.root}.")
+        metadata = load_json(self._metadata_path(regime))
+        table = self.node_table()
+        if metadata.get("node_table_digest") != node_table_digest(table):
+            raise ValueError(f"{regime}: trajectories were written against a different node table; re-simulate.")
+        nodes = np.load(self._matrix_path(regime), mmap_mode="r")
+        return RegimeTrajectories(regime=regime, nodes=nodes, node_table=table, metadata=metadata)
+
+    def import_frame(self, regime: str, frame: pd.DataFrame) -> RegimeTrajectories:
+        """Convert a legacy long-form trajectory frame into the store."""
+
+        ordered = frame.sort_values(["trajectory_id", "step"], kind="mergesort")
+        n_trajectories = int(ordered["trajectory_id"].max()) + 1
+        trajectory_length = int(ordered["step"].max()) + 1
+        try:
+            table = self.node_table()
+        except FileNotFoundError:
+            first = ordered.drop_duplicates("node").astype({"node": str})
+            names = sorted(first["node"].tolist())
+            table = self.write_node_table(names, first)
+        index = pd.Index(table["node"].astype(str))
+        codes = index.get_indexer(ordered["node"].astype(str))
+        if (codes < 0).any():
+            raise ValueError(f"{regime}: legacy frame visits nodes missing from the node table.")
+        self.write(
+            regime,
+            codes.astype(np.int32).reshape(n_trajectories, trajectory_length),
+            source="legacy_parquet",
+        )
+        return self.open(regime)
+
+
+def load_regime_trajectories(regime: str, store: TrajectoryStore | None = None) -> RegimeTrajectories:
+    """Open a regime from the store, migrating a legacy long-form parquet if needed."""
+
+    store = store or TrajectoryStore()
+    if regime not in store:
+        legacy = trajectory_path(regime)
+        if not legacy.exists():
+            raise FileNotFoundError(
+                f"No trajectories for regime {regime!r}; run trajectory_simulator.py first."
+            )
+        return store.import_frame(regime, pd.read_parquet(legacy))
+    return store.open(regime)
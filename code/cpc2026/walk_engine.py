@@ -0,0 +1,118 @@
+"""Vectorized random-walk engine over CSR alias tables.
+
+The per-node neighbour lists and transition probabilities produced by
+`trajectory_simulator.build_transition_tables` are packed into flat CSR
+arrays: `indptr` (row offsets) and `indices` (neighbour node indices), plus a
+Walker alias table per row, aligned with `indices`:
+
+  - `accept` holds the probability of keeping slot k's own neighbour
+  - `alias` holds the neighbour taken otherwise
+
+One step advances every walker at once from a single uniform draw u. The slot
+is k = floor(u * deg), and the fractional part of u * deg decides between
+`indices[k]` and `alias[k]`. That is a handful of array gathers, whatever
+the degree or the number of distinct occupied nodes, and it samples each
+row's categorical distribution exactly. Walkers on isolated nodes stay put.
+
+A walk consumes exactly one `rng.random(n_walkers)` draw per step, so a fixed
+seed reproduces the same trajectories.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def _alias_row(probabilities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vose's alias table for one row: (accept probability, alias slot)."""
+
+    n = len(probabilities)
+    scaled = np.asarray(probabilities, dtype=np.float64) * (n / np.sum(probabilities))
+    accept = np.ones(n, dtype=np.float64)
+    alias = np.arange(n, dtype=np.int64)
+    small = [k for k in range(n) if scaled[k] < 1.0]
+    large = [k for k in range(n) if scaled[k] >= 1.0]
+    while small and large:
+        s = small.pop()
+        g = large.pop()
+        accept[s] = scaled[s]
+        alias[s] = g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    return accept, alias
+
+
+@dataclass(frozen=True)
+class TransitionCSR:
+    """Row-stochastic transition matrix in CSR form with per-row alias tables."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    accept: np.ndarray
+    alias: np.ndarray
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    @classmethod
+    def from_tables(cls, adjacency: list[np.ndarray], probabilities: list[np.ndarray]) -> "TransitionCSR":
+        """Pack per-node neighbour / probability arrays (rows of empty nodes are dropped)."""
+
+        degree = np.fromiter((len(neighbors) for neighbors in adjacency), dtype=np.int64, count=len(adjacency))
+        indptr = np.zeros(len(adjacency) + 1, dtype=np.int64)
+        np.cumsum(degree, out=indptr[1:])
+        accept = np.ones(indptr[-1], dtype=np.float64)
+        alias = np.zeros(indptr[-1], dtype=np.int32)
+        if indptr[-1] == 0:
+            return cls(indptr, np.empty(0, dtype=np.int32), accept, alias)
+
+        indices = np.concatenate([adjacency[row] for row in np.flatnonzero(degree)]).astype(np.int32)
+        for row in np.flatnonzero(degree):
+            lo, hi = indptr[row], indptr[row + 1]
+            if len(probabilities[row]) != hi - lo:
+                raise ValueError(f"Transition probabilities of node {row} are not aligned with its neighbours.")
+            row_accept, row_alias = _alias_row(probabilities[row])
+            accept[lo:hi] = row_accept
+            alias[lo:hi] = indices[lo + row_alias]
+        return cls(indptr, indices, accept, alias)
+
+    def transition_probabilities(self, node: int) -> np.ndarray:
+        """Row `node` of the transition matrix, recovered from the alias table."""
+
+        lo, hi = self.indptr[node], self.indptr[node + 1]
+        deg = hi - lo
+        probs = self.accept[lo:hi] / deg
+        neighbors = self.indices[lo:hi]
+        np.add.at(probs, np.searchsorted(neighbors, self.alias[lo:hi]), (1.0 - self.accept[lo:hi]) / deg)
+        return probs
+
+    def step(self, current: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Next node for every walker in `current`."""
+
+        current = np.asarray(current, dtype=np.int64)
+        uniforms = rng.random(len(current))
+        if not len(self.indices):
+            return current.astype(np.int32)
+        lo = self.indptr[current]
+        deg = self.indptr[current + 1] - lo
+        scaled = uniforms * deg
+        k = np.minimum(scaled.astype(np.int64), np.maximum(deg - 1, 0))
+        slot = np.minimum(lo + k, len(self.indices) - 1)
+        nxt = np.where(scaled - k < self.accept[slot], self.indices[slot], self.alias[slot])
+        return np.where(deg > 0, nxt, current).astype(np.int32)
+
+    def walk(self, start: np.ndarray, n_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """(n_walkers, n_steps) int32 node matrix whose first column is `start`."""
+
+        out = np.empty((n_steps, len(start)), dtype=np.int32)
+        out[0] = start
+        for step in range(1, n_steps):
+            out[step] = self.step(out[step - 1], rng)
+        return np.ascontiguousarray(out.T)
@@ -25,6 +25,7 @@ Output:
 
 import argparse
 import json
+import sys
 import time
 from pathlib import Path
 
@@ -33,6 +34,9 @@ import numpy as np
 import pandas as pd
 from scipy import stats as sp_stats
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analysis"))
+from hypercomplex import from_fano_lines  # noqa: E402
+
 # ── Paths ────────────────────────────────────────────────────────────────────
 
 FC_DIR = Path("data/processed/abide_fc")
@@ -43,62 +47,23 @@ RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
 # ── Octonion algebra (precomputed multiplication table) ──────────────────────
 
-# Build 8x8 multiplication table: MUL_IDX[i,j] = target index, MUL_SIGN[i,j] = sign
+# Fano triples (a, b, c): e_a e_b = e_c cyclically, anticommuting
 FANO_TRIPLES = [(1,2,4), (2,3,5), (3,4,6), (4,5,7), (5,6,1), (6,7,2), (7,1,3)]
-
-_MUL_IDX = np.zeros((8, 8), dtype=int)
-_MUL_SIGN = np.zeros((8, 8))
-
-def _build_mul_table():
-    for i in range(8):
-        for j in range(8):
-            if i == 0 and j == 0:
-                _MUL_IDX[i, j] = 0; _MUL_SIGN[i, j] = 1.0
-            elif i == 0:
-                _MUL_IDX[i, j] = j; _MUL_SIGN[i, j] = 1.0
-            elif j == 0:
-                _MUL_IDX[i, j] = i; _MUL_SIGN[i, j] = 1.0
-            elif i == j:
-                _MUL_IDX[i, j] = 0; _MUL_SIGN[i, j] = -1.0
-            else:
-                found = False
-                for a, b, c in FANO_TRIPLES:
-                    if i == a and j == b: _MUL_IDX[i,j] = c; _MUL_SIGN[i,j] = 1.0; found = True; break
-                    if i == b and j == c: _MUL_IDX[i,j] = a; _MUL_SIGN[i,j] = 1.0; found = True; break
-                    if i == c and j == a: _MUL_IDX[i,j] = b; _MUL_SIGN[i,j] = 1.0; found = True; break
-                    if i == b and j == a: _MUL_IDX[i,j] = c; _MUL_SIGN[i,j] = -1.0; found = True; break
-                    if i == c and j == b: _MUL_IDX[i,j] = a; _MUL_SIGN[i,j] = -1.0; found = True; break
-                    if i == a and j == c: _MUL_IDX[i,j] = b; _MUL_SIGN[i,j] = -1.0; found = True; break
-                if not found:
-                    _MUL_IDX[i, j] = 0; _MUL_SIGN[i, j] = 0.0
-
-_build_mul_table()
+OCTONION = from_fano_lines(FANO_TRIPLES)
 
 
 def oct_mul(a, b):
-    """Multiply two octonions using precomputed table (fast)."""
-    result = np.zeros(8)
-    for i in range(8):
-        if a[i] == 0:
-            continue
-        for j in range(8):
-            if b[j] == 0:
-                continue
-            k = _MUL_IDX[i, j]
-            s = _MUL_SIGN[i, j]
-            result[k] += s * a[i] * b[j]
-    return result
+    """Multiply octonions (broadcast over leading axes) via the precomputed table."""
+    return OCTONION.mul(a, b)
 
 
 def oct_associator(a, b, c):
     """[a,b,c] = (ab)c - a(bc)"""
-    ab = oct_mul(a, b)
-    bc = oct_mul(b, c)
-    return oct_mul(ab, c) - oct_mul(a, bc)
+    return OCTONION.associator(a, b, c)
 
 
 def oct_norm(a):
-    return np.sqrt(np.sum(a**2))
+    return np.sqrt(np.sum(a**2, axis=-1))
 
 
 # ── Edge labeling schemes ────────────────────────────────────────────────────
@@ -191,8 +156,8 @@ def label_edges_rsn_based(G, z_fc, rsn_assignment):
 # ── Associator field computation ─────────────────────────────────────────────
 
 def compute_associator_field(G, labels, max_triples=5000):
-    """Compute associator norms for sampled 2-paths in G."""
-    assoc_norms = []
+    """Compute associator norms for sampled 2-paths in G (one batched associator call)."""
+    triples = []
     nodes = list(G.nodes())
     rng = np.random.RandomState(42)
     rng.shuffle(nodes)
@@ -214,13 +179,19 @@ def compute_associator_field(G, labels, max_triples=5000):
                 if w_nbrs:
                     x = w_nbrs[0]
                     l_c = labels.get((w, x), np.zeros(8))
-                    assoc = oct_associator(l_a, l_b, l_c)
-                    assoc_norms.append(oct_norm(assoc))
+                    triples.append((l_a, l_b, l_c))
                     pair_count += 1
 
-                    if len(assoc_norms) >= max_triples:
-                        return np.array(assoc_norms)
-    return np.array(assoc_norms)
+                    if len(triples) >= max_triples:
+                        return _associator_norms(triples)
+    return _associator_norms(triples)
+
+
+def _associator_norms(triples):
+    if not triples:
+        return np.array([])
+    a, b, c = (np.array(column) for column in zip(*triples))
+    return oct_norm(oct_associator(a, b, c))
 
 
 def extract_features(assoc_norms):